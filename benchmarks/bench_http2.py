@@ -0,0 +1,120 @@
+"""
+Compares HTTP/1.1 and HTTP/2 transports for concurrent BaseService writes.
+
+Starts a FakePostgrestServer, which also speaks cleartext HTTP/2, and has
+`--workers` threads share one service and upsert `--requests` rows through
+each transport, reporting the connections the server accepted, failed
+writes, p50/p99 latency and throughput:
+
+    python -m benchmarks.bench_http2 --workers 50 --requests 5000 --latency-ms 20
+
+Transports: "http1" is the pooled HTTP/1.1 transport, "http2" the
+Http2Transport used by the client registry, and "http2-threads" httpx's own
+synchronous HTTP/2 transport shared by the threads, for comparison. Writes
+are not retried, so failures show as they happen.
+"""
+
+import argparse
+import concurrent.futures
+import statistics
+import time
+from unittest.mock import patch
+
+import httpx
+
+from src.models.organisation import Identity
+from src.services import client_registry as registry
+from src.services.fake_postgrest import FAKE_API_KEY, FakePostgrestServer
+from src.services.http2_transport import Http2Transport
+from src.services.organisation_services import IdentityService
+from src.services.write_retry import WriteRetrier
+from src.utils.identifiers import stable_id
+
+TRANSPORTS = ("http1", "http2", "http2-threads")
+
+
+def _transport(name: str, limits: httpx.Limits) -> httpx.BaseTransport:
+    # HTTP/2 is spoken without negotiation, as the fake server is cleartext
+    if name == "http1":
+        return httpx.HTTPTransport(limits=limits)
+    if name == "http2":
+        return Http2Transport(limits=limits, http1=False)
+    return httpx.HTTPTransport(limits=limits, http1=False, http2=True)
+
+
+def _run(name: str, server: FakePostgrestServer, args) -> dict:
+    limits = httpx.Limits(
+        max_connections=args.workers, max_keepalive_connections=args.workers
+    )
+    client_registry = registry.SupabaseClientRegistry(
+        server.url,
+        FAKE_API_KEY,
+        args.workers,
+        args.workers,
+        30,
+        transport=_transport(name, limits),
+    )
+    connections_before = server.stats["connections"]
+
+    with patch.object(registry, "client_registry", client_registry):
+        service = IdentityService()
+        service.retrier = WriteRetrier(service.table_name, max_attempts=1)
+        padding = "x" * args.row_bytes
+
+        def write(i: int):
+            identity = Identity(
+                organisation_id=stable_id("bench_http2", name, i),
+                neuron360_company_id=f"{name}-{i}",
+                name=padding,
+            )
+            started = time.perf_counter()
+            stored = service.upsert(
+                identity, on_conflict="organisation_id", return_minimal=True
+            )
+            return time.perf_counter() - started, stored is not None
+
+        started = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(args.workers) as executor:
+            results = list(executor.map(write, range(args.requests)))
+        elapsed = time.perf_counter() - started
+    client_registry.close()
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "connections": server.stats["connections"] - connections_before,
+        "failed": sum(1 for _, stored in results if not stored),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "requests_per_second": len(results) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--row-bytes", type=int, default=1000)
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS)
+    args = parser.parse_args()
+
+    print(
+        f"{'transport':<14} {'conns':>6} {'failed':>7} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'req/s':>8}"
+    )
+    for name in args.transports or TRANSPORTS:
+        with FakePostgrestServer(
+            latency_seconds=args.latency_ms / 1000,
+            jitter_seconds=args.jitter_ms / 1000,
+        ) as server:
+            result = _run(name, server, args)
+        print(
+            f"{name:<14} {result['connections']:>6} {result['failed']:>7} "
+            f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+            f"{result['requests_per_second']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compares the ways of turning models into the rows sent to PostgREST.
+
+Builds every record of the people in the example payloads with the
+ProfileTransformer, which touches no database, checks that each encoder
+produces the same rows as the original dump-to-JSON / parse / drop-None
+conversion, and reports rows/s:
+
+    python -m benchmarks.bench_row_encoder --repeat 200
+"""
+
+import argparse
+import json
+import os
+import time
+from itertools import groupby
+from typing import Any, Callable, Dict, List
+
+from pydantic import BaseModel
+
+from src.config.path_config import GOLDILOCKS_DATA_ROOT
+from src.services.row_encoder import get_row_encoder
+from src.transformers.profile_transformer import ProfileTransformer
+
+EXAMPLE_DIR = os.path.join(GOLDILOCKS_DATA_ROOT, "data_schema", "example")
+
+
+def _models() -> List[BaseModel]:
+    transformer = ProfileTransformer()
+    models = []
+    for name in sorted(os.listdir(EXAMPLE_DIR)):
+        with open(os.path.join(EXAMPLE_DIR, name), "r") as f:
+            records = json.load(f).get("results", [])
+        for record in records:
+            bundle = transformer.transform(record)
+            if bundle is not None:
+                models.extend(model for _, model in bundle.all_rows())
+    return models
+
+
+def _dump_loads_filter(models: List[BaseModel]) -> List[Dict[str, Any]]:
+    rows = []
+    for model in models:
+        record = json.loads(model.model_dump_json(by_alias=True))
+        rows.append({k: v for k, v in record.items() if v is not None})
+    return rows
+
+
+def _model_dump(models: List[BaseModel]) -> List[Dict[str, Any]]:
+    return [
+        model.model_dump(mode="json", by_alias=True, exclude_none=True)
+        for model in models
+    ]
+
+
+def _row_encoder(models: List[BaseModel]) -> List[Dict[str, Any]]:
+    return [get_row_encoder(type(model)).encode(model) for model in models]
+
+
+def _row_encoder_batch(models: List[BaseModel]) -> List[Dict[str, Any]]:
+    rows = []
+    for model_class, group in groupby(models, key=type):
+        rows.extend(get_row_encoder(model_class).encode_many(group))
+    return rows
+
+
+ENCODERS: Dict[str, Callable[[List[BaseModel]], List[Dict[str, Any]]]] = {
+    "dump-loads-filter": _dump_loads_filter,
+    "model_dump": _model_dump,
+    "row-encoder": _row_encoder,
+    "row-encoder-batch": _row_encoder_batch,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    models = _models()
+    expected = _dump_loads_filter(models)
+    print(f"{len(models)} records of {len(set(map(type, models)))} models")
+    print(f"{'encoder':<18} {'same rows':>9} {'seconds':>8} {'rows/s':>10}")
+    for name, encode in ENCODERS.items():
+        same = encode(models) == expected
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            encode(models)
+        elapsed = time.perf_counter() - started
+        rows = len(models) * args.repeat
+        print(f"{name:<18} {str(same):>9} {elapsed:>8.2f} {rows / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
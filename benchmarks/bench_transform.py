@@ -0,0 +1,118 @@
+"""
+Measures the per-record cost of transforming Neuron360 records.
+
+Collects every object the ProfileTransformer maps in the example payloads,
+checks that the compiled field mappings read the same values as walking
+each spec's path on every call, and reports microseconds per record for
+both, next to the full transform (mapping, model validation and keys):
+
+    python -m benchmarks.bench_transform --repeat 200
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.config.path_config import GOLDILOCKS_DATA_ROOT
+from src.transformers import profile_transformer as pt
+from src.transformers.field_mapping import Extractor
+
+EXAMPLE_DIR = os.path.join(GOLDILOCKS_DATA_ROOT, "data_schema", "example")
+
+
+def _records() -> List[Dict[str, Any]]:
+    records = []
+    for name in sorted(os.listdir(EXAMPLE_DIR)):
+        with open(os.path.join(EXAMPLE_DIR, name), "r") as f:
+            records.extend(
+                record
+                for record in json.load(f).get("results", [])
+                if record.get("profile_data")
+            )
+    return records
+
+
+def _sources(record: Dict[str, Any]) -> List[Tuple[Extractor, Dict[str, Any]]]:
+    # The (mapping, object) pairs the transformer reads from one record
+    profile_data = record["profile_data"]
+    resume_data = record.get("resume_data") or {}
+    sources = [(pt.PEOPLE_IDENTITY, profile_data), (pt.PROFILE, profile_data)]
+    if profile_data.get("profile_gender"):
+        sources.append((pt.GENDER, profile_data["profile_gender"]))
+    if profile_data.get("profile_status"):
+        sources.append((pt.STATUS, profile_data["profile_status"]))
+    for exp_data in resume_data.get("experiences", []):
+        sources.append((pt.EXPERIENCE, exp_data))
+        sources.append((pt.ORGANISATION_IDENTITY, exp_data))
+        if exp_data.get("job_title_details"):
+            sources.append((pt.JOB_TITLE_DETAIL, exp_data["job_title_details"]))
+        sources.extend(
+            (pt.JOB_FUNCTION, jf) for jf in exp_data.get("job_functions", [])
+        )
+        if exp_data.get("company_social_links"):
+            links = exp_data["company_social_links"]
+            sources.append((pt.ORGANISATION_SOCIAL_LINK, links))
+        for industry in exp_data.get("company_industries") or []:
+            sources.append((pt.INDUSTRY, industry))
+        if exp_data.get("office_id"):
+            sources.append((pt.OFFICE, exp_data))
+        for industry in exp_data.get("office_industries") or []:
+            sources.append((pt.OFFICE_INDUSTRY, industry))
+    for key, _, _, extract in pt.RESUME_ITEMS:
+        sources.extend((extract, item) for item in resume_data.get(key) or [])
+    return sources
+
+
+def _interpreted(extract: Extractor, data: Dict[str, Any]) -> Dict[str, Any]:
+    # Walks the path of every spec on every call, as an uncompiled spec would
+    values = {}
+    for spec in extract.specs:
+        value = data
+        for key in (spec.path or spec.column).split("."):
+            value = (value or {}).get(key)
+        if value is None:
+            value = spec.default
+        elif spec.converter is not None:
+            value = spec.converter(value)
+        values[spec.column] = value
+    if extract is pt.JOB_TITLE_DETAIL or extract is pt.OFFICE:
+        return {column: value for column, value in values.items() if value is not None}
+    return values
+
+
+def _time(run: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    records = _records()
+    sources = [source for record in records for source in _sources(record)]
+    same = [extract(data) for extract, data in sources] == [
+        _interpreted(extract, data) for extract, data in sources
+    ]
+    transformer = pt.ProfileTransformer()
+    runs = {
+        "interpreted specs": lambda: [_interpreted(e, data) for e, data in sources],
+        "compiled specs": lambda: [extract(data) for extract, data in sources],
+        "full transform": lambda: [transformer.transform(r) for r in records],
+    }
+
+    print(f"{len(records)} records, {len(sources)} mapped objects, same: {same}")
+    print(f"{'stage':<18} {'seconds':>8} {'us/record':>10}")
+    for name, run in runs.items():
+        elapsed = _time(run, args.repeat)
+        per_record = elapsed / (len(records) * args.repeat) * 1e6
+        print(f"{name:<18} {elapsed:>8.2f} {per_record:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measures uploader throughput against worker count on a fake PostgREST server.
+
+Starts a FakePostgrestServer with the given latency, jitter and error rate,
+points the services at it, and processes generated copies of an example file
+with a thread pool of each worker count, as run_supabase_uploader.py does:
+
+    python -m benchmarks.bench_uploader_workers --files 40 --workers 1 4 16 \\
+        --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+"""
+
+import argparse
+import concurrent.futures
+import copy
+import json
+import os
+import tempfile
+import time
+from typing import List
+from unittest.mock import patch
+
+from src.config.path_config import GOLDILOCKS_DATA_ROOT
+from src.managers.organisation_manager import OrganisationManager
+from src.managers.people_manager import PeopleManager
+from src.services import client_registry as registry
+from src.services.fake_postgrest import FAKE_API_KEY, FakePostgrestServer
+
+EXAMPLE_FILE = os.path.join(
+    GOLDILOCKS_DATA_ROOT,
+    "data_schema",
+    "example",
+    "search_profile_response_full_eg2.json",
+)
+
+
+def _write_files(directory: str, count: int, run: str) -> List[str]:
+    # Each copy holds different people; companies are shared, as in real data
+    with open(EXAMPLE_FILE, "r") as f:
+        example = json.load(f)
+    paths = []
+    for i in range(count):
+        data = copy.deepcopy(example)
+        for record in data["results"]:
+            profile = record["profile_data"]
+            profile["profile_id"] = f"{profile['profile_id']}-{run}-{i}"
+        path = os.path.join(directory, f"{run}-{i}.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        paths.append(path)
+    return paths
+
+
+def _process(paths: List[str], workers: int, use_batch_writer: bool):
+    def process_file(path):
+        people_manager = PeopleManager(
+            org_manager=OrganisationManager(), use_batch_writer=use_batch_writer
+        )
+        return people_manager.process_people_from_file(path)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_file, paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--latency-ms", type=float, default=10)
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--batch-writes", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'people':>7} {'failed':>7} {'seconds':>8} {'people/s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in args.workers:
+            paths = _write_files(directory, args.files, f"w{workers}")
+            server = FakePostgrestServer(
+                latency_seconds=args.latency_ms / 1000,
+                jitter_seconds=args.jitter_ms / 1000,
+                error_rate=args.error_rate,
+                seed=workers,
+            )
+            client_registry = registry.SupabaseClientRegistry(
+                server.url,
+                FAKE_API_KEY,
+                max_connections=max(workers, 10),
+                max_keepalive_connections=max(workers, 10),
+                keepalive_expiry=30,
+            )
+            with server, patch.object(registry, "client_registry", client_registry):
+                started = time.perf_counter()
+                results = _process(paths, workers, args.batch_writes)
+                elapsed = time.perf_counter() - started
+            client_registry.close()
+            succeeded = sum(success for success, _ in results)
+            failed = sum(failure for _, failure in results)
+            print(
+                f"{workers:>7} {succeeded:>7} {failed:>7} {elapsed:>8.2f} "
+                f"{succeeded / elapsed:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compares the write throughput of the PostgREST and COPY backends.
+
+Writes synthetic organisation identities with each backend through
+`BaseService.upsert_many`, reports rows/s, and deletes the rows afterwards.
+Needs SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY for PostgREST and
+SUPABASE_DB_URL (and psycopg) for COPY:
+
+    python -m benchmarks.bench_write_backends --rows 20000 --chunk-size 1000
+"""
+
+import argparse
+import time
+import uuid
+from typing import List
+
+from src.models.organisation import Identity
+from src.services.copy_loader import CopyLoader
+from src.services.organisation_services import IdentityService
+from src.utils.config import config
+from src.utils.identifiers import stable_id
+
+
+def _identities(run_id: str, rows: int) -> List[Identity]:
+    return [
+        Identity(
+            organisation_id=stable_id("bench", run_id, i),
+            neuron360_company_id=f"bench-{run_id}-{i}",
+            name=f"Benchmark organisation {i}",
+            domain=f"bench-{i}.example.com",
+        )
+        for i in range(rows)
+    ]
+
+
+def _time_upsert(service: IdentityService, records: List[Identity], chunk_size: int):
+    started = time.perf_counter()
+    results = service.upsert_many(
+        records, ignore_duplicates=True, chunk_size=chunk_size, return_minimal=True
+    )
+    elapsed = time.perf_counter() - started
+    written = sum(1 for result in results if result is not None)
+    return written, elapsed
+
+
+def _delete_run(run_id: str):
+    if not config.SUPABASE_DB_URL:
+        return
+    import psycopg
+
+    with psycopg.connect(config.SUPABASE_DB_URL, autocommit=True) as connection:
+        connection.execute(
+            "DELETE FROM organisation.identities WHERE neuron360_company_id LIKE %s",
+            (f"bench-{run_id}-%",),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=["postgrest", "copy-binary", "copy-csv"],
+        default=["postgrest", "copy-binary", "copy-csv"],
+    )
+    args = parser.parse_args()
+
+    service = IdentityService()
+    print(f"{'backend':<12} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+    for backend in args.backends:
+        run_id = uuid.uuid4().hex[:8]
+        records = _identities(run_id, args.rows)
+        service.copy_loader = (
+            CopyLoader(config.SUPABASE_DB_URL, backend.split("-")[1])
+            if backend.startswith("copy")
+            else None
+        )
+        written, elapsed = _time_upsert(service, records, args.chunk_size)
+        print(
+            f"{backend:<12} {written:>8} {elapsed:>9.2f} "
+            f"{written / elapsed if elapsed else 0:>10.0f}"
+        )
+        _delete_run(run_id)
+
+
+if __name__ == "__main__":
+    main()
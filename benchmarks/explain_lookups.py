@@ -0,0 +1,315 @@
+"""
+Captures the query plans of the service lookups on a Postgres database.
+
+Runs each lookup the ingest path and the purge make (by Neuron360 ID, by
+parent key, keyset pages) with EXPLAIN (ANALYZE, BUFFERS) against sample
+values from the tables, and reports the scans used, rows, buffers and
+execution time. A sequential scan of a table larger than `--min-rows` is
+flagged, as are invalid indexes left by a failed concurrent build, and the
+exit status is 1 if any were found. Needs psycopg and a database with the
+schema and migrations applied (SUPABASE_DB_URL, or --dsn):
+
+    python -m benchmarks.explain_lookups --dsn postgresql://localhost/goldilocks
+
+With --seed-people, synthetic people (with profiles, emails, experiences
+and job functions) and organisations (with offices) are first added with
+set-based inserts and the tables analyzed, to check the plans at a given
+size; --cleanup deletes them again through the cascades.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from src.utils.config import config
+
+try:
+    import psycopg
+except ImportError:  # psycopg is only needed to talk to Postgres directly
+    psycopg = None
+
+# Marks the Neuron360 IDs of seeded rows
+SEED_PREFIX = "explain-"
+
+# Values per `in` lookup, as sent by get_many_by_neuron_ids and delete_many
+LOOKUP_CHUNK_SIZE = 100
+
+# (name, table, filter column, query) for each lookup. `%(values)s` is
+# a list of sample values of the filter column and `%(value)s` one of them,
+# matching the `in` and `eq` filters PostgREST turns requests into.
+LOOKUPS: List[Tuple[str, str, str, str]] = [
+    (
+        "person by Neuron360 ID",
+        "people.identities",
+        "neuron360_profile_id",
+        "SELECT people_id FROM people.identities "
+        "WHERE neuron360_profile_id = %(value)s LIMIT 1",
+    ),
+    (
+        "people by Neuron360 IDs",
+        "people.identities",
+        "neuron360_profile_id",
+        "SELECT people_id, neuron360_profile_id FROM people.identities "
+        "WHERE neuron360_profile_id = ANY(%(values)s)",
+    ),
+    (
+        "organisations by Neuron360 IDs",
+        "organisation.identities",
+        "neuron360_company_id",
+        "SELECT neuron360_company_id FROM organisation.identities "
+        "WHERE neuron360_company_id = ANY(%(values)s)",
+    ),
+    (
+        "offices by Neuron360 IDs",
+        "organisation.offices",
+        "neuron360_office_id",
+        "SELECT office_id, neuron360_office_id FROM organisation.offices "
+        "WHERE neuron360_office_id = ANY(%(values)s)",
+    ),
+    (
+        "identities page after key",
+        "people.identities",
+        "people_id",
+        "SELECT * FROM people.identities WHERE people_id > %(value)s "
+        "ORDER BY people_id LIMIT 1000",
+    ),
+    (
+        "profiles by people_id",
+        "people.profiles",
+        "people_id",
+        "SELECT * FROM people.profiles WHERE people_id = ANY(%(values)s)",
+    ),
+]
+
+# Child tables and the foreign key column they are read and cascaded by
+CHILD_KEYS: List[Tuple[str, str]] = [
+    *(
+        (f"people.{table}", "people_id")
+        for table in (
+            "genders",
+            "social_links",
+            "statuses",
+            "emails",
+            "phones",
+            "addresses",
+            "experiences",
+            "educations",
+            "certifications",
+            "memberships",
+            "publications",
+            "patents",
+            "awards",
+        )
+    ),
+    ("people.job_title_details", "experience_id"),
+    ("people.job_functions", "experience_id"),
+    ("people.job_seniority", "experience_id"),
+    *(
+        (f"organisation.{table}", "organisation_id")
+        for table in (
+            "web_addresses",
+            "employees",
+            "social_links",
+            "industries",
+            "phones",
+            "offices",
+        )
+    ),
+    ("organisation.office_addresses", "office_id"),
+    ("organisation.office_industries", "office_id"),
+]
+
+# Parent table of each child key column, where its sample values come from
+_PARENT_KEYS = {
+    "people_id": ("people.identities", "people_id"),
+    "experience_id": ("people.experiences", "id"),
+    "organisation_id": ("organisation.identities", "organisation_id"),
+    "office_id": ("organisation.offices", "office_id"),
+}
+
+SEED_STATEMENTS = [
+    "INSERT INTO people.identities (neuron360_profile_id, first_name) "
+    "SELECT %(prefix)s || g, 'Seed' FROM generate_series(1, %(people)s) g",
+    "INSERT INTO people.profiles (people_id, headline) "
+    "SELECT people_id, 'Seed' FROM people.identities "
+    "WHERE neuron360_profile_id LIKE %(prefix)s || '%%'",
+    "INSERT INTO people.emails (people_id, email) "
+    "SELECT people_id, neuron360_profile_id || '@example.com' "
+    "FROM people.identities WHERE neuron360_profile_id LIKE %(prefix)s || '%%'",
+    "INSERT INTO people.experiences (people_id, job_title) "
+    "SELECT people_id, 'Seed ' || n "
+    "FROM people.identities, generate_series(1, 3) n "
+    "WHERE neuron360_profile_id LIKE %(prefix)s || '%%'",
+    "INSERT INTO people.job_functions (experience_id, level1_name) "
+    "SELECT e.id, 'Seed' FROM people.experiences e "
+    "JOIN people.identities i USING (people_id) "
+    "WHERE i.neuron360_profile_id LIKE %(prefix)s || '%%'",
+    "INSERT INTO organisation.identities (neuron360_company_id, name) "
+    "SELECT %(prefix)s || g, 'Seed' "
+    "FROM generate_series(1, greatest(%(people)s / 10, 1)) g",
+    "INSERT INTO organisation.offices (organisation_id, neuron360_office_id) "
+    "SELECT organisation_id, neuron360_company_id FROM organisation.identities "
+    "WHERE neuron360_company_id LIKE %(prefix)s || '%%'",
+]
+
+CLEANUP_STATEMENTS = [
+    "DELETE FROM people.profiles WHERE people_id IN (SELECT people_id "
+    "FROM people.identities WHERE neuron360_profile_id LIKE %(prefix)s || '%%')",
+    "DELETE FROM people.identities "
+    "WHERE neuron360_profile_id LIKE %(prefix)s || '%%'",
+    "DELETE FROM organisation.identities "
+    "WHERE neuron360_company_id LIKE %(prefix)s || '%%'",
+]
+
+INVALID_INDEXES = (
+    "SELECT n.nspname || '.' || c.relname FROM pg_index i "
+    "JOIN pg_class c ON c.oid = i.indexrelid "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE NOT i.indisvalid AND n.nspname IN ('people', 'organisation')"
+)
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every node of an EXPLAIN (FORMAT JSON) plan tree.
+    """
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def describe_scans(plan: Dict[str, Any]) -> List[str]:
+    """
+    Returns the scans of a plan, e.g. "Index Scan using idx_x on emails".
+    """
+    scans = []
+    for node in plan_nodes(plan):
+        if "Relation Name" not in node and "Index Name" not in node:
+            continue
+        scan = node["Node Type"]
+        if "Index Name" in node:
+            scan += f" using {node['Index Name']}"
+        if "Relation Name" in node:
+            scan += f" on {node['Relation Name']}"
+        scans.append(scan)
+    return scans
+
+
+def _table_rows(connection, table_name: str) -> int:
+    # The planner's estimate, which is what it chooses scans by
+    row = connection.execute(
+        "SELECT greatest(reltuples, 0)::bigint FROM pg_class "
+        "WHERE oid = to_regclass(%s)",
+        (table_name,),
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def _sample(connection, table_name: str, column: str, size: int) -> List[Any]:
+    # A block sample avoids scanning large tables; small ones are read directly
+    for clause in ("TABLESAMPLE SYSTEM (1)", ""):
+        rows = connection.execute(
+            f"SELECT {column} FROM {table_name} {clause} "
+            f"WHERE {column} IS NOT NULL LIMIT %s",
+            (size,),
+        ).fetchall()
+        if len(rows) >= size or clause == "":
+            return [row[0] for row in rows]
+    return []
+
+
+def _lookups() -> Iterator[Tuple[str, str, str, Tuple[str, str]]]:
+    # Each lookup with the table and column its sample values come from
+    for name, table_name, column, query in LOOKUPS:
+        yield name, table_name, query, (table_name, column)
+    for table_name, column in CHILD_KEYS:
+        query = f"SELECT * FROM {table_name} WHERE {column} = ANY(%(values)s)"
+        name = f"{table_name.split('.')[1]} by {column}"
+        yield name, table_name, query, _PARENT_KEYS[column]
+
+
+def explain(connection, query: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs a query with EXPLAIN (ANALYZE, BUFFERS) and returns its plan. The
+    query is rolled back, so EXPLAIN ANALYZE of a write changes nothing.
+    """
+    with connection.transaction(force_rollback=True):
+        result = connection.execute(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, params
+        ).fetchone()[0]
+    return (json.loads(result) if isinstance(result, str) else result)[0]
+
+
+def _seed(connection, people: int, cleanup: bool):
+    statements = CLEANUP_STATEMENTS if cleanup else SEED_STATEMENTS
+    params = {"prefix": SEED_PREFIX, "people": people}
+    started = time.perf_counter()
+    for statement in statements:
+        connection.execute(statement, params)
+    if not cleanup:
+        connection.execute("ANALYZE")
+    action = "Deleted" if cleanup else f"Seeded {people} people,"
+    print(f"{action} seed rows in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=config.SUPABASE_DB_URL)
+    parser.add_argument("--seed-people", type=int, default=0)
+    parser.add_argument("--cleanup", action="store_true")
+    parser.add_argument("--min-rows", type=int, default=10_000)
+    parser.add_argument("--show-plans", action="store_true")
+    args = parser.parse_args()
+
+    if psycopg is None:
+        parser.error("psycopg is needed: pip install 'psycopg[binary]'")
+    if not args.dsn:
+        parser.error("pass --dsn or set SUPABASE_DB_URL")
+
+    problems = 0
+    with psycopg.connect(args.dsn, autocommit=True) as connection:
+        if args.seed_people:
+            _seed(connection, args.seed_people, cleanup=False)
+
+        for (index_name,) in connection.execute(INVALID_INDEXES).fetchall():
+            print(f"INVALID INDEX {index_name}: drop it and rerun the migration")
+            problems += 1
+
+        print(
+            f"{'lookup':<36} {'table rows':>11} {'rows':>6} {'buffers':>8} "
+            f"{'ms':>8}  scans"
+        )
+        for name, table_name, query, source in _lookups():
+            values = _sample(connection, *source, LOOKUP_CHUNK_SIZE)
+            if not values:
+                print(f"{name:<36} {'(no rows to sample)':>11}")
+                continue
+            plan = explain(connection, query, {"values": values, "value": values[0]})
+            table_rows = _table_rows(connection, table_name)
+            root = plan["Plan"]
+            scans = describe_scans(root)
+            sequential = any(
+                scan.startswith("Seq Scan") for scan in scans
+            ) and table_rows >= max(args.min_rows, 1)
+            problems += sequential
+            buffers = root.get("Shared Hit Blocks", 0) + root.get(
+                "Shared Read Blocks", 0
+            )
+            print(
+                f"{name:<36} {table_rows:>11} {root.get('Actual Rows', 0):>6} "
+                f"{buffers:>8} {plan.get('Execution Time', 0):>8.2f}  "
+                f"{'; '.join(scans)}{'  <-- SEQUENTIAL SCAN' if sequential else ''}"
+            )
+            if args.show_plans:
+                print(json.dumps(plan, indent=2))
+
+        if args.cleanup:
+            _seed(connection, args.seed_people, cleanup=True)
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import json
 from src.managers.people_manager import PeopleManager
 from src.managers.organisation_manager import OrganisationManager
+from src.services.service_metrics import log_metrics_summary
 from src.utils.logging import logger
 
 
@@ -46,6 +47,7 @@ def main():
         people_manager.process_person_data(person_record)
 
     logger.info("Data processing pipeline finished.")
+    log_metrics_summary()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+import argparse
+import time
+from src.services.fake_postgrest import FAKE_API_KEY, FakePostgrestServer
+from src.services.sqlite_backend import SQLiteBackend
+from src.utils.logging import logger
+
+
+def main(args):
+    """
+    Runs a local PostgREST-compatible server for load-testing the uploader.
+    """
+    server = FakePostgrestServer(
+        host=args.host,
+        port=args.port,
+        latency_seconds=args.latency_ms / 1000,
+        jitter_seconds=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        backend=SQLiteBackend(args.database),
+    )
+    server.start()
+    logger.info(
+        f"Point the uploader at it with SUPABASE_URL={server.url} "
+        f"SUPABASE_SERVICE_ROLE_KEY={FAKE_API_KEY}"
+    )
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"Fake PostgREST requests so far: {dict(server.stats)}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a local PostgREST-compatible server backed by SQLite."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="Fixed delay added to requests."
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0,
+        help="Maximum random delay added on top of --latency-ms.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="Fraction of requests answered with a 503.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for reproducible delays.")
+    parser.add_argument(
+        "--database",
+        default=":memory:",
+        help="SQLite database path; in memory by default.",
+    )
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,107 @@
+import argparse
+import os
+from typing import List, Optional
+
+from src.utils.logging import logger
+from src.managers.people_manager import PeopleManager
+from src.managers.organisation_manager import OrganisationManager
+
+
+def read_ids(ids: List[str], ids_file: Optional[str] = None) -> List[str]:
+    """
+    Returns the IDs given on the command line followed by those listed one
+    per line in `ids_file`, without duplicates.
+    """
+    if ids_file:
+        with open(ids_file, "r") as f:
+            ids = [*ids, *(line.strip() for line in f)]
+    return list(dict.fromkeys(i for i in ids if i))
+
+
+def source_files(sources: List[str]) -> List[str]:
+    """
+    Expands the given files and directories into the JSON files to read.
+    """
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            files.extend(
+                os.path.join(source, f)
+                for f in sorted(os.listdir(source))
+                if f.endswith(".json")
+            )
+        else:
+            files.append(source)
+    return files
+
+
+def main(args):
+    """
+    Purges people or organisations with everything stored under them and,
+    for people, ingests their records again from the given files.
+    """
+    ids = read_ids(args.ids, args.ids_file)
+    if not ids:
+        logger.error("No IDs given. Nothing to do.")
+        return
+
+    org_manager = OrganisationManager()
+    if args.organisations:
+        deleted = org_manager.purge_organisations(ids)
+        logger.info(f"Purged {deleted}/{len(ids)} organisations.")
+        return
+
+    people_manager = PeopleManager(org_manager=org_manager)
+    if args.purge_only:
+        deleted = people_manager.purge_profiles(ids)
+        logger.info(f"Purged {deleted}/{len(ids)} people.")
+        return
+
+    files = source_files(args.source)
+    logger.info(f"Reingesting {len(ids)} profiles from {len(files)} files.")
+    success_count, failure_count = people_manager.reingest_profiles(ids, files)
+    logger.info(
+        f"Reingest finished: {success_count} succeeded, {failure_count} failed."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Replace the stored data of Neuron360 profiles: purge each person "
+            "with everything under them, then process their records again."
+        )
+    )
+    parser.add_argument(
+        "ids",
+        nargs="*",
+        help="Neuron360 profile IDs, or organisation IDs with --organisations.",
+    )
+    parser.add_argument("--ids-file", help="A file listing further IDs, one per line.")
+    parser.add_argument(
+        "--source",
+        nargs="+",
+        default=[],
+        help=(
+            "Neuron360 result files, or directories of them, holding the "
+            "records to reingest."
+        ),
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--purge-only",
+        action="store_true",
+        help="Delete the people without reingesting them.",
+    )
+    mode.add_argument(
+        "--organisations",
+        action="store_true",
+        help=(
+            "Treat the IDs as organisation_ids and delete those organisations "
+            "with their offices and details. Nothing is reingested."
+        ),
+    )
+    args = parser.parse_args()
+    if not (args.source or args.purge_only or args.organisations):
+        parser.error("--source is required unless --purge-only or --organisations")
+    main(args)
@@ -1,15 +1,23 @@
 import argparse
+import asyncio
 import os
 import time
 import json
 import shutil
 import concurrent.futures
+from concurrent.futures import Executor
 from functools import partial
+from typing import Optional
 
 from src.utils.logging import logger
 from src.utils.progress_logger import ProgressLogger
 from src.managers.people_manager import PeopleManager
 from src.managers.organisation_manager import OrganisationManager
+from src.services.client_registry import async_client_registry, storage_supports_rpc
+from src.services.read_cache import read_cache_stats
+from src.services.service_metrics import log_metrics_summary, prometheus_text
+from src.services.write_coalescer import WriteCoalescer
+from src.services.write_retry import write_retry_stats
 
 # Configure basic logging
 # logging.basicConfig(
@@ -22,17 +30,73 @@ FAILED_DIR = "data/neuron360/failed_uploads"
 PROGRESS_CSV_PATH = "data/supabase_upload_progress.csv"
 
 
-def process_file(file_path: str, progress_logger: ProgressLogger):
+def finalise_file(
+    file_path: str,
+    success_count: int,
+    failure_count: int,
+    duration: float,
+    progress_logger: ProgressLogger,
+):
+    """
+    Deletes a fully uploaded file, or moves it to the failed directory if any
+    of its records failed, and records the outcome in the progress log.
+    """
+    if failure_count > 0:
+        # Move to failed directory if any record fails
+        os.makedirs(FAILED_DIR, exist_ok=True)
+        shutil.move(file_path, os.path.join(FAILED_DIR, os.path.basename(file_path)))
+        progress_logger.log_end(
+            file_path, success_count, failure_count, duration, "FAILED"
+        )
+        logger.error(
+            "Moved %s to failed directory due to %s processing errors.",
+            file_path,
+            failure_count,
+        )
+    else:
+        # Delete file on full success
+        os.remove(file_path)
+        progress_logger.log_end(
+            file_path, success_count, failure_count, duration, "COMPLETED"
+        )
+        logger.info(f"Successfully processed and deleted {file_path}.")
+
+
+def process_file(
+    file_path: str,
+    progress_logger: ProgressLogger,
+    use_rpc: bool = False,
+    use_batch_writer: bool = False,
+    write_coalescer: Optional[WriteCoalescer] = None,
+    use_staging: bool = False,
+    use_bulk_ingest: bool = False,
+    transform_executor: Optional[Executor] = None,
+):
     """
     Worker function to process a single JSON file.
-    Instantiates its own managers to ensure thread safety.
+    Instantiates its own managers; their services share the pooled
+    per-schema Supabase clients, so this does not open new connections.
+    With `use_rpc`, each person is written in one database round trip; with
+    `use_batch_writer`, the file's records are written in per-table batches;
+    with a shared `write_coalescer`, they are batched across all workers;
+    with `use_staging`, they are staged and merged server-side in one batch;
+    with `use_bulk_ingest`, they are written with one bulk upsert per table,
+    after being transformed in `transform_executor` if one is given.
     """
     logger.info(f"Processing file: {file_path}")
     start_time = time.time()
 
-    # Instantiate managers within the thread for thread safety
+    # Managers are cheap to build: the underlying clients are shared
     org_manager = OrganisationManager()
-    people_manager = PeopleManager(org_manager=org_manager)
+    people_manager = PeopleManager(
+        org_manager=org_manager,
+        use_rpc=use_rpc,
+        use_batch_writer=use_batch_writer,
+        write_coalescer=write_coalescer,
+        use_staging=use_staging,
+        use_bulk_ingest=use_bulk_ingest,
+        transform_executor=transform_executor,
+    )
 
     profile_count = 0
     try:
@@ -49,29 +113,13 @@ def process_file(file_path: str, progress_logger: ProgressLogger):
         success_count, failure_count = people_manager.process_people_from_file(
             file_path
         )
-
-        duration = time.time() - start_time
-        if failure_count > 0:
-            # Move to failed directory if any record fails
-            os.makedirs(FAILED_DIR, exist_ok=True)
-            shutil.move(
-                file_path, os.path.join(FAILED_DIR, os.path.basename(file_path))
-            )
-            progress_logger.log_end(
-                file_path, success_count, failure_count, duration, "FAILED"
-            )
-            logger.error(
-                "Moved %s to failed directory due to %s processing errors.",
-                file_path,
-                failure_count,
-            )
-        else:
-            # Delete file on full success
-            os.remove(file_path)
-            progress_logger.log_end(
-                file_path, success_count, failure_count, duration, "COMPLETED"
-            )
-            logger.info(f"Successfully processed and deleted {file_path}.")
+        finalise_file(
+            file_path,
+            success_count,
+            failure_count,
+            time.time() - start_time,
+            progress_logger,
+        )
 
     except Exception as e:
         duration = time.time() - start_time
@@ -84,6 +132,79 @@ def process_file(file_path: str, progress_logger: ProgressLogger):
         )
 
 
+async def process_file_async(
+    file_path: str,
+    progress_logger: ProgressLogger,
+    people_manager: PeopleManager,
+    file_semaphore: asyncio.Semaphore,
+):
+    """
+    The asyncio counterpart of process_file.
+    All files share one set of managers and the same event loop.
+    """
+    async with file_semaphore:
+        logger.info(f"Processing file: {file_path}")
+        start_time = time.time()
+        profile_count = 0
+        try:
+            with open(file_path, "r") as f:
+                data = json.load(f)
+            profile_count = len(data.get("results", []))
+
+            if profile_count == 0:
+                logger.warning(
+                    f"No profiles found in {file_path}. Deleting empty file."
+                )
+                os.remove(file_path)
+                return
+
+            progress_logger.log_start(file_path, profile_count)
+            success_count, failure_count = (
+                await people_manager.process_people_from_file_async(file_path)
+            )
+            finalise_file(
+                file_path,
+                success_count,
+                failure_count,
+                time.time() - start_time,
+                progress_logger,
+            )
+
+        except Exception as e:
+            duration = time.time() - start_time
+            logger.error(f"Critical error processing {file_path}: {e}", exc_info=True)
+            os.makedirs(FAILED_DIR, exist_ok=True)
+            shutil.move(
+                file_path, os.path.join(FAILED_DIR, os.path.basename(file_path))
+            )
+            progress_logger.log_end(
+                file_path, 0, profile_count, duration, "CRITICAL_FAILURE"
+            )
+
+
+async def run_cycle_async(
+    files_to_process: list, progress_logger: ProgressLogger, workers: int
+):
+    """
+    Processes one batch of files on a single event loop, with at most
+    `workers` files open at once.
+    """
+    org_manager = OrganisationManager()
+    people_manager = PeopleManager(org_manager=org_manager)
+    file_semaphore = asyncio.Semaphore(workers)
+    try:
+        await asyncio.gather(
+            *[
+                process_file_async(
+                    file_path, progress_logger, people_manager, file_semaphore
+                )
+                for file_path in files_to_process
+            ]
+        )
+    finally:
+        await async_client_registry.close()
+
+
 def main(args):
     """
     Main function to orchestrate the processing and uploading of profile data.
@@ -91,6 +212,14 @@ def main(args):
     logger.info(f"Starting Supabase uploader with {args.workers} workers.")
     progress_logger = ProgressLogger(PROGRESS_CSV_PATH)
     os.makedirs(SOURCE_DIR, exist_ok=True)
+    # One coalescer shared by all worker threads, so their writes are batched
+    write_coalescer = WriteCoalescer() if args.coalesce_writes else None
+    # Worker processes shared by all threads, so transforms use every core
+    transform_executor = (
+        concurrent.futures.ProcessPoolExecutor(args.transform_processes)
+        if args.transform_processes
+        else None
+    )
 
     while True:
         try:
@@ -108,8 +237,24 @@ def main(args):
                 f"Found {len(files_to_process)} files to process in this cycle."
             )
 
+            if args.use_async:
+                asyncio.run(
+                    run_cycle_async(files_to_process, progress_logger, args.workers)
+                )
+                logger.info("Processing cycle complete. Checking for new files.")
+                continue
+
             # We use a partial function to pass the progress_logger to the worker
-            worker_func = partial(process_file, progress_logger=progress_logger)
+            worker_func = partial(
+                process_file,
+                progress_logger=progress_logger,
+                use_rpc=args.use_rpc,
+                use_batch_writer=args.batch_writes,
+                write_coalescer=write_coalescer,
+                use_staging=args.staging_merge,
+                use_bulk_ingest=args.bulk_ingest,
+                transform_executor=transform_executor,
+            )
 
             with concurrent.futures.ThreadPoolExecutor(
                 max_workers=args.workers
@@ -125,6 +270,30 @@ def main(args):
             )
             time.sleep(60)  # Wait a minute before retrying
 
+    if write_coalescer is not None:
+        write_coalescer.close()
+    if transform_executor is not None:
+        transform_executor.shutdown()
+
+    for table_name, stats in read_cache_stats().items():
+        logger.info(
+            f"Read cache {table_name}: {stats['hits']} hits, {stats['misses']} "
+            f"misses ({stats['hit_rate']:.1%}), {stats['size']} entries, "
+            f"{stats['evictions']} evictions"
+        )
+
+    for table_name, stats in write_retry_stats().items():
+        logger.info(
+            f"Write retries {table_name}: {stats['retries']} retries, "
+            f"{stats['budget_exhausted']} refused by the retry budget"
+        )
+
+    log_metrics_summary()
+    if args.metrics_file:
+        with open(args.metrics_file, "w") as f:
+            f.write(prometheus_text())
+        logger.info(f"Wrote service metrics to {args.metrics_file}")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -136,5 +305,80 @@ if __name__ == "__main__":
         default=50,
         help="Number of concurrent threads to use for processing files.",
     )
+    parser.add_argument(
+        "--metrics-file",
+        help=(
+            "Write per-table request metrics to this file in the Prometheus "
+            "text format when the run ends."
+        ),
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--use-async",
+        action="store_true",
+        help=(
+            "Process files on a single asyncio event loop instead of a thread "
+            "pool. --workers then bounds the number of files open at once."
+        ),
+    )
+    mode.add_argument(
+        "--use-rpc",
+        action="store_true",
+        help=(
+            "Write each person in one transaction through the "
+            "people.ingest_person database function, which must be installed "
+            "from sql/functions."
+        ),
+    )
+    mode.add_argument(
+        "--batch-writes",
+        action="store_true",
+        help=(
+            "Buffer each file's records per table and write them as multi-row "
+            "upserts, flushed by size, age and at the end of the file."
+        ),
+    )
+    mode.add_argument(
+        "--coalesce-writes",
+        action="store_true",
+        help=(
+            "Hand all workers' records to one writer thread per table, which "
+            "sends them as large multi-row upserts."
+        ),
+    )
+    mode.add_argument(
+        "--staging-merge",
+        action="store_true",
+        help=(
+            "Bulk-load each file's records into staging.rows without existence "
+            "checks and merge them with the staging.merge_batch database "
+            "function, installed from sql/."
+        ),
+    )
+    mode.add_argument(
+        "--bulk-ingest",
+        action="store_true",
+        help=(
+            "Build all new records of each file in memory and write them with "
+            "one multi-row upsert per table, failing only the people whose "
+            "rows are rejected."
+        ),
+    )
+    parser.add_argument(
+        "--transform-processes",
+        type=int,
+        default=0,
+        help=(
+            "With --bulk-ingest, turn records into rows in this many worker "
+            "processes instead of in the uploading threads."
+        ),
+    )
     args = parser.parse_args()
+    if args.transform_processes and not args.bulk_ingest:
+        parser.error("--transform-processes requires --bulk-ingest")
+    if (args.use_rpc or args.staging_merge) and not storage_supports_rpc():
+        parser.error(
+            "--use-rpc and --staging-merge call database functions, which "
+            "STORAGE_BACKEND=sqlite does not provide"
+        )
     main(args)
@@ -0,0 +1,71 @@
+-- =================================================================
+--  people.ingest_person(payload JSONB)
+--
+--  Writes the whole graph of one person (identity, profile, contact
+--  details, experiences with their companies and offices, and resume
+--  items) in a single transaction, so an upload costs one round trip
+--  per person and a person is either fully stored or not at all.
+--
+--  The payload is built by PeopleManager in RPC mode. Keys are
+--  generated client-side and the writes are listed parent tables first:
+--
+--  {
+--    "people_id": "<uuid>",
+--    "writes": [
+--      {"table": "people.identities", "rows": [{...}]},
+--      {"table": "people.profiles", "rows": [{...}]},
+--      {"table": "organisation.identities", "rows": [{...}, {...}]},
+--      ...
+--    ]
+--  }
+--
+--  Each row only carries the columns it has values for. Columns absent
+--  from every row of a table (e.g. created_at) keep their defaults.
+--
+--  Keys are derived deterministically from the Neuron360 IDs, so rows
+--  that already exist (from an earlier or concurrent attempt) are left
+--  untouched and retrying a person is safe.
+-- =================================================================
+
+CREATE OR REPLACE FUNCTION people.ingest_person(payload JSONB)
+RETURNS UUID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    step JSONB;
+    target_table TEXT;
+    target_columns TEXT;
+BEGIN
+    FOR step IN SELECT value FROM jsonb_array_elements(payload -> 'writes') LOOP
+        target_table := step ->> 'table';
+
+        -- Only tables of the people and organisation schemas may be written
+        IF split_part(target_table, '.', 1) NOT IN ('people', 'organisation') THEN
+            RAISE EXCEPTION 'ingest_person cannot write to table %', target_table;
+        END IF;
+
+        SELECT string_agg(quote_ident(column_name), ', ')
+        INTO target_columns
+        FROM (
+            SELECT DISTINCT jsonb_object_keys(row_data) AS column_name
+            FROM jsonb_array_elements(step -> 'rows') AS r(row_data)
+        ) AS keys;
+
+        IF target_columns IS NULL THEN
+            CONTINUE;
+        END IF;
+
+        EXECUTE format(
+            'INSERT INTO %1$s (%2$s) SELECT %2$s FROM jsonb_populate_recordset(NULL::%1$s, $1) '
+            'ON CONFLICT DO NOTHING',
+            target_table::regclass,
+            target_columns
+        ) USING step -> 'rows';
+    END LOOP;
+
+    RETURN (payload ->> 'people_id')::UUID;
+END;
+$$;
+
+-- Allow the uploader's service role to call the function through PostgREST
+GRANT EXECUTE ON FUNCTION people.ingest_person(JSONB) TO service_role;
@@ -0,0 +1,97 @@
+-- =================================================================
+--  staging.merge_batch(p_batch_id UUID, p_tables TEXT[])
+--
+--  Moves one batch of staged rows (see staging.rows) into the people
+--  and organisation schemas with one set-based
+--  INSERT ... SELECT ... ON CONFLICT DO NOTHING per table, then
+--  deletes the batch from staging. This replaces the per-row existence
+--  checks of the default upload: rows whose key or Neuron360 ID already
+--  exists are simply skipped by the database.
+--
+--  p_tables lists the tables to merge, parents first (the uploader
+--  passes TABLE_WRITE_ORDER). After a parent table is merged, staged
+--  rows referencing a parent key that is still missing are dropped.
+--  This happens when the parent already existed under another key
+--  (stored before keys were deterministic), in which case its details
+--  are skipped, as the default upload does.
+--
+--  INSERT ... ON CONFLICT is used rather than MERGE, as it stays
+--  correct when several batches insert the same rows concurrently.
+--
+--  Returns the number of rows inserted per table. The function runs in
+--  a single transaction, so a batch is merged entirely or not at all
+--  and can be retried.
+-- =================================================================
+
+CREATE OR REPLACE FUNCTION staging.merge_batch(p_batch_id UUID, p_tables TEXT[])
+RETURNS TABLE (target_table TEXT, merged_rows BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    target_columns TEXT;
+    source_columns TEXT;
+    parent_key TEXT;
+    child_column TEXT;
+BEGIN
+    FOREACH target_table IN ARRAY p_tables LOOP
+        -- Only tables of the people and organisation schemas may be written
+        IF split_part(target_table, '.', 1) NOT IN ('people', 'organisation') THEN
+            RAISE EXCEPTION 'merge_batch cannot write to table %', target_table;
+        END IF;
+
+        SELECT
+            string_agg(quote_ident(column_name), ', ' ORDER BY column_name),
+            string_agg('r.' || quote_ident(column_name), ', ' ORDER BY column_name)
+        INTO target_columns, source_columns
+        FROM (
+            SELECT DISTINCT jsonb_object_keys(s.row_data) AS column_name
+            FROM staging.rows s
+            WHERE s.batch_id = p_batch_id AND s.table_name = target_table
+        ) AS keys;
+
+        IF target_columns IS NULL THEN
+            CONTINUE;
+        END IF;
+
+        EXECUTE format(
+            'INSERT INTO %1$s (%2$s) SELECT %3$s FROM staging.rows s '
+            'CROSS JOIN LATERAL jsonb_populate_record(NULL::%1$s, s.row_data) r '
+            'WHERE s.batch_id = $1 AND s.table_name = $2 '
+            'ON CONFLICT DO NOTHING',
+            target_table::regclass,
+            target_columns,
+            source_columns
+        ) USING p_batch_id, target_table;
+
+        GET DIAGNOSTICS merged_rows = ROW_COUNT;
+        RETURN NEXT;
+
+        -- Drop staged children of parents that could not be inserted
+        FOR parent_key, child_column IN
+            SELECT p.parent_key, p.child_column
+            FROM (VALUES
+                ('people.identities', 'people_id', 'people_id'),
+                ('people.experiences', 'id', 'experience_id'),
+                ('organisation.identities', 'organisation_id', 'organisation_id'),
+                ('organisation.offices', 'office_id', 'office_id')
+            ) AS p(parent_table, parent_key, child_column)
+            WHERE p.parent_table = target_table
+        LOOP
+            EXECUTE format(
+                'DELETE FROM staging.rows s '
+                'WHERE s.batch_id = $1 AND s.row_data ? %1$L '
+                'AND NOT EXISTS (SELECT 1 FROM %2$s p WHERE p.%3$I = '
+                '(s.row_data ->> %1$L)::UUID)',
+                child_column,
+                target_table::regclass,
+                parent_key
+            ) USING p_batch_id;
+        END LOOP;
+    END LOOP;
+
+    DELETE FROM staging.rows s WHERE s.batch_id = p_batch_id;
+END;
+$$;
+
+-- Allow the uploader's service role to call the function through PostgREST
+GRANT EXECUTE ON FUNCTION staging.merge_batch(UUID, TEXT[]) TO service_role;
@@ -0,0 +1,49 @@
+-- =================================================================
+--  SQL Migration Script
+--  Adds unique constraints on the Neuron360 natural keys, so that a
+--  person, company or office can only be stored once and idempotent
+--  upserts (ON CONFLICT) can resolve against them.
+--
+--  IMPORTANT:
+--  1. Rows ingested before deterministic keys were introduced may hold
+--     duplicates. The script stops, changing nothing, if any are found;
+--     remove them before running it again.
+--  2. This script should be run as a single transaction.
+-- =================================================================
+
+BEGIN;
+
+DO $$
+DECLARE
+    duplicates INTEGER;
+BEGIN
+    SELECT count(*) INTO duplicates FROM (
+        SELECT neuron360_profile_id FROM people.identities
+        WHERE neuron360_profile_id IS NOT NULL
+        GROUP BY neuron360_profile_id HAVING count(*) > 1
+        UNION ALL
+        SELECT neuron360_company_id FROM organisation.identities
+        WHERE neuron360_company_id IS NOT NULL
+        GROUP BY neuron360_company_id HAVING count(*) > 1
+        UNION ALL
+        SELECT neuron360_office_id FROM organisation.offices
+        WHERE neuron360_office_id IS NOT NULL
+        GROUP BY neuron360_office_id HAVING count(*) > 1
+    ) AS duplicated_ids;
+
+    IF duplicates > 0 THEN
+        RAISE EXCEPTION '% duplicated Neuron360 IDs found, remove them first', duplicates;
+    END IF;
+END;
+$$;
+
+ALTER TABLE people.identities
+    ADD CONSTRAINT identities_neuron360_profile_id_key UNIQUE (neuron360_profile_id);
+
+ALTER TABLE organisation.identities
+    ADD CONSTRAINT identities_neuron360_company_id_key UNIQUE (neuron360_company_id);
+
+ALTER TABLE organisation.offices
+    ADD CONSTRAINT offices_neuron360_office_id_key UNIQUE (neuron360_office_id);
+
+COMMIT;
@@ -0,0 +1,71 @@
+-- =================================================================
+--  SQL Migration Script
+--  Indexes every column the services filter on besides the primary
+--  and Neuron360 keys (which V4 indexes through its unique constraints):
+--  the people_id, experience_id, organisation_id and office_id columns
+--  that child tables are read by, and that the ON DELETE CASCADE
+--  foreign keys search when a person or organisation is purged.
+--  Without them, each lookup and each cascaded delete scans the whole
+--  child table.
+--
+--  IMPORTANT:
+--  1. Indexes are built CONCURRENTLY so that ingestion can continue, so
+--     this script must NOT be run inside a transaction (run it with
+--     psql, without --single-transaction).
+--  2. The names match sql/table_creation_query, so indexes that already
+--     exist are skipped. A build that fails leaves an INVALID index,
+--     which IF NOT EXISTS would also skip: benchmarks/explain_lookups.py
+--     lists them; drop them and run the script again.
+-- =================================================================
+
+-- == people: children of people.profiles ===========================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_genders_people_id ON people.genders(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_social_links_people_id ON people.social_links(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_statuses_people_id ON people.statuses(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_emails_people_id ON people.emails(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_phones_people_id ON people.phones(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_addresses_people_id ON people.addresses(people_id);
+
+-- == people: experiences and their details =========================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_experiences_people_id ON people.experiences(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_title_details_experience_id ON people.job_title_details(experience_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_functions_experience_id ON people.job_functions(experience_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_seniority_experience_id ON people.job_seniority(experience_id);
+
+-- == people: resume items and their web addresses ==================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_educations_people_id ON people.educations(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_education_web_addresses_education_id ON people.education_web_addresses(education_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_certifications_people_id ON people.certifications(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_certification_web_addresses_certification_id ON people.certification_web_addresses(certification_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_memberships_people_id ON people.memberships(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_membership_web_addresses_membership_id ON people.membership_web_addresses(membership_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_publications_people_id ON people.publications(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_publication_web_addresses_publication_id ON people.publication_web_addresses(publication_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patents_people_id ON people.patents(people_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patent_web_addresses_patent_id ON people.patent_web_addresses(patent_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_awards_people_id ON people.awards(people_id);
+
+-- == organisation: children of organisation.identities =============
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_web_addresses_organisation_id ON organisation.web_addresses(organisation_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_employees_organisation_id ON organisation.employees(organisation_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_social_links_organisation_id ON organisation.social_links(organisation_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_industries_organisation_id ON organisation.industries(organisation_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_phones_organisation_id ON organisation.phones(organisation_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offices_organisation_id ON organisation.offices(organisation_id);
+
+-- == organisation: children of organisation.offices ================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_office_addresses_office_id ON organisation.office_addresses(office_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_office_industries_office_id ON organisation.office_industries(office_id);
+
+-- Refresh the planner statistics the new indexes are costed with
+ANALYZE people.genders, people.social_links, people.statuses, people.emails,
+    people.phones, people.addresses, people.experiences,
+    people.job_title_details, people.job_functions, people.job_seniority,
+    people.educations, people.education_web_addresses, people.certifications,
+    people.certification_web_addresses, people.memberships,
+    people.membership_web_addresses, people.publications,
+    people.publication_web_addresses, people.patents,
+    people.patent_web_addresses, people.awards, organisation.web_addresses,
+    organisation.employees, organisation.social_links, organisation.industries,
+    organisation.phones, organisation.offices, organisation.office_addresses,
+    organisation.office_industries;
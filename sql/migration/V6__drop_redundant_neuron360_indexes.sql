@@ -0,0 +1,17 @@
+-- =================================================================
+--  SQL Migration Script
+--  Drops the plain indexes on people.identities.neuron360_profile_id
+--  and organisation.offices.neuron360_office_id. The unique constraints
+--  added by V4 index the same columns, so these only double the index
+--  maintenance of every insert.
+--
+--  IMPORTANT:
+--  1. Run this only once V4 has been applied: until then these indexes
+--     are the only ones on the Neuron360 IDs.
+--  2. Indexes are dropped CONCURRENTLY so that ingestion can continue,
+--     so this script must NOT be run inside a transaction.
+-- =================================================================
+
+DROP INDEX CONCURRENTLY IF EXISTS people.idx_people_identities_neuron360_profile_id;
+
+DROP INDEX CONCURRENTLY IF EXISTS organisation.idx_offices_neuron360_office_id;
@@ -4,7 +4,7 @@ CREATE SCHEMA IF NOT EXISTS organisation;
 -- Create identities table
 CREATE TABLE organisation.identities (
     organisation_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    neuron360_company_id TEXT,
+    neuron360_company_id TEXT UNIQUE,
     name TEXT,
     domain TEXT,
     logo_url TEXT,
@@ -13,9 +13,6 @@ CREATE TABLE organisation.identities (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create index on id for faster lookups
-CREATE INDEX idx_identities_id ON organisation.identities(id);
-
 -- Add trigger to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
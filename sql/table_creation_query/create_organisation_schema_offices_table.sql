@@ -5,7 +5,7 @@ CREATE SCHEMA IF NOT EXISTS organisation;
 CREATE TABLE organisation.offices (
     office_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     organisation_id UUID REFERENCES organisation.identities(organisation_id) ON DELETE CASCADE,
-    neuron360_office_id TEXT,
+    neuron360_office_id TEXT UNIQUE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -97,6 +97,5 @@ CREATE TRIGGER update_office_industries_updated_at
 
 -- Create indexes for better query performance
 CREATE INDEX idx_offices_organisation_id ON organisation.offices(organisation_id);
-CREATE INDEX idx_offices_neuron360_office_id ON organisation.offices(neuron360_office_id);
 CREATE INDEX idx_office_addresses_office_id ON organisation.office_addresses(office_id);
 CREATE INDEX idx_office_industries_office_id ON organisation.office_industries(office_id);
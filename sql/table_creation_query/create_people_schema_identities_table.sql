@@ -0,0 +1,30 @@
+-- Create schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS people;
+
+-- Create identities table
+CREATE TABLE people.identities (
+    people_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    neuron360_profile_id TEXT UNIQUE,
+    first_name TEXT,
+    last_name TEXT,
+    full_name TEXT,
+    picture_url TEXT,
+    last_modified_date TIMESTAMP,
+    last_seen_date TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Add trigger to automatically update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_identities_updated_at
+    BEFORE UPDATE ON people.identities
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,22 @@
+-- Create schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Raw rows bulk-loaded by the uploader in staging mode, before
+-- staging.merge_batch moves them into the people and organisation
+-- schemas. Rows are transient, so the table is unlogged: loads skip the
+-- WAL, and its contents are lost (truncated) after a crash, which only
+-- means the affected files are processed again.
+CREATE UNLOGGED TABLE staging.rows (
+    id UUID PRIMARY KEY,
+    batch_id UUID NOT NULL,
+    table_name TEXT NOT NULL,
+    row_data JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_staging_rows_batch_id ON staging.rows(batch_id, table_name);
+
+-- The uploader loads rows through PostgREST, so the staging schema must
+-- also be listed in the API's exposed schemas
+GRANT USAGE ON SCHEMA staging TO service_role;
+GRANT SELECT, INSERT, UPDATE, DELETE ON staging.rows TO service_role;
@@ -1,4 +1,13 @@
+from src.services.base_service import BaseService, serialize_model
+from src.services.async_base_service import AsyncBaseService
+from src.services.batch_writer import BatchWriter
+from src.services.schema import PARENT_TABLES
+from src.services.write_coalescer import WriteCoalescer
 from src.utils.logging import logger
+from src.transformers.profile_transformer import Row
+from pydantic import BaseModel
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class BaseManager:
@@ -9,6 +18,15 @@ class BaseManager:
 
     def __init__(self):
         self.logger = logger
+        self._async_services = {}
+        # This manager's services by table name, collected on first use
+        self._services_by_table: Dict[str, BaseService] = {}
+        # When set, records are buffered here instead of written one by one
+        self.batch_writer: Optional[BatchWriter] = None
+        # When set, records are handed to this shared coalescer; the futures
+        # of records not yet confirmed are collected in pending_writes
+        self.write_coalescer: Optional[WriteCoalescer] = None
+        self.pending_writes: List[Future] = []
         self.logger.info(f"{self.__class__.__name__} initialized.")
 
     def process(self, data):
@@ -31,3 +49,80 @@ class BaseManager:
         Logs an error message.
         """
         self.logger.error(message, exc_info=exc_info)
+
+    def _async_service(self, service: BaseService) -> AsyncBaseService:
+        """
+        Returns the async counterpart of a sync service, created on first use.
+        """
+        async_service = self._async_services.get(service.table_name)
+        if async_service is None:
+            async_service = AsyncBaseService(
+                service.table_name, service.model, service.primary_key
+            )
+            self._async_services[service.table_name] = async_service
+        return async_service
+
+    def _rows_by_table(
+        self, writes: List[Tuple[BaseService, BaseModel]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Groups records into serialized rows per table.
+
+        Tables keep the order of their first record. As a parent record is
+        always built before its children, parent tables come first.
+        """
+        rows: Dict[str, List[Dict[str, Any]]] = {}
+        for service, model in writes:
+            rows.setdefault(service.table_name, []).append(serialize_model(model))
+        return rows
+
+    def _writes(self, rows: List[Row]) -> List[Tuple[BaseService, BaseModel]]:
+        """
+        Pairs transformed rows with the services of their tables.
+        """
+        if not self._services_by_table:
+            self._services_by_table = {
+                service.table_name: service
+                for service in vars(self).values()
+                if isinstance(service, BaseService)
+            }
+        return [
+            (self._services_by_table[table_name], model) for table_name, model in rows
+        ]
+
+    def _store(self, service: BaseService, model: BaseModel) -> Optional[BaseModel]:
+        """
+        Writes a record idempotently: keys are deterministic, so a record
+        that was already stored by an earlier or concurrent attempt is left
+        as it is instead of being duplicated. With a batch writer attached,
+        the record is buffered and written with the rest of its table; with
+        a write coalescer, it is batched with other threads' records.
+        """
+        if self.batch_writer is not None:
+            return self.batch_writer.add(service, model)
+        if self.write_coalescer is not None:
+            future = self.write_coalescer.submit(service, model)
+            if service.table_name in PARENT_TABLES:
+                # Rows referencing this one may only be sent once it is stored
+                return model if future.result() else None
+            self.pending_writes.append(future)
+            return model
+        return service.upsert(
+            model,
+            on_conflict=service.primary_key,
+            ignore_duplicates=True,
+            return_minimal=True,
+        )
+
+    async def _store_async(
+        self, service: BaseService, model: BaseModel
+    ) -> Optional[BaseModel]:
+        """
+        The asyncio counterpart of _store.
+        """
+        return await self._async_service(service).upsert(
+            model,
+            on_conflict=service.primary_key,
+            ignore_duplicates=True,
+            return_minimal=True,
+        )
@@ -1,7 +1,16 @@
 from src.managers.base_manager import BaseManager
 from src.services import organisation_services
+from src.services.base_service import BaseService
+from src.services.read_cache import clear_read_caches
+from src.services.schema import TABLE_WRITE_ORDER
 from src.models import organisation as org_models
-from typing import Dict, Any
+from src.transformers.profile_transformer import (
+    OrganisationBundle,
+    ProfileTransformer,
+)
+from pydantic import BaseModel
+from typing import Dict, Any, Iterable, List, Tuple, Optional, Set
+import asyncio
 
 
 class OrganisationManager(BaseManager):
@@ -21,6 +30,85 @@ class OrganisationManager(BaseManager):
         self.office_service = organisation_services.OfficeService()
         self.office_address_service = organisation_services.OfficeAddressService()
         self.office_industry_service = organisation_services.OfficeIndustryService()
+        # Organisations currently being written by the async pipeline, keyed by
+        # neuron360_company_id, so concurrent experiences share one write.
+        self._pending_organisations: Dict[str, asyncio.Future] = {}
+        # What is known about existing organisations (neuron360_company_id ->
+        # exists) and offices (neuron360_office_id -> office_id, or None when
+        # absent). Filled by bulk prefetches and by our own writes, so those
+        # IDs need no per-record lookup.
+        self._organisation_exists: Dict[str, bool] = {}
+        self._office_ids: Dict[str, Optional[Any]] = {}
+        # When False, bundle_writes skips the existence lookups and keeps
+        # every company, leaving duplicates to a server-side merge.
+        self.check_existing = True
+        self.transformer = ProfileTransformer()
+
+    def _unchecked_ids(
+        self, experiences: List[Dict[str, Any]]
+    ) -> Tuple[Set[str], Set[str]]:
+        company_ids = {
+            exp["company_id"]
+            for exp in experiences
+            if exp.get("company_id")
+            and exp["company_id"] not in self._organisation_exists
+        }
+        office_ids = {
+            exp["office_id"]
+            for exp in experiences
+            if exp.get("office_id") and exp["office_id"] not in self._office_ids
+        }
+        return company_ids, office_ids
+
+    def _record_existing(
+        self,
+        company_ids: Set[str],
+        organisations: Optional[Dict[str, Any]],
+        office_ids: Set[str],
+        offices: Optional[Dict[str, Any]],
+    ):
+        # A failed bulk lookup (None) leaves the IDs unchecked so that they
+        # fall back to the per-record lookup.
+        if organisations is not None:
+            for company_id in company_ids:
+                self._organisation_exists[company_id] = company_id in organisations
+        if offices is not None:
+            for office_id in office_ids:
+                office = offices.get(office_id)
+                self._office_ids[office_id] = office["office_id"] if office else None
+
+    def prefetch_existing(self, experiences: List[Dict[str, Any]]):
+        """
+        Resolves which companies and offices referenced by a batch of
+        experiences already exist, using a few bulk queries instead of one
+        lookup per experience.
+        """
+        company_ids, office_ids = self._unchecked_ids(experiences)
+        self._record_existing(
+            company_ids,
+            self.identity_service.get_many_by_neuron_ids(
+                company_ids, columns=["neuron360_company_id"]
+            ),
+            office_ids,
+            self.office_service.get_many_by_neuron_ids(
+                office_ids, columns=["office_id"]
+            ),
+        )
+
+    async def prefetch_existing_async(self, experiences: List[Dict[str, Any]]):
+        """
+        The asyncio counterpart of prefetch_existing.
+        """
+        company_ids, office_ids = self._unchecked_ids(experiences)
+        organisations, offices = await asyncio.gather(
+            self._async_service(self.identity_service).get_many_by_neuron_ids(
+                company_ids, columns=["neuron360_company_id"]
+            ),
+            self._async_service(self.office_service).get_many_by_neuron_ids(
+                office_ids, columns=["office_id"]
+            ),
+        )
+        self._record_existing(company_ids, organisations, office_ids, offices)
 
     def process_organisation_data(self, exp_data: Dict[str, Any]):
         """
@@ -34,22 +122,19 @@ class OrganisationManager(BaseManager):
                 return
 
             # Check if an organisation with this neuron360_company_id already exists
-            existing_identity = self.identity_service.get_by_neuron_id(neuron_id)
-            if existing_identity:
+            exists = self._organisation_exists.get(neuron_id)
+            if exists is None:
+                exists = self.identity_service.exists("neuron360_company_id", neuron_id)
+            if exists:
+                self._organisation_exists[neuron_id] = True
                 self._log_success(
                     f"Skipping existing Organisation with neuron_id: {neuron_id}"
                 )
                 return
 
             # 1. Create Organisation Identity
-            identity_model = org_models.Identity(
-                neuron360_company_id=neuron_id,
-                name=exp_data.get("company_name"),
-                domain=exp_data.get("company_domain"),
-                logo_url=exp_data.get("company_logo_url"),
-                industry=exp_data.get("company_industry"),
-            )
-            created_identity = self.identity_service.create(identity_model)
+            identity_model = self.transformer.build_organisation_identity(exp_data)
+            created_identity = self._store(self.identity_service, identity_model)
 
             if not created_identity:
                 self._log_error(
@@ -57,11 +142,17 @@ class OrganisationManager(BaseManager):
                 )
                 return
 
-            org_id = created_identity.organisation_id
+            self._organisation_exists[neuron_id] = True
+            # The key is generated client-side, so it is known without
+            # reading the inserted row back.
+            org_id = identity_model.organisation_id
             self._log_success(f"Created new Organisation with ID: {org_id}")
 
             # 2. Process related organisation data
-            self._process_organisation_details(exp_data, org_id)
+            for service, model in self._writes(
+                self.transformer.build_organisation_details(exp_data, org_id)
+            ):
+                self._store(service, model)
 
             # 3. Process Office data
             if exp_data.get("office_id"):
@@ -73,94 +164,209 @@ class OrganisationManager(BaseManager):
                 exc_info=True,
             )
 
-    def _process_organisation_details(
-        self, company_details: Dict[str, Any], org_id: Any
+    async def process_organisation_data_async(self, exp_data: Dict[str, Any]):
+        """
+        The asyncio counterpart of process_organisation_data.
+
+        Sub-records are written concurrently once the identity exists. If the
+        same organisation is already being written on this loop, the call waits
+        for that write instead of racing it.
+        """
+        neuron_id = exp_data.get("company_id")
+        if not neuron_id:
+            return
+
+        pending = self._pending_organisations.get(neuron_id)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._process_organisation_data_async(exp_data, neuron_id)
+            )
+            self._pending_organisations[neuron_id] = pending
+            pending.add_done_callback(
+                lambda _: self._pending_organisations.pop(neuron_id, None)
+            )
+        await asyncio.shield(pending)
+
+    async def _process_organisation_data_async(
+        self, exp_data: Dict[str, Any], neuron_id: str
     ):
-        if company_details.get("company_web_address"):
-            web_addr = org_models.WebAddress(
-                organisation_id=org_id, **company_details["company_web_address"]
+        try:
+            identity_service = self._async_service(self.identity_service)
+            exists = self._organisation_exists.get(neuron_id)
+            if exists is None:
+                exists = await identity_service.exists(
+                    "neuron360_company_id", neuron_id
+                )
+            if exists:
+                self._organisation_exists[neuron_id] = True
+                self._log_success(
+                    f"Skipping existing Organisation with neuron_id: {neuron_id}"
+                )
+                return
+
+            identity_model = self.transformer.build_organisation_identity(exp_data)
+            created_identity = await self._store_async(
+                self.identity_service, identity_model
             )
-            self.web_address_service.create(web_addr)
+            if not created_identity:
+                self._log_error(
+                    f"Failed to create organisation identity for neuron_id: {neuron_id}."
+                )
+                return
+
+            self._organisation_exists[neuron_id] = True
+            org_id = identity_model.organisation_id
+            self._log_success(f"Created new Organisation with ID: {org_id}")
+
+            writes = [
+                self._store_async(service, model)
+                for service, model in self._writes(
+                    self.transformer.build_organisation_details(exp_data, org_id)
+                )
+            ]
+            if exp_data.get("office_id"):
+                writes.append(self._process_office_async(exp_data, org_id))
+            await asyncio.gather(*writes)
 
-        if company_details.get("company_employees"):
-            emp = org_models.Employee(
-                organisation_id=org_id, **company_details["company_employees"]
+        except Exception as e:
+            self._log_error(
+                f"An error occurred during organisation data processing: {e}",
+                exc_info=True,
             )
-            self.employee_service.create(emp)
-
-        if company_details.get("company_social_links"):
-            social_links_data = {
-                f"{key}_url": value.get("url")
-                for key, value in company_details["company_social_links"].items()
-                if value and "url" in value
-            }
-            sl = org_models.SocialLink(organisation_id=org_id, **social_links_data)
-            self.social_link_service.create(sl)
-
-        if company_details.get("company_industries"):
-            for industry_data in company_details["company_industries"]:
-                ind_data = industry_data.copy()
-                if "id" in ind_data:
-                    ind_data["industry_id"] = ind_data.pop("id")
-                for key, value in ind_data.items():
-                    if key.startswith("code") and value is not None:
-                        ind_data[key] = str(value)
-                ind = org_models.Industry(organisation_id=org_id, **ind_data)
-                self.industry_service.create(ind)
-
-        if company_details.get("company_phones"):
-            for phone_data in company_details["company_phones"]:
-                phone = org_models.Phone(organisation_id=org_id, **phone_data)
-                self.phone_service.create(phone)
 
-    def _process_office(self, office_details: Dict[str, Any], org_id: Any):
-        office_data = {
-            "organisation_id": org_id,
-            "neuron360_office_id": office_details.get("office_id"),
-            "name": office_details.get("office_name"),
-            "type": office_details.get("office_type"),
-            "is_hq": office_details.get("is_hq"),
-            "is_active": office_details.get("is_active"),
-        }
-        office_model = org_models.Office(
-            **{k: v for k, v in office_data.items() if v is not None}
+    def bundle_writes(
+        self, bundle: OrganisationBundle, planned: Set[str]
+    ) -> List[Tuple[BaseService, BaseModel]]:
+        """
+        Pairs the rows of a transformed company with the services storing
+        them, in dependency order, leaving out what already exists.
+
+        `planned` holds the neuron360_company_ids already included in the
+        caller's pending writes and is updated, so a company appearing twice
+        in one batch is only written once. Call record_written once the
+        records are stored.
+        """
+        neuron_id = bundle.neuron360_company_id
+        if neuron_id in planned:
+            return []
+
+        if self.check_existing:
+            exists = self._organisation_exists.get(neuron_id)
+            if exists is None:
+                exists = self.identity_service.exists("neuron360_company_id", neuron_id)
+            if exists:
+                self._organisation_exists[neuron_id] = True
+                return []
+
+        planned.add(neuron_id)
+        writes = self._writes(bundle.rows)
+        if bundle.office is not None:
+            office_id = None
+            if self.check_existing:
+                office_id = self._existing_office_id(bundle.office.neuron360_office_id)
+            if office_id is None:
+                writes.append((self.office_service, bundle.office))
+                office_id = bundle.office.office_id
+            writes.extend(self._writes(bundle.office_rows_for(office_id)))
+        return writes
+
+    def record_written(self, writes: List[Tuple[BaseService, BaseModel]]):
+        """
+        Notes the organisations and offices among stored records as existing.
+        """
+        for _, model in writes:
+            if isinstance(model, org_models.Identity):
+                self._organisation_exists[model.neuron360_company_id] = True
+            elif isinstance(model, org_models.Office):
+                self._office_ids[model.neuron360_office_id] = model.office_id
+
+    def purge_organisations(self, organisation_ids: Iterable[Any]) -> Optional[int]:
+        """
+        Deletes organisations with everything stored under them (web
+        addresses, employees, social links, industries, phones and offices
+        with their details) through the cascading foreign keys of
+        organisation.identities, with one statement per chunk of IDs.
+
+        Returns the number of organisations deleted, or None if the delete
+        failed, in which case some of them may remain.
+        """
+        deleted = self.identity_service.delete_many("organisation_id", organisation_ids)
+        # Cascaded rows and what was known to exist are stale either way
+        clear_read_caches(
+            table_name
+            for table_name in TABLE_WRITE_ORDER
+            if table_name.startswith("organisation.")
         )
+        self._organisation_exists.clear()
+        self._office_ids.clear()
+        if deleted is not None:
+            self._log_success(f"Purged {deleted} organisations.")
+        return deleted
 
-        # Check if office exists before creating
+    def _existing_office_id(self, neuron_office_id: str) -> Optional[Any]:
+        if neuron_office_id in self._office_ids:
+            return self._office_ids[neuron_office_id]
         existing_office = self.office_service.get_by_neuron_id(
-            office_model.neuron360_office_id
+            neuron_office_id, columns=["office_id"]
         )
-        if existing_office:
-            office_id = existing_office.office_id
-        else:
-            created_office = self.office_service.create(office_model)
+        return existing_office["office_id"] if existing_office else None
+
+    def _process_office(self, office_details: Dict[str, Any], org_id: Any):
+        office_model = self.transformer.build_office(office_details, org_id)
+
+        # Check if office exists before creating
+        neuron_office_id = office_model.neuron360_office_id
+        office_id = self._existing_office_id(neuron_office_id)
+
+        if office_id is None:
+            created_office = self._store(self.office_service, office_model)
             if not created_office:
                 self._log_error(
-                    f"Failed to create office for neuron_id: {office_model.neuron360_office_id}"
+                    f"Failed to create office for neuron_id: {neuron_office_id}"
                 )
                 return
-            office_id = created_office.office_id
+            office_id = office_model.office_id
+        self._office_ids[neuron_office_id] = office_id
 
         self._log_success(f"Processed Office with ID: {office_id}")
 
-        if office_details.get("office_address"):
-            addr = org_models.OfficeAddress(
-                office_id=office_id, **office_details["office_address"]
+        for service, model in self._writes(
+            self.transformer.build_office_details(office_details, org_id, office_id)
+        ):
+            self._store(service, model)
+
+    async def _process_office_async(self, office_details: Dict[str, Any], org_id: Any):
+        office_service = self._async_service(self.office_service)
+        office_model = self.transformer.build_office(office_details, org_id)
+
+        neuron_office_id = office_model.neuron360_office_id
+        if neuron_office_id in self._office_ids:
+            office_id = self._office_ids[neuron_office_id]
+        else:
+            existing_office = await office_service.get_by_neuron_id(
+                neuron_office_id, columns=["office_id"]
             )
-            self.office_address_service.create(addr)
-
-        if office_details.get("office_phones"):
-            for phone_data in office_details["office_phones"]:
-                phone = org_models.Phone(organisation_id=org_id, **phone_data)
-                self.phone_service.create(phone)
-
-        if office_details.get("office_industries"):
-            for industry in office_details["office_industries"]:
-                ind_data = industry.copy()
-                if "id" in ind_data:
-                    ind_data["industry_id"] = ind_data.pop("id")
-                for key, value in ind_data.items():
-                    if key.startswith("code") and value is not None:
-                        ind_data[key] = str(value)
-                oi = org_models.OfficeIndustry(office_id=office_id, **ind_data)
-                self.office_industry_service.create(oi)
+            office_id = existing_office["office_id"] if existing_office else None
+
+        if office_id is None:
+            created_office = await self._store_async(self.office_service, office_model)
+            if not created_office:
+                self._log_error(
+                    f"Failed to create office for neuron_id: {neuron_office_id}"
+                )
+                return
+            office_id = office_model.office_id
+        self._office_ids[neuron_office_id] = office_id
+
+        self._log_success(f"Processed Office with ID: {office_id}")
+
+        await asyncio.gather(
+            *[
+                self._store_async(service, model)
+                for service, model in self._writes(
+                    self.transformer.build_office_details(
+                        office_details, org_id, office_id
+                    )
+                )
+            ]
+        )
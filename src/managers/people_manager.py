@@ -1,21 +1,83 @@
 from src.managers.base_manager import BaseManager
 from src.services import people_services
-from src.models import people as people_models
+from src.services.staging_services import StagedRowService
+from src.services.base_service import BaseService, serialize_model
+from src.services.batch_writer import BatchWriter
+from src.services.client_registry import storage_supports_rpc
+from src.services.read_cache import clear_read_caches
+from src.services.schema import TABLE_WRITE_ORDER, write_rank
+from src.services.write_coalescer import WriteCoalescer
+from src.models import staging as staging_models
 from src.managers.organisation_manager import OrganisationManager
-from typing import Dict, Any, Optional
-from datetime import datetime, date
+from src.transformers.profile_transformer import (
+    ProfileBundle,
+    ProfileTransformer,
+    TransformError,
+    transform_records,
+)
+from src.utils.identifiers import stable_id
+from pydantic import BaseModel
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Optional, List, Set, Tuple, Union
+import asyncio
 import json
+import os
+
+# Postgres function writing one person's whole graph in a single transaction,
+# see sql/functions/create_people_schema_ingest_person_function.sql
+INGEST_PERSON_FUNCTION = "ingest_person"
 
 
 class PeopleManager(BaseManager):
     """
     Manages the processing and persistence of people-related data.
     Orchestrates calls to the OrganisationManager when company data is found.
+
+    With `use_rpc`, each person is instead written with a single call to the
+    people.ingest_person database function, which stores the whole graph
+    (including new companies and offices) atomically. With
+    `use_batch_writer`, records of a file are buffered per table and written
+    as multi-row upserts. With a `write_coalescer`, records are batched with
+    those of the other threads sharing the coalescer. With `use_staging`, the
+    records of a file are bulk-loaded into staging.rows without any existence
+    checks, then moved into place by one staging.merge_batch call. With
+    `use_bulk_ingest`, the records of a file are built in memory and written
+    with one multi-row upsert per table, in dependency order, while each
+    person still succeeds or fails on their own; the records are then
+    transformed in `transform_executor`, e.g. a process pool, if one is given.
+
+    Records are turned into rows by a ProfileTransformer, which does no I/O;
+    the manager decides which of the rows to write and writes them.
     """
 
-    def __init__(self, org_manager: OrganisationManager):
+    def __init__(
+        self,
+        org_manager: OrganisationManager,
+        use_rpc: bool = False,
+        use_batch_writer: bool = False,
+        write_coalescer: Optional[WriteCoalescer] = None,
+        use_staging: bool = False,
+        use_bulk_ingest: bool = False,
+        transform_executor: Optional[Executor] = None,
+    ):
+        if (use_rpc or use_staging) and not storage_supports_rpc():
+            raise ValueError(
+                "use_rpc and use_staging call database functions, which the "
+                "storage backend in use does not provide"
+            )
         super().__init__()
         self.org_manager = org_manager
+        self.use_rpc = use_rpc
+        self.use_batch_writer = use_batch_writer
+        self.write_coalescer = org_manager.write_coalescer = write_coalescer
+        self.use_staging = use_staging
+        self.use_bulk_ingest = use_bulk_ingest
+        self.transform_executor = transform_executor
+        self.transformer = ProfileTransformer()
+        # The merge skips existing rows itself, so nothing is looked up first
+        org_manager.check_existing = not use_staging
+        self.staged_row_service = StagedRowService() if use_staging else None
         # Initialize all people services
         self.identity_service = people_services.IdentityService()
         self.profile_service = people_services.ProfileService()
@@ -35,30 +97,18 @@ class PeopleManager(BaseManager):
         self.publication_service = people_services.PublicationService()
         self.patent_service = people_services.PatentService()
         self.award_service = people_services.AwardService()
+        # Known existence of people by neuron360_profile_id, filled by the
+        # per-file bulk prefetch so those records need no individual lookup.
+        self._person_exists: Dict[str, bool] = {}
 
-    def _to_date(self, date_str: str) -> Optional[date]:
-        """
-        Safely converts a date string (in various formats) to a date object.
-        """
-        if not date_str:
-            return None
-        try:
-            return datetime.strptime(str(date_str).split(" ")[0], "%Y-%m-%d").date()
-        except (ValueError, AttributeError):
-            return None
-
-    def process_people_from_file(self, file_path: str) -> tuple[int, int]:
+    def _load_profiles(self, file_path: str) -> Tuple[Optional[List[Dict]], int]:
         """
-        Processes a file containing a list of person records.
-
-        Args:
-            file_path (str): The path to the JSON file.
+        Loads the person records from a file.
 
         Returns:
-            tuple[int, int]: A tuple containing the success count and failure count.
+            tuple: The list of records (None if the file is unusable) and the
+            number of records to count as failed when it is.
         """
-        success_count = 0
-        failure_count = 0
         try:
             with open(file_path, "r") as f:
                 data = json.load(f)
@@ -70,30 +120,440 @@ class PeopleManager(BaseManager):
                 with open(file_path, "r") as f:
                     # A crude way to estimate line count for malformed JSON
                     num_records = len(f.readlines())
-                return 0, num_records
+                return None, num_records
             except Exception:
-                return 0, 0  # Cannot even open the file
+                return None, 0  # Cannot even open the file
 
         profiles = data.get("results", [])
         if not profiles:
             self._log_error(f"No 'results' key found or list is empty in {file_path}.")
-            return 0, 0
+            return None, 0
+        return profiles, 0
+
+    def _profile_ids(self, profiles: List[Dict[str, Any]]) -> List[str]:
+        return [
+            (record.get("profile_data") or {}).get("profile_id")
+            for record in profiles
+            if (record.get("profile_data") or {}).get("profile_id")
+        ]
+
+    def _record_people(
+        self, profile_ids: List[str], identities: Optional[Dict[str, Any]]
+    ):
+        # A failed bulk lookup (None) leaves the IDs to the per-record lookup
+        if identities is not None:
+            for profile_id in profile_ids:
+                self._person_exists[profile_id] = profile_id in identities
+
+    def _new_experiences(self, profiles: List[Dict[str, Any]]) -> List[Dict]:
+        """
+        Returns the experiences of the people not known to exist yet.
+        """
+        experiences = []
+        for record in profiles:
+            profile_id = (record.get("profile_data") or {}).get("profile_id")
+            if self._person_exists.get(profile_id):
+                continue
+            experiences.extend((record.get("resume_data") or {}).get("experiences", []))
+        return experiences
+
+    def _prefetch_existing(self, profiles: List[Dict[str, Any]]):
+        """
+        Resolves which people, companies and offices of a file already exist
+        with a few bulk queries, before any record is processed.
+        """
+        profile_ids = self._profile_ids(profiles)
+        identities = self.identity_service.get_many_by_neuron_ids(
+            profile_ids, columns=["neuron360_profile_id"]
+        )
+        self._record_people(profile_ids, identities)
+        self.org_manager.prefetch_existing(self._new_experiences(profiles))
 
+    async def _prefetch_existing_async(self, profiles: List[Dict[str, Any]]):
+        """
+        The asyncio counterpart of _prefetch_existing.
+        """
+        profile_ids = self._profile_ids(profiles)
+        identities = await self._async_service(
+            self.identity_service
+        ).get_many_by_neuron_ids(profile_ids, columns=["neuron360_profile_id"])
+        self._record_people(profile_ids, identities)
+        await self.org_manager.prefetch_existing_async(self._new_experiences(profiles))
+
+    def process_people_from_file(self, file_path: str) -> tuple[int, int]:
+        """
+        Processes a file containing a list of person records.
+
+        Args:
+            file_path (str): The path to the JSON file.
+
+        Returns:
+            tuple[int, int]: A tuple containing the success count and failure count.
+        """
+        profiles, failed = self._load_profiles(file_path)
+        if profiles is None:
+            return 0, failed
+        return self.process_people(profiles, file_path)
+
+    def process_people(
+        self, profiles: List[Dict[str, Any]], source: str
+    ) -> tuple[int, int]:
+        """
+        Processes a list of person records read from `source`, which names
+        them in logs and keys their staging batch.
+
+        Returns:
+            tuple[int, int]: A tuple containing the success count and failure count.
+        """
+        if self.use_staging:
+            return self._process_people_staged(source, profiles)
+
+        self._prefetch_existing(profiles)
+        if self.use_bulk_ingest:
+            return self._process_people_bulk(source, profiles)
+
+        success_count = 0
+        failure_count = 0
+        pending_by_person = []
+        with self._write_behind() as writer:
+            for person_record in profiles:
+                # Collect the person's coalesced writes that are still in flight
+                pending = self.pending_writes = self.org_manager.pending_writes = []
+                try:
+                    self.process_person_data(person_record)
+                    pending_by_person.append(pending)
+                except Exception as e:
+                    self._log_error(
+                        f"Failed to process person record: {e}", exc_info=True
+                    )
+                    failure_count += 1
+
+        for pending in pending_by_person:
+            if all(future.result() for future in pending):
+                success_count += 1
+            else:
+                self._log_error("Some records of a person could not be written.")
+                failure_count += 1
+
+        if writer is not None and writer.failed_rows:
+            # The failed rows cannot be traced back to their profiles, so the
+            # whole file is failed; writes are idempotent, so it can be retried.
+            self._log_error(
+                f"{writer.failed_rows} buffered rows of {source} were not written."
+            )
+            return 0, len(profiles)
+
+        return success_count, failure_count
+
+    def _process_people_staged(
+        self, file_path: str, profiles: List[Dict[str, Any]]
+    ) -> tuple[int, int]:
+        """
+        Stages every record of a file and merges them in one batch.
+
+        The batch is keyed by the file, so staging it again after a failure
+        overwrites the earlier attempt's rows instead of adding to them. As
+        the merge is atomic, a failed batch fails all of its people.
+        """
+        batch_id = stable_id(
+            self.staged_row_service.table_name, os.path.abspath(file_path)
+        )
+        staged: List[staging_models.StagedRow] = []
+        planned_organisations: Set[str] = set()
+        success_count = 0
+        failure_count = 0
         for person_record in profiles:
             try:
-                self.process_person_data(person_record)
+                profile_data = person_record.get("profile_data", {})
+                if not profile_data:
+                    self._log_error("No 'profile_data' found, skipping record.")
+                    continue
+                writes = self.build_person_writes(
+                    profile_data,
+                    person_record.get("resume_data", {}) or {},
+                    planned_organisations,
+                )
+                for service, model in writes:
+                    staged.append(
+                        staging_models.StagedRow(
+                            id=stable_id(batch_id, len(staged)),
+                            batch_id=batch_id,
+                            table_name=service.table_name,
+                            row_data=serialize_model(model),
+                        )
+                    )
                 success_count += 1
             except Exception as e:
-                self._log_error(f"Failed to process person record: {e}", exc_info=True)
+                self._log_error(f"Failed to stage person record: {e}", exc_info=True)
                 failure_count += 1
 
+        if not staged:
+            return success_count, failure_count
+
+        results = self.staged_row_service.upsert_many(staged, return_minimal=True)
+        if any(result is None for result in results):
+            self._log_error(f"Could not stage the records of {file_path}.")
+            return 0, len(profiles)
+
+        merged = self.staged_row_service.merge_batch(batch_id)
+        if merged is None:
+            self._log_error(f"Could not merge the staged records of {file_path}.")
+            return 0, len(profiles)
+
+        self._log_success(
+            f"Merged {sum(merged.values())}/{len(staged)} staged rows of {file_path}"
+        )
         return success_count, failure_count
 
+    def _process_people_bulk(
+        self, source: str, profiles: List[Dict[str, Any]]
+    ) -> tuple[int, int]:
+        """
+        Transforms the records of the new people of a file into rows and
+        writes them with one multi-row upsert per table, parent tables first.
+
+        Each row is owned by the person whose record it was built from; the
+        companies and offices a person introduces are theirs too. A person
+        fails if any of their rows cannot be written, and their rows in later
+        tables are then left out, so they never reference a missing parent
+        nor take down the chunks of others. Rows of a failed chunk are
+        written again person by person, so only the people whose rows are
+        rejected are failed. Writes are idempotent, so failed people can
+        simply be processed again.
+        """
+        writes_by_person: List[List[Tuple[BaseService, BaseModel]]] = []
+        planned_organisations: Set[str] = set()
+        seen: Set[str] = set()
+        failure_count = 0
+        records = []
+        for person_record in profiles:
+            profile_data = person_record.get("profile_data", {})
+            if not profile_data:
+                self._log_error("No 'profile_data' found, skipping record.")
+                continue
+            neuron_id = profile_data.get("profile_id")
+            if neuron_id and (neuron_id in seen or self._is_existing_person(neuron_id)):
+                self.logger.info(
+                    f"Skipping existing Person with neuron_id: {neuron_id}"
+                )
+                continue
+            if neuron_id:
+                seen.add(neuron_id)
+            records.append(person_record)
+
+        for bundle in self._transform(records):
+            if isinstance(bundle, TransformError):
+                self._log_error(f"Failed to transform person record: {bundle}")
+                failure_count += 1
+                continue
+            try:
+                writes = self.bundle_writes(bundle, planned_organisations)
+            except Exception as e:
+                self._log_error(f"Failed to build person record: {e}", exc_info=True)
+                failure_count += 1
+                continue
+            writes_by_person.append(writes)
+
+        # Rows of each table, with the index of the person owning them
+        tables: Dict[str, List[Tuple[int, BaseService, BaseModel]]] = {}
+        for person, writes in enumerate(writes_by_person):
+            for service, model in writes:
+                tables.setdefault(service.table_name, []).append(
+                    (person, service, model)
+                )
+
+        failed: Set[int] = set()
+        for table_name in sorted(tables, key=write_rank):
+            rows = [row for row in tables[table_name] if row[0] not in failed]
+            if rows:
+                failed.update(self._write_bulk(rows))
+
+        for person, writes in enumerate(writes_by_person):
+            if person in failed:
+                continue
+            neuron_id = writes[0][1].neuron360_profile_id
+            if neuron_id:
+                self._person_exists[neuron_id] = True
+            self.org_manager.record_written(writes)
+
+        if failed:
+            self._log_error(f"{len(failed)} people of {source} could not be written.")
+        written = len(writes_by_person) - len(failed)
+        self._log_success(f"Wrote {written} new people of {source} in bulk")
+        return len(profiles) - failure_count - len(failed), failure_count + len(failed)
+
+    def _transform(
+        self, records: List[Dict[str, Any]]
+    ) -> List[Union[ProfileBundle, TransformError, None]]:
+        """
+        Transforms records into bundles, in the transform executor if set.
+        """
+        if self.transform_executor is None:
+            return transform_records(records)
+        return self.transform_executor.submit(transform_records, records).result()
+
+    def _write_bulk(self, rows: List[Tuple[int, BaseService, BaseModel]]) -> Set[int]:
+        """
+        Upserts the rows of one table, owned by the given people, and
+        returns the people whose rows could not be written.
+        """
+        service = rows[0][1]
+        results = service.upsert_many(
+            [model for _, _, model in rows],
+            ignore_duplicates=True,
+            return_minimal=True,
+        )
+        retry: Dict[int, List[BaseModel]] = {}
+        for (person, _, model), result in zip(rows, results):
+            if result is None:
+                retry.setdefault(person, []).append(model)
+
+        failed = set()
+        for person, models in retry.items():
+            results = service.upsert_many(
+                models, ignore_duplicates=True, return_minimal=True
+            )
+            if any(result is None for result in results):
+                failed.add(person)
+        return failed
+
+    @contextmanager
+    def _write_behind(self):
+        """
+        Attaches a BatchWriter to this manager and its OrganisationManager
+        for the duration of the block, flushing it on exit. Yields None when
+        batch writing is disabled.
+        """
+        if not self.use_batch_writer:
+            yield None
+            return
+
+        writer = BatchWriter()
+        self.batch_writer = self.org_manager.batch_writer = writer
+        try:
+            with writer:
+                yield writer
+        finally:
+            self.batch_writer = self.org_manager.batch_writer = None
+
+    def purge_people(self, people_ids: Iterable[Any]) -> Optional[int]:
+        """
+        Deletes people with everything stored under them, in a few set-based
+        statements: one per chunk of IDs on people.profiles, whose cascading
+        foreign keys remove the genders, social links, statuses, emails,
+        phones and addresses, and one on people.identities, whose cascades
+        remove the experiences (with their details) and resume items.
+        Organisations are shared between people and are kept.
+
+        Returns the number of people deleted, or None if a delete failed, in
+        which case some of their rows may remain.
+        """
+        people_ids = list(dict.fromkeys(people_ids))
+        # Profiles do not reference identities, so they are deleted on their own
+        profiles = self.profile_service.delete_many("people_id", people_ids)
+        identities = self.identity_service.delete_many("people_id", people_ids)
+        # Cascaded rows and what was known to exist are stale either way
+        clear_read_caches(
+            table_name
+            for table_name in TABLE_WRITE_ORDER
+            if table_name.startswith("people.")
+        )
+        self._person_exists.clear()
+        if profiles is None or identities is None:
+            return None
+        self._log_success(f"Purged {identities} people.")
+        return identities
+
+    def purge_profiles(self, profile_ids: Iterable[str]) -> Optional[int]:
+        """
+        Deletes the people with the given neuron360 profile IDs, as
+        purge_people. Returns None if they could not be looked up or deleted.
+        """
+        identities = self.identity_service.get_many_by_neuron_ids(
+            profile_ids, columns=["people_id"]
+        )
+        if identities is None:
+            return None
+        return self.purge_people(
+            identity["people_id"] for identity in identities.values()
+        )
+
+    def reingest_profiles(
+        self, profile_ids: Iterable[str], file_paths: List[str]
+    ) -> tuple[int, int]:
+        """
+        Replaces the stored data of the given neuron360 profiles with their
+        records in `file_paths`: the people are purged with everything under
+        them, then processed again from scratch. Where a profile appears in
+        several files, its last record is used. Profiles found in no file are
+        left untouched.
+
+        Returns:
+            tuple[int, int]: A tuple containing the success count and failure count.
+        """
+        wanted = set(profile_ids)
+        records: Dict[str, Dict[str, Any]] = {}
+        for file_path in file_paths:
+            profiles, _ = self._load_profiles(file_path)
+            for record in profiles or []:
+                profile_id = (record.get("profile_data") or {}).get("profile_id")
+                if profile_id in wanted:
+                    records[profile_id] = record
+
+        missing = wanted - records.keys()
+        if missing:
+            self._log_error(
+                f"{len(missing)} profiles to reingest were found in no file: "
+                f"{', '.join(sorted(missing))}"
+            )
+        if not records:
+            return 0, len(missing)
+
+        if self.purge_profiles(records) is None:
+            self._log_error("Could not purge the profiles to reingest.")
+            return 0, len(wanted)
+
+        success_count, failure_count = self.process_people(
+            list(records.values()), "reingest"
+        )
+        return success_count, failure_count + len(missing)
+
+    async def process_people_from_file_async(self, file_path: str) -> tuple[int, int]:
+        """
+        The asyncio counterpart of process_people_from_file.
+
+        All records of the file are processed concurrently; the number of
+        requests actually in flight is bounded by the async client registry.
+        """
+        profiles, failed = self._load_profiles(file_path)
+        if profiles is None:
+            return 0, failed
+
+        await self._prefetch_existing_async(profiles)
+
+        results = await asyncio.gather(
+            *[self.process_person_data_async(record) for record in profiles],
+            return_exceptions=True,
+        )
+        failure_count = 0
+        for result in results:
+            if isinstance(result, Exception):
+                self._log_error(f"Failed to process person record: {result}")
+                failure_count += 1
+
+        return len(profiles) - failure_count, failure_count
+
     def process_person_data(self, person_record: Dict[str, Any]):
         """
         Processes and persists a single person's data from the API response.
         This is the main entry point for processing a person.
         """
+        if self.use_rpc:
+            # Failures propagate so that the file records them; as the write
+            # is atomic, the person can simply be processed again.
+            self._process_person_rpc(person_record)
+            return
+
         try:
             profile_data = person_record.get("profile_data", {})
             resume_data = person_record.get("resume_data", {})
@@ -104,36 +564,28 @@ class PeopleManager(BaseManager):
 
             # Check for existing person by neuron360_profile_id
             neuron_id = profile_data.get("profile_id")
-            if neuron_id:
-                existing_identity = self.identity_service.get_by_neuron_id(neuron_id)
-                if existing_identity:
-                    self.logger.info(
-                        f"Skipping existing Person with neuron_id: {neuron_id}"
-                    )
-                    return
+            if neuron_id and self._is_existing_person(neuron_id):
+                self.logger.info(
+                    f"Skipping existing Person with neuron_id: {neuron_id}"
+                )
+                return
 
             self.logger.info(
                 f"Processing person: {profile_data.get('profile_full_name')}"
             )
 
             # 1. Create Identity
-            identity_model = people_models.Identity(
-                neuron360_profile_id=profile_data.get("profile_id"),
-                first_name=profile_data.get("profile_first_name"),
-                last_name=profile_data.get("profile_last_name"),
-                full_name=profile_data.get("profile_full_name"),
-                picture_url=profile_data.get("profile_picture", {}).get("url"),
-                last_modified_date=profile_data.get("profile_last_modified_date"),
-                last_seen_date=profile_data.get("profile_last_seen_date"),
-            )
-            created_identity = self.identity_service.create(identity_model)
+            identity_model = self.transformer.build_identity(profile_data)
+            created_identity = self._store(self.identity_service, identity_model)
             if not created_identity:
                 self._log_error(
                     "Failed to create identity, aborting processing for this person."
                 )
                 return
 
-            people_id = created_identity.people_id
+            # The key is generated client-side, so it is known without
+            # reading the inserted row back.
+            people_id = identity_model.people_id
             self._log_success(f"Created Identity with people_id: {people_id}")
 
             # 2. Create Profile and related sub-tables
@@ -152,19 +604,143 @@ class PeopleManager(BaseManager):
                 f"An error occurred during person data processing: {e}", exc_info=True
             )
 
+    def _is_existing_person(self, neuron_id: str) -> bool:
+        exists = self._person_exists.get(neuron_id)
+        if exists is None:
+            exists = self.identity_service.exists("neuron360_profile_id", neuron_id)
+        return bool(exists)
+
+    def _process_person_rpc(self, person_record: Dict[str, Any]):
+        profile_data = person_record.get("profile_data", {})
+        resume_data = person_record.get("resume_data", {}) or {}
+
+        if not profile_data:
+            self._log_error("No 'profile_data' found, skipping record.")
+            return
+
+        neuron_id = profile_data.get("profile_id")
+        if neuron_id and self._is_existing_person(neuron_id):
+            self.logger.info(f"Skipping existing Person with neuron_id: {neuron_id}")
+            return
+
+        writes = self.build_person_writes(profile_data, resume_data, set())
+        people_id = writes[0][1].people_id
+        payload = {
+            "people_id": str(people_id),
+            "writes": [
+                {"table": table_name, "rows": rows}
+                for table_name, rows in self._rows_by_table(writes).items()
+            ],
+        }
+        if (
+            self.identity_service.rpc(INGEST_PERSON_FUNCTION, {"payload": payload})
+            is None
+        ):
+            raise Exception(f"Ingest failed for people_id: {people_id}")
+
+        if neuron_id:
+            self._person_exists[neuron_id] = True
+        self.org_manager.record_written(writes)
+        self._log_success(f"Successfully processed all data for people_id: {people_id}")
+
+    def build_person_writes(
+        self,
+        profile_data: Dict[str, Any],
+        resume_data: Dict[str, Any],
+        planned_organisations: Set[str],
+    ) -> List[Tuple[BaseService, BaseModel]]:
+        """
+        Builds, without writing anything, every record of a new person,
+        starting with the identity, with each parent before its children.
+
+        The companies and offices of the person's experiences are included
+        unless they already exist or are in `planned_organisations`.
+        """
+        return self.bundle_writes(
+            self.transformer.transform_profile(profile_data, resume_data),
+            planned_organisations,
+        )
+
+    def bundle_writes(
+        self, bundle: ProfileBundle, planned_organisations: Set[str]
+    ) -> List[Tuple[BaseService, BaseModel]]:
+        """
+        Pairs the rows of a transformed person with the services storing
+        them, as build_person_writes. Tables follow TABLE_WRITE_ORDER, so the
+        companies come before the experiences naming them.
+        """
+        writes = self._writes(bundle.rows)
+        for organisation in bundle.organisations:
+            writes.extend(
+                self.org_manager.bundle_writes(organisation, planned_organisations)
+            )
+        writes.sort(key=lambda write: write_rank(write[0].table_name))
+        return writes
+
+    async def process_person_data_async(self, person_record: Dict[str, Any]):
+        """
+        The asyncio counterpart of process_person_data.
+
+        Parent rows are still written before their children, but independent
+        writes (profile sub-records, experiences, resume items) run concurrently.
+        Failures propagate, so that the file counts the person as failed.
+        """
+        profile_data = person_record.get("profile_data", {})
+        resume_data = person_record.get("resume_data", {})
+
+        if not profile_data:
+            self._log_error("No 'profile_data' found, skipping record.")
+            return
+
+        identity_service = self._async_service(self.identity_service)
+        neuron_id = profile_data.get("profile_id")
+        if neuron_id:
+            exists = self._person_exists.get(neuron_id)
+            if exists is None:
+                exists = await identity_service.exists(
+                    "neuron360_profile_id", neuron_id
+                )
+            if exists:
+                self.logger.info(
+                    f"Skipping existing Person with neuron_id: {neuron_id}"
+                )
+                return
+
+        self.logger.info(f"Processing person: {profile_data.get('profile_full_name')}")
+
+        identity_model = self.transformer.build_identity(profile_data)
+        created_identity = await self._store_async(
+            self.identity_service, identity_model
+        )
+        if not created_identity:
+            raise Exception(
+                f"Identity creation failed for neuron_id: {neuron_id}, "
+                "aborting processing for this person."
+            )
+
+        people_id = identity_model.people_id
+        self._log_success(f"Created Identity with people_id: {people_id}")
+
+        writes = [self._process_profile_details_async(profile_data, people_id)]
+        if resume_data:
+            writes.extend(
+                self._process_experience_async(exp_data, people_id, position)
+                for position, exp_data in enumerate(resume_data.get("experiences", []))
+            )
+            writes.extend(
+                self._store_async(service, model)
+                for service, model in self._writes(
+                    self.transformer.build_resume_items(resume_data, people_id)
+                )
+            )
+        await asyncio.gather(*writes)
+
+        self._log_success(f"Successfully processed all data for people_id: {people_id}")
+
     def _process_profile_details(self, data: Dict[str, Any], people_id: Any):
         # Create main profile
-        profile_details = {
-            "summary": data.get("profile_summary"),
-            "languages": data.get("profile_languages"),
-            "expertises": data.get("profile_expertises"),
-            "tags": data.get("profile_tags"),
-            "prior_industries": data.get("profile_prior_industries"),
-            "raw_location": data.get("raw_location"),
-            "headline": data.get("profile_headline"),
-        }
-        profile = people_models.Profile(people_id=people_id, **profile_details)
-        created_profile = self.profile_service.create(profile)
+        profile = self.transformer.build_profile(data, people_id)
+        created_profile = self._store(self.profile_service, profile)
 
         # CRITICAL: Check if profile was created before proceeding
         if not created_profile:
@@ -177,44 +753,31 @@ class PeopleManager(BaseManager):
             raise Exception(f"Profile creation failed for people_id: {people_id}")
 
         # Other direct profile relations
-        if data.get("profile_gender"):
-            gender_data = data.get("profile_gender")
-            gender = people_models.Gender(
-                people_id=people_id,
-                gender=gender_data.get("gender"),
-                confidence_score=gender_data.get("confidence_score"),
-            )
-            self.gender_service.create(gender)
-
-        if data.get("profile_social_links"):
-            for link in data["profile_social_links"]:
-                s_link = people_models.SocialLink(people_id=people_id, **link)
-                self.social_link_service.create(s_link)
-
-        if data.get("profile_status"):
-            status_data = data.get("profile_status")
-            status = people_models.Status(
-                people_id=people_id, status=status_data.get("status")
-            )
-            self.status_service.create(status)
-
-        if data.get("profile_emails"):
-            for email_data in data["profile_emails"]:
-                em = people_models.Email(people_id=people_id, **email_data)
-                self.email_service.create(em)
-
-        if data.get("profile_phones"):
-            for phone_data in data["profile_phones"]:
-                ph = people_models.Phone(people_id=people_id, **phone_data)
-                self.phone_service.create(ph)
+        for service, model in self._writes(
+            self.transformer.build_profile_children(data, people_id)
+        ):
+            self._store(service, model)
+
+    async def _process_profile_details_async(
+        self, data: Dict[str, Any], people_id: Any
+    ):
+        profile = self.transformer.build_profile(data, people_id)
+        created_profile = await self._store_async(self.profile_service, profile)
+        if not created_profile:
+            raise Exception(f"Profile creation failed for people_id: {people_id}")
 
-        if data.get("profile_address"):
-            address = people_models.Address(
-                people_id=people_id, **data["profile_address"]
-            )
-            self.address_service.create(address)
+        await asyncio.gather(
+            *[
+                self._store_async(service, model)
+                for service, model in self._writes(
+                    self.transformer.build_profile_children(data, people_id)
+                )
+            ]
+        )
 
-    def _process_experience(self, exp_data: Dict[str, Any], people_id: Any):
+    def _process_experience(
+        self, exp_data: Dict[str, Any], people_id: Any, position: int
+    ):
         """
         Processes a single experience record, its related details,
         and triggers the organisation manager to process the associated company.
@@ -224,198 +787,48 @@ class PeopleManager(BaseManager):
         self.org_manager.process_organisation_data(exp_data)
 
         # 2. Create the Experience record
-        exp_model = people_models.Experience(
-            people_id=people_id,
-            job_title=exp_data.get("job_title"),
-            start_date=self._to_date(exp_data.get("start_date")),
-            end_date=self._to_date(exp_data.get("end_date")),
-            summary=exp_data.get("summary"),
-            current=exp_data.get("current"),
-            priority=exp_data.get("priority"),
-            raw_location=exp_data.get("raw_location"),
-        )
-        created_exp = self.experience_service.create(exp_model)
+        exp_model = self.transformer.build_experience(exp_data, people_id, position)
+        created_exp = self._store(self.experience_service, exp_model)
 
-        if created_exp and created_exp.id:
-            exp_id = created_exp.id
+        if created_exp:
+            exp_id = exp_model.id
 
             # 3. Process nested details for the experience
-            job_title_details_data = exp_data.get("job_title_details")
-            if job_title_details_data:
-                raw_title_data = job_title_details_data.get("raw_job_title", {})
-                translated_title_data = job_title_details_data.get(
-                    "raw_translated_job_title", {}
-                )
-                normalized_title_data = job_title_details_data.get(
-                    "normalized_job_title", {}
-                )
-
-                processed_jtd = {
-                    "raw_job_title": raw_title_data.get("job_title"),
-                    "raw_job_title_language_code": raw_title_data.get("language_code"),
-                    "raw_job_title_language_detection_confidence_score": raw_title_data.get(
-                        "language_detection_confidence_score"
-                    ),
-                    "raw_translated_job_title": translated_title_data.get("job_title"),
-                    "raw_translated_job_title_language_code": translated_title_data.get(
-                        "language_code"
-                    ),
-                    "normalized_job_title_id": normalized_title_data.get("id"),
-                    "normalized_job_title": normalized_title_data.get("job_title"),
-                }
-                processed_jtd = {
-                    k: v for k, v in processed_jtd.items() if v is not None
-                }
-                if processed_jtd:
-                    jtd = people_models.JobTitleDetail(
-                        experience_id=exp_id, **processed_jtd
+            for service, model in self._writes(
+                self.transformer.build_experience_children(exp_data, exp_id)
+            ):
+                self._store(service, model)
+
+    async def _process_experience_async(
+        self, exp_data: Dict[str, Any], people_id: Any, position: int
+    ):
+        await self.org_manager.process_organisation_data_async(exp_data)
+
+        exp_model = self.transformer.build_experience(exp_data, people_id, position)
+        created_exp = await self._store_async(self.experience_service, exp_model)
+        if created_exp:
+            await asyncio.gather(
+                *[
+                    self._store_async(service, model)
+                    for service, model in self._writes(
+                        self.transformer.build_experience_children(
+                            exp_data, exp_model.id
+                        )
                     )
-                    self.job_title_detail_service.create(jtd)
-
-            job_functions_data = exp_data.get("job_functions", [])
-            for jf_data in job_functions_data:
-                level1_data = jf_data.get("level1", {}) or {}
-                level2_data = jf_data.get("level2", {}) or {}
-                level3_data = jf_data.get("level3", {}) or {}
-
-                job_function_payload = {
-                    "experience_id": exp_id,
-                    "priority": jf_data.get("priority"),
-                    "level1_code": level1_data.get("code"),
-                    "level1_name": level1_data.get("name"),
-                    "level1_confidence_score": level1_data.get("confidence_score"),
-                    "level2_code": level2_data.get("code"),
-                    "level2_name": level2_data.get("name"),
-                    "level2_confidence_score": level2_data.get("confidence_score"),
-                    "level3_code": level3_data.get("code"),
-                    "level3_name": level3_data.get("name"),
-                    "level3_confidence_score": level3_data.get("confidence_score"),
-                }
-                jf = people_models.JobFunction(**job_function_payload)
-                self.job_function_service.create(jf)
-
-            job_seniority_data = exp_data.get("job_seniority")
-            if job_seniority_data:
-                js = people_models.JobSeniority(
-                    experience_id=exp_id, **job_seniority_data
-                )
-                self.job_seniority_service.create(js)
+                ]
+            )
 
     def _process_resume_items(self, resume_data: Dict[str, Any], people_id: Any):
         """
         Processes all lists of items within the resume_data object.
         """
         # Process Experiences
-        for exp_data in resume_data.get("experiences", []):
-            self._process_experience(exp_data, people_id)
-
-        # Process Educations
-        if "educations" in resume_data:
-            for edu_data in resume_data.get("educations", []):
-                web_address_data = edu_data.pop(
-                    "educational_establishment_web_address", {}
-                )
-                edu_model = people_models.Education(
-                    people_id=people_id,
-                    educational_establishment=edu_data.get("educational_establishment"),
-                    diploma=edu_data.get("diploma"),
-                    specialization=edu_data.get("specialization"),
-                    start_date=self._to_date(edu_data.get("start_date")),
-                    end_date=self._to_date(edu_data.get("end_date")),
-                    priority=edu_data.get("priority"),
-                    web_address_url=web_address_data.get("url"),
-                    web_address_rank=web_address_data.get("rank"),
-                )
-                self.education_service.create(edu_model)
-
-        # Process Certifications
-        if "certifications" in resume_data:
-            certifications_data = resume_data.get("certifications", [])
-            for cert_data in certifications_data:
-                web_address_data = cert_data.pop("web_address", {})
-                cert_payload = {
-                    "people_id": people_id,
-                    "name": cert_data.get("name"),
-                    "url": cert_data.get("url"),
-                    "start_date": cert_data.get("start_date"),
-                    "end_date": cert_data.get("end_date"),
-                    "authority": cert_data.get("authority"),
-                    "raw_name": cert_data.get("raw_name"),
-                    "web_address_url": web_address_data.get("url"),
-                    "web_address_rank": web_address_data.get("rank"),
-                }
-                cert = people_models.Certification(**cert_payload)
-                self.certification_service.create(cert)
-
-        # Process Memberships
-        if "memberships" in resume_data:
-            memberships_data = resume_data.get("memberships", [])
-            for mem_data in memberships_data:
-                web_address_data = mem_data.pop("web_address", {})
-                mem_model = people_models.Membership(
-                    people_id=people_id,
-                    title=mem_data.get("title"),
-                    description=mem_data.get("description"),
-                    reference=mem_data.get("reference"),
-                    name=mem_data.get("name"),
-                    start_date=mem_data.get("start_date"),
-                    end_date=mem_data.get("end_date"),
-                    location=mem_data.get("location"),
-                    priority=mem_data.get("priority"),
-                    web_address_url=web_address_data.get("url"),
-                    web_address_rank=web_address_data.get("rank"),
-                )
-                self.membership_service.create(mem_model)
-
-        # Process Publications
-        if "publications" in resume_data:
-            publications_data = resume_data.get("publications", [])
-            for pub_data in publications_data:
-                web_address_data = pub_data.pop("web_address", {})
-                pub_payload = {
-                    "people_id": people_id,
-                    "name": pub_data.get("name"),
-                    "date": pub_data.get("date"),
-                    "description": pub_data.get("description"),
-                    "publisher": pub_data.get("publisher"),
-                    "url": pub_data.get("url"),
-                    "web_address_url": web_address_data.get("url"),
-                    "web_address_rank": web_address_data.get("rank"),
-                }
-                pub = people_models.Publication(**pub_payload)
-                self.publication_service.create(pub)
-
-        # Process Patents
-        if "patents" in resume_data:
-            for pat_data in resume_data.get("patents", []):
-                web_address_data = pat_data.pop("web_address", {})
-                pat_model = people_models.Patent(
-                    people_id=people_id,
-                    name=pat_data.get("name"),
-                    issue=pat_data.get("issue"),
-                    number=pat_data.get("number"),
-                    start_date=self._to_date(pat_data.get("start_date")),
-                    end_date=self._to_date(pat_data.get("end_date")),
-                    priority=pat_data.get("priority"),
-                    web_address_url=web_address_data.get("url"),
-                    web_address_rank=web_address_data.get("rank"),
-                )
-                self.patent_service.create(pat_model)
-
-        # Process Awards
-        if "awards" in resume_data:
-            awards_data = resume_data.get("awards", [])
-            for award_data in awards_data:
-                award_payload = {
-                    "people_id": people_id,
-                    "name": award_data.get("name"),
-                    "description": award_data.get("description"),
-                    "issue": award_data.get("issue"),
-                    "date": award_data.get("date"),
-                    "priority": award_data.get("priority"),
-                }
-                self.logger.debug(
-                    f"Attempting to create Award with payload: {award_payload}"
-                )
-                award_model = people_models.Award(**award_payload)
-                self.award_service.create(award_model)
+        for position, exp_data in enumerate(resume_data.get("experiences", [])):
+            self._process_experience(exp_data, people_id, position)
+
+        # Process Educations, Certifications, Memberships, Publications,
+        # Patents and Awards
+        for service, model in self._writes(
+            self.transformer.build_resume_items(resume_data, people_id)
+        ):
+            self._store(service, model)
@@ -1,3 +1,4 @@
 from .base_model import CustomBaseModel
 from .people import *
 from .organisation import *
+from .staging import *
@@ -0,0 +1 @@
+from .staging import StagedRow
@@ -0,0 +1,14 @@
+import uuid
+from typing import Any, Dict
+from pydantic import Field
+from src.models.base_model import CustomBaseModel
+
+# STAGING SCHEMA
+
+
+# rows table
+class StagedRow(CustomBaseModel):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    batch_id: uuid.UUID
+    table_name: str
+    row_data: Dict[str, Any]
@@ -1,3 +1,5 @@
 from .people_services import *
 from .organisation_services import *
+from .staging_services import *
 from .base_service import BaseService
+from .async_base_service import AsyncBaseService
@@ -0,0 +1,449 @@
+from src.services.client_registry import (
+    async_client_registry,
+    get_async_supabase_client,
+)
+from src.services.service_core import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_LOOKUP_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    ServiceCore,
+    T,
+    has_keys,
+    row_count,
+    serialize_model,
+    serialize_records,
+)
+from src.services.read_cache import MISSING
+from src.services.service_metrics import track
+from src.utils.logging import logger
+from postgrest.types import ReturnMethod
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+import uuid
+
+
+class AsyncBaseService(ServiceCore[T]):
+    """
+    The asyncio counterpart of BaseService, with the same methods and results.
+
+    Requests go through the shared async client for the service's schema, and
+    every request holds a slot of the registry's in-flight semaphore, so a
+    single event loop can drive many concurrent writes without overwhelming
+    the database. Writes always go through PostgREST.
+    """
+
+    def _table(self):
+        # The client is looked up per call because it is bound to the running loop
+        return get_async_supabase_client(self.schema).table(self.table_name_only)
+
+    async def _execute(self, request, operation: str, rows: Optional[int] = None):
+        """
+        Sends a request, recording it under `operation`. See BaseService._execute.
+        """
+        async with async_client_registry.get_semaphore():
+            with track(self.table_name, operation, rows or 0) as call:
+                response = await request.execute()
+                if rows is None:
+                    call.rows = len(response.data or [])
+        return response
+
+    async def _insert(
+        self,
+        records: Union[Dict[str, Any], List[Dict[str, Any]]],
+        returning: ReturnMethod,
+        default_to_null: bool = True,
+    ):
+        """
+        Sends an insert, retrying transient failures. See BaseService._insert.
+        """
+
+        async def send(attempt: int):
+            operation, request = self._insert_request(
+                records, returning, default_to_null, attempt
+            )
+            return await self._execute(request, operation, row_count(records))
+
+        return await self.retrier.run_async(
+            send, idempotent=has_keys(records, self.primary_key)
+        )
+
+    async def _upsert(
+        self,
+        records: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: str,
+        returning: ReturnMethod,
+        ignore_duplicates: bool,
+        default_to_null: bool = True,
+    ):
+        """
+        Sends an upsert, retrying transient failures. See BaseService._upsert.
+        """
+
+        async def send(attempt: int):
+            request = self._upsert_request(
+                records, on_conflict, returning, ignore_duplicates, default_to_null
+            )
+            return await self._execute(request, "upsert", row_count(records))
+
+        return await self.retrier.run_async(
+            send, idempotent=has_keys(records, on_conflict)
+        )
+
+    async def create(self, data: T, return_minimal: bool = False) -> Optional[T]:
+        """
+        Creates a new record in the table. See BaseService.create.
+        """
+        try:
+            record_dict = serialize_model(data)
+            response = await self._insert(record_dict, self._returning(return_minimal))
+            self._invalidate([record_dict])
+            return self._written_one(data, response, return_minimal, "created")
+        except Exception as e:
+            logger.error(f"Error creating record in {self.table_name}: {e}")
+            return None
+
+    async def create_many(
+        self,
+        data: List[T],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        return_minimal: bool = False,
+    ) -> List[Optional[T]]:
+        """
+        Creates many records in chunks. See BaseService.create_many.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        results: List[Optional[T]] = [None] * len(data)
+        returning = self._returning(return_minimal)
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            end = start + len(chunk)
+            try:
+                records = serialize_records(chunk)
+                response = await self._insert(records, returning, default_to_null=False)
+                self._invalidate(records)
+                created = self._created_chunk(chunk, response, return_minimal, start)
+                if created is not None:
+                    results[start:end] = created
+            except Exception as e:
+                logger.error(
+                    f"Error creating rows {start}-{end - 1} in {self.table_name}: {e}"
+                )
+
+        created = sum(1 for record in results if record is not None)
+        logger.info(f"Created {created}/{len(data)} records in {self.table_name}")
+        return results
+
+    async def _select_one(
+        self, column: str, value: Any, columns: Optional[List[str]], unique: bool
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        record = self._cached_one(column, value, columns)
+        if record is not MISSING:
+            return record
+        generation = self._generation()
+        response = await self._execute(
+            self._select_request(column, value, columns, unique), "select"
+        )
+        return self._found_one(column, value, columns, response, generation)
+
+    async def get_by_id(
+        self, record_id: Any, columns: Optional[List[str]] = None
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        """
+        Retrieves a record by its primary key. See BaseService.get_by_id.
+        """
+        try:
+            return await self._select_one("id", record_id, columns, unique=True)
+        except Exception as e:
+            logger.error(
+                f"Error fetching record {record_id} from {self.table_name}: {e}"
+            )
+            return None
+
+    async def get_by_uuid(
+        self, record_uuid: uuid.UUID, columns: Optional[List[str]] = None
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        """
+        Retrieves a record by its UUID.
+        """
+        try:
+            return await self._select_one(
+                "uuid", str(record_uuid), columns, unique=True
+            )
+        except Exception as e:
+            logger.error(
+                f"Error fetching record {record_uuid} from {self.table_name}: {e}"
+            )
+            return None
+
+    async def get_by_neuron_id(
+        self, neuron_id: str, columns: Optional[List[str]] = None
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        """
+        Retrieves a record by its neuron360 ID.
+        """
+        lookup = self._neuron_lookup(None, "get_by_neuron_id")
+        if lookup is None:
+            return None
+        try:
+            return await self._select_one(lookup[0], neuron_id, columns, unique=False)
+        except Exception as e:
+            logger.error(
+                f"Error fetching record with neuron_id {neuron_id} from {self.table_name}: {e}"
+            )
+            return None
+
+    async def get_many_by_neuron_ids(
+        self,
+        neuron_ids: Iterable[str],
+        chunk_size: int = DEFAULT_LOOKUP_CHUNK_SIZE,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Union[T, Dict[str, Any]]]]:
+        """
+        Retrieves the records matching a batch of neuron360 IDs.
+        See BaseService.get_many_by_neuron_ids.
+        """
+        lookup = self._neuron_lookup(columns, "get_many_by_neuron_ids")
+        if lookup is None:
+            return None
+        id_column, columns = lookup
+
+        unique_ids = list(dict.fromkeys(i for i in neuron_ids if i))
+        found: Dict[str, Union[T, Dict[str, Any]]] = {}
+        unique_ids = self._take_cached(id_column, unique_ids, columns, found)
+        try:
+            for start in range(0, len(unique_ids), chunk_size):
+                chunk = unique_ids[start : start + chunk_size]
+                generation = self._generation()
+                response = await self._execute(
+                    self._in_request(id_column, chunk, columns), "select"
+                )
+                self._found_many(id_column, chunk, columns, response, generation, found)
+        except Exception as e:
+            logger.error(
+                f"Error fetching records by neuron_id from {self.table_name}: {e}"
+            )
+            return None
+        return found
+
+    async def exists(self, column: str, value: Any) -> Optional[bool]:
+        """
+        Checks whether any record has `column` equal to `value`.
+        See BaseService.exists.
+        """
+        cached = self._cached_exists(column, value)
+        if cached is not MISSING:
+            return cached
+        try:
+            generation = self._generation()
+            response = await self._execute(
+                self._exists_request(column, value), "select"
+            )
+            return self._found_exists(column, value, response, generation)
+        except Exception as e:
+            logger.error(
+                f"Error checking for {column}={value} in {self.table_name}: {e}"
+            )
+            return None
+
+    async def rpc(self, function_name: str, params: Dict[str, Any]) -> Any:
+        """
+        Calls a Postgres function of the service's schema. See BaseService.rpc.
+        """
+        try:
+            request = get_async_supabase_client(self.schema).rpc(function_name, params)
+            async with async_client_registry.get_semaphore():
+                with track(f"{self.schema}.{function_name}", "rpc"):
+                    response = await request.execute()
+            return response.data
+        except Exception as e:
+            logger.error(f"Error calling {self.schema}.{function_name}: {e}")
+            return None
+
+    async def get_all(
+        self, limit: int = 100, columns: Optional[List[str]] = None
+    ) -> List[Union[T, Dict[str, Any]]]:
+        """
+        Retrieves all records from the table with a limit.
+        """
+        try:
+            response = await self._execute(self._all_request(limit, columns), "select")
+            return [self._record(item, columns) for item in response.data or []]
+        except Exception as e:
+            logger.error(f"Error fetching all records from {self.table_name}: {e}")
+            return []
+
+    async def iter_all(
+        self,
+        batch_size: int = DEFAULT_PAGE_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Union[T, Dict[str, Any]]]:
+        """
+        Lazily yields every record of the table, one keyset-paginated page at
+        a time. See BaseService.iter_all.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        if columns and self.primary_key not in columns:
+            # The primary key is needed to position the next page
+            columns = [self.primary_key, *columns]
+
+        last_key = None
+        fetched = 0
+        while True:
+            try:
+                response = await self._execute(
+                    self._page_request(columns, filters, last_key, batch_size),
+                    "select",
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error scanning {self.table_name} after {fetched} records: {e}"
+                )
+                return
+
+            rows = response.data or []
+            for row in rows:
+                yield self._record(row, columns)
+            fetched += len(rows)
+
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1][self.primary_key]
+
+    async def delete(self, record_id: Any) -> bool:
+        """
+        Deletes a record by its primary key.
+        """
+        try:
+            response = await self._execute(
+                self._table().delete().eq("id", record_id), "delete"
+            )
+            self._clear_cache()
+            if response.data:
+                logger.info(
+                    f"Successfully deleted record {record_id} from {self.table_name}"
+                )
+                return True
+            logger.warning(
+                f"Record {record_id} not found in {self.table_name} for deletion."
+            )
+            return False
+        except Exception as e:
+            logger.error(
+                f"Error deleting record {record_id} from {self.table_name}: {e}"
+            )
+            return False
+
+    async def delete_many(
+        self,
+        column: str,
+        values: Iterable[Any],
+        chunk_size: int = DEFAULT_LOOKUP_CHUNK_SIZE,
+    ) -> Optional[int]:
+        """
+        Deletes every record whose `column` is one of `values`, retrying
+        failed statements. See BaseService.delete_many.
+        """
+        unique_values = list(dict.fromkeys(v for v in values if v is not None))
+        deleted = 0
+        try:
+            for start in range(0, len(unique_values), chunk_size):
+                chunk = unique_values[start : start + chunk_size]
+
+                async def send(attempt: int):
+                    return await self._execute(
+                        self._delete_request(column, chunk), "delete"
+                    )
+
+                response = await self.retrier.run_async(send)
+                deleted += len(response.data or [])
+        except Exception as e:
+            logger.error(
+                f"Error deleting records by {column} from {self.table_name} "
+                f"after {deleted} records: {e}"
+            )
+            return None
+        finally:
+            self._clear_cache()
+        logger.info(f"Deleted {deleted} records from {self.table_name} by {column}")
+        return deleted
+
+    async def upsert(
+        self,
+        data: T,
+        on_conflict: str = "id",
+        return_minimal: bool = False,
+        ignore_duplicates: bool = False,
+    ) -> Optional[T]:
+        """
+        Performs an 'upsert' operation (insert or update).
+        """
+        try:
+            record_dict = serialize_model(data)
+            response = await self._upsert(
+                record_dict,
+                on_conflict,
+                self._returning(return_minimal),
+                ignore_duplicates,
+            )
+            self._invalidate([record_dict])
+            return self._written_one(data, response, return_minimal, "upserted")
+        except Exception as e:
+            logger.error(f"Error upserting record in {self.table_name}: {e}")
+            return None
+
+    async def upsert_many(
+        self,
+        data: List[Union[T, Dict[str, Any]]],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        return_minimal: bool = False,
+    ) -> List[Optional[T]]:
+        """
+        Inserts or updates many records in chunks. See BaseService.upsert_many.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        on_conflict = on_conflict or self.primary_key
+        results: List[Optional[T]] = [None] * len(data)
+        written = 0
+        returning = self._returning(return_minimal)
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            end = start + len(chunk)
+            try:
+                records = serialize_records(chunk)
+                response = await self._upsert(
+                    records,
+                    on_conflict,
+                    returning,
+                    ignore_duplicates,
+                    default_to_null=False,
+                )
+                self._invalidate(records)
+                written += len(chunk)
+                results[start:end] = self._upserted_chunk(
+                    chunk, records, response, return_minimal
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error upserting rows {start}-{end - 1} in {self.table_name}: {e}"
+                )
+
+        logger.info(f"Upserted {written}/{len(data)} records in {self.table_name}")
+        return results
@@ -1,166 +1,398 @@
-from supabase import create_client, Client
-from supabase.lib.client_options import ClientOptions
-from src.utils.config import config
+from src.services.client_registry import get_supabase_client
+from src.services.copy_loader import get_copy_loader
+from src.services.service_core import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_LOOKUP_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    ServiceCore,
+    T,
+    has_keys,
+    neuron_id_column,
+    row_count,
+    select_clause,
+    serialize_model,
+    serialize_records,
+)
+from src.services.read_cache import MISSING
+from src.services.service_metrics import track
 from src.utils.logging import logger
-from typing import Type, TypeVar, List, Dict, Any
-from pydantic import BaseModel
+from postgrest.types import ReturnMethod
+from typing import (
+    Type,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Iterable,
+    Iterator,
+    Union,
+)
 import uuid
-import json
 
-T = TypeVar("T", bound=BaseModel)
+__all__ = [
+    "BaseService",
+    "DEFAULT_CHUNK_SIZE",
+    "DEFAULT_LOOKUP_CHUNK_SIZE",
+    "DEFAULT_PAGE_SIZE",
+    "has_keys",
+    "neuron_id_column",
+    "select_clause",
+    "serialize_model",
+    "serialize_records",
+]
 
 
-class BaseService:
+class BaseService(ServiceCore[T]):
     """
     A base service with common CRUD operations for Supabase tables.
-    Each service instance will have its own Supabase client configured for the correct schema.
+    Services share one process-wide Supabase client per schema and, when
+    SUPABASE_READ_CACHE_SIZE is set, one read-through cache per table that
+    answers repeated lookups and is invalidated by this process's writes.
+    With SUPABASE_WRITE_BACKEND=copy, `create_many` and `upsert_many` stream
+    rows straight to Postgres with COPY instead.
+
+    Writes that fail transiently (network errors, timeouts, 5xx, Postgres
+    deadlocks and the like) are retried with jittered exponential backoff,
+    within a retry budget shared by every service of the table. Only writes
+    keyed by client-side values are retried, so that a retry cannot store a
+    record twice.
+
+    Every request is counted and timed per table and operation (see
+    service_metrics), so the tables that dominate a run can be found.
+
+    Requests are built, and responses read, by ServiceCore, which
+    AsyncBaseService shares; this class only sends them.
     """
 
-    def __init__(self, table_name: str, model: Type[T]):
-        self.table_name = table_name
-        self.model = model
+    def __init__(self, table_name: str, model: Type[T], primary_key: str = "id"):
+        super().__init__(table_name, model, primary_key)
 
-        # Determine schema from table name (e.g., 'people' from 'people.identities')
-        schema = table_name.split(".")[0]
-        options = ClientOptions(schema=schema)
+        # Reuse the pooled client for this service's schema
+        self.client = get_supabase_client(self.schema)
 
-        # Create a dedicated client for this service's schema
-        self.client = create_client(
-            config.SUPABASE_URL, config.SUPABASE_SERVICE_ROLE_KEY, options
-        )
+        # Direct-to-Postgres COPY loader for multi-row writes, or None when
+        # writes go through PostgREST
+        self.copy_loader = get_copy_loader()
+
+    def _table(self):
+        return self.client.table(self.table_name_only)
+
+    def _execute(self, request, operation: str, rows: Optional[int] = None):
+        """
+        Sends a request, recording it under `operation`. Reads count the
+        rows returned, writes the `rows` sent.
+        """
+        with track(self.table_name, operation, rows or 0) as call:
+            response = request.execute()
+            if rows is None:
+                call.rows = len(response.data or [])
+        return response
 
-    def create(self, data: T) -> T:
+    def _insert(
+        self,
+        records: Union[Dict[str, Any], List[Dict[str, Any]]],
+        returning: ReturnMethod,
+        default_to_null: bool = True,
+    ):
+        """
+        Sends an insert, retrying transient failures as described in
+        ServiceCore._insert_request.
+        """
+
+        def send(attempt: int):
+            operation, request = self._insert_request(
+                records, returning, default_to_null, attempt
+            )
+            return self._execute(request, operation, row_count(records))
+
+        return self.retrier.run(send, idempotent=has_keys(records, self.primary_key))
+
+    def _upsert(
+        self,
+        records: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: str,
+        returning: ReturnMethod,
+        ignore_duplicates: bool,
+        default_to_null: bool = True,
+    ):
+        """
+        Sends an upsert, retrying transient failures if every record carries
+        the conflict columns, which makes sending it again harmless.
+        """
+
+        def send(attempt: int):
+            request = self._upsert_request(
+                records, on_conflict, returning, ignore_duplicates, default_to_null
+            )
+            return self._execute(request, "upsert", row_count(records))
+
+        return self.retrier.run(send, idempotent=has_keys(records, on_conflict))
+
+    def create(self, data: T, return_minimal: bool = False) -> T:
         """
         Creates a new record in the table.
+
+        With `return_minimal`, the server is asked not to send the row back
+        (`Prefer: return=minimal`) and the given model, including any keys it
+        generated client-side, is returned once the insert has succeeded.
         """
         try:
-            # Manually create a JSON-serializable dictionary
-            record_json = data.model_dump_json(by_alias=True)
-            record_dict = json.loads(record_json)
+            record_dict = serialize_model(data)
+            response = self._insert(record_dict, self._returning(return_minimal))
+            self._invalidate([record_dict])
+            return self._written_one(data, response, return_minimal, "created")
+        except Exception as e:
+            logger.error(f"Error creating record in {self.table_name}: {e}")
+            return None
 
-            # Filter out None values to avoid issues with non-nullable columns
-            record_dict = {k: v for k, v in record_dict.items() if v is not None}
-            table_name_only = self.table_name.split(".")[1]
-            response = self.client.table(table_name_only).insert(record_dict).execute()
+    def create_many(
+        self,
+        data: List[T],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        return_minimal: bool = False,
+    ) -> List[Optional[T]]:
+        """
+        Creates many records using multi-row inserts of up to `chunk_size` rows.
 
-            if response.data:
-                logger.info(f"Successfully created record in {self.table_name}")
-                return self.model.model_validate(response.data[0])
-            else:
+        Returns a list aligned with the input: each entry is the created record,
+        or None if the chunk containing it failed. A failed chunk is logged and
+        does not stop the remaining chunks from being sent. With
+        `return_minimal`, the input models themselves are returned for every
+        chunk that was accepted, as they always are through COPY.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        if self.copy_loader is not None:
+            # Plain inserts: a row whose key already exists fails its chunk
+            return self._copy_many(data, None, False, chunk_size)
+
+        results: List[Optional[T]] = [None] * len(data)
+        returning = self._returning(return_minimal)
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            end = start + len(chunk)
+            try:
+                records = serialize_records(chunk)
+                # Columns omitted from a row fall back to their database default
+                # rather than NULL, matching the single-row create behaviour.
+                response = self._insert(records, returning, default_to_null=False)
+                self._invalidate(records)
+                created = self._created_chunk(chunk, response, return_minimal, start)
+                if created is not None:
+                    results[start:end] = created
+            except Exception as e:
                 logger.error(
-                    f"Failed to create record in {self.table_name}: No data returned"
+                    f"Error creating rows {start}-{end - 1} in {self.table_name}: {e}"
                 )
-                return None
-        except Exception as e:
-            logger.error(f"Error creating record in {self.table_name}: {e}")
-            return None
 
-    def get_by_id(self, record_id: any) -> T:
+        created = sum(1 for record in results if record is not None)
+        logger.info(f"Created {created}/{len(data)} records in {self.table_name}")
+        return results
+
+    def _select_one(
+        self, column: str, value: Any, columns: Optional[List[str]], unique: bool
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        record = self._cached_one(column, value, columns)
+        if record is not MISSING:
+            return record
+        generation = self._generation()
+        response = self._execute(
+            self._select_request(column, value, columns, unique), "select"
+        )
+        return self._found_one(column, value, columns, response, generation)
+
+    def get_by_id(
+        self, record_id: any, columns: Optional[List[str]] = None
+    ) -> Optional[Union[T, Dict[str, Any]]]:
         """
         Retrieves a record by its primary key.
+
+        Every read method accepts `columns` to fetch only those columns; the
+        matching rows are then returned as plain dicts instead of models.
         """
         try:
-            table_name_only = self.table_name.split(".")[1]
-            response = (
-                self.client.table(table_name_only)
-                .select("*")
-                .eq("id", record_id)
-                .execute()
-            )
-            if response.data:
-                return self.model.model_validate(response.data[0])
-            return None
+            return self._select_one("id", record_id, columns, unique=True)
         except Exception as e:
             logger.error(
                 f"Error fetching record {record_id} from {self.table_name}: {e}"
             )
             return None
 
-    def get_by_uuid(self, record_uuid: uuid.UUID) -> T:
+    def get_by_uuid(
+        self, record_uuid: uuid.UUID, columns: Optional[List[str]] = None
+    ) -> Optional[Union[T, Dict[str, Any]]]:
         """
         Retrieves a record by its UUID.
         """
         try:
-            table_name_only = self.table_name.split(".")[1]
-            response = (
-                self.client.table(table_name_only)
-                .select("*")
-                .eq("uuid", str(record_uuid))
-                .execute()
-            )
-            if response.data:
-                return self.model.model_validate(response.data[0])
-            return None
+            return self._select_one("uuid", str(record_uuid), columns, unique=True)
         except Exception as e:
             logger.error(
                 f"Error fetching record {record_uuid} from {self.table_name}: {e}"
             )
             return None
 
-    def get_by_neuron_id(self, neuron_id: str) -> T:
+    def get_by_neuron_id(
+        self, neuron_id: str, columns: Optional[List[str]] = None
+    ) -> Optional[Union[T, Dict[str, Any]]]:
         """
         Retrieves a record by its neuron360 ID.
         This is a common pattern for organisations and people.
         """
+        lookup = self._neuron_lookup(None, "get_by_neuron_id")
+        if lookup is None:
+            return None
         try:
-            table_name_only = self.table_name.split(".")[1]
-            # Figure out the correct column name based on the table
-            if table_name_only == "identities" and "organisation" in self.table_name:
-                id_column = "neuron360_company_id"
-            elif table_name_only == "identities" and "people" in self.table_name:
-                id_column = "neuron360_profile_id"
-            elif table_name_only == "offices":
-                id_column = "neuron360_office_id"
-            else:
-                logger.error(
-                    f"get_by_neuron_id is not supported for table {self.table_name}"
+            return self._select_one(lookup[0], neuron_id, columns, unique=False)
+        except Exception as e:
+            logger.error(
+                f"Error fetching record with neuron_id {neuron_id} from {self.table_name}: {e}"
+            )
+            return None
+
+    def get_many_by_neuron_ids(
+        self,
+        neuron_ids: Iterable[str],
+        chunk_size: int = DEFAULT_LOOKUP_CHUNK_SIZE,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Union[T, Dict[str, Any]]]]:
+        """
+        Retrieves the records matching a batch of neuron360 IDs with one `in`
+        query per `chunk_size` IDs.
+
+        Returns a map of neuron360 ID to record containing only the IDs that
+        exist, or None if the table has no neuron360 ID or any query failed, so
+        callers can tell "not found" apart from "could not check".
+        """
+        lookup = self._neuron_lookup(columns, "get_many_by_neuron_ids")
+        if lookup is None:
+            return None
+        id_column, columns = lookup
+
+        unique_ids = list(dict.fromkeys(i for i in neuron_ids if i))
+        found: Dict[str, Union[T, Dict[str, Any]]] = {}
+        unique_ids = self._take_cached(id_column, unique_ids, columns, found)
+        try:
+            for start in range(0, len(unique_ids), chunk_size):
+                chunk = unique_ids[start : start + chunk_size]
+                generation = self._generation()
+                response = self._execute(
+                    self._in_request(id_column, chunk, columns), "select"
                 )
-                return None
-
-            response = (
-                self.client.table(table_name_only)
-                .select("*")
-                .eq(id_column, neuron_id)
-                .limit(1)
-                .execute()
+                self._found_many(id_column, chunk, columns, response, generation, found)
+        except Exception as e:
+            logger.error(
+                f"Error fetching records by neuron_id from {self.table_name}: {e}"
             )
-            if response.data:
-                return self.model.model_validate(response.data[0])
-                return None
+            return None
+        return found
+
+    def exists(self, column: str, value: Any) -> Optional[bool]:
+        """
+        Checks whether any record has `column` equal to `value`.
+
+        Only the primary key of at most one row is requested, so the check
+        moves a few bytes whatever the width of the table. Returns None if the
+        query failed.
+        """
+        cached = self._cached_exists(column, value)
+        if cached is not MISSING:
+            return cached
+        try:
+            generation = self._generation()
+            response = self._execute(self._exists_request(column, value), "select")
+            return self._found_exists(column, value, response, generation)
         except Exception as e:
             logger.error(
-                f"Error fetching record with neuron_id {neuron_id} from {self.table_name}: {e}"
+                f"Error checking for {column}={value} in {self.table_name}: {e}"
             )
             return None
 
-    def get_all(self, limit: int = 100) -> List[T]:
+    def rpc(self, function_name: str, params: Dict[str, Any]) -> Any:
+        """
+        Calls a Postgres function of the service's schema through PostgREST.
+
+        Returns the function's result, or None if the call failed.
+        """
+        try:
+            with track(f"{self.schema}.{function_name}", "rpc"):
+                response = self.client.rpc(function_name, params).execute()
+            return response.data
+        except Exception as e:
+            logger.error(f"Error calling {self.schema}.{function_name}: {e}")
+            return None
+
+    def get_all(
+        self, limit: int = 100, columns: Optional[List[str]] = None
+    ) -> List[Union[T, Dict[str, Any]]]:
         """
         Retrieves all records from the table with a limit.
         """
         try:
-            table_name_only = self.table_name.split(".")[1]
-            response = (
-                self.client.table(table_name_only).select("*").limit(limit).execute()
-            )
-            if response.data:
-                return [self.model.model_validate(item) for item in response.data]
-            return []
+            response = self._execute(self._all_request(limit, columns), "select")
+            return [self._record(item, columns) for item in response.data or []]
         except Exception as e:
             logger.error(f"Error fetching all records from {self.table_name}: {e}")
             return []
 
+    def iter_all(
+        self,
+        batch_size: int = DEFAULT_PAGE_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Union[T, Dict[str, Any]]]:
+        """
+        Lazily yields every record of the table, optionally restricted to
+        `columns` and to rows whose columns equal the values in `filters`.
+
+        Pages are fetched `batch_size` rows at a time using keyset pagination
+        on the primary key (`WHERE pk > last_seen ORDER BY pk LIMIT n`), so each
+        page costs the same however deep into the table the scan is, and only
+        one page is held in memory. Yields models, or raw row dicts (with the
+        primary key) when `columns` are given, as a projection may lack
+        required fields.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        if columns and self.primary_key not in columns:
+            # The primary key is needed to position the next page
+            columns = [self.primary_key, *columns]
+
+        last_key = None
+        fetched = 0
+        while True:
+            try:
+                response = self._execute(
+                    self._page_request(columns, filters, last_key, batch_size),
+                    "select",
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error scanning {self.table_name} after {fetched} records: {e}"
+                )
+                return
+
+            rows = response.data or []
+            for row in rows:
+                yield self._record(row, columns)
+            fetched += len(rows)
+
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1][self.primary_key]
+
     def delete(self, record_id: Any) -> bool:
         """
         Deletes a record by its primary key.
         """
         try:
-            table_name_only = self.table_name.split(".")[1]
-            response = (
-                self.client.table(table_name_only)
-                .delete()
-                .eq("id", record_id)
-                .execute()
+            response = self._execute(
+                self._table().delete().eq("id", record_id), "delete"
             )
+            self._clear_cache()
             if response.data:
                 logger.info(
                     f"Successfully deleted record {record_id} from {self.table_name}"
@@ -177,30 +409,161 @@ class BaseService:
             )
             return False
 
-    def upsert(self, data: T, on_conflict: str = "id") -> T:
+    def delete_many(
+        self,
+        column: str,
+        values: Iterable[Any],
+        chunk_size: int = DEFAULT_LOOKUP_CHUNK_SIZE,
+    ) -> Optional[int]:
         """
-        Performs an 'upsert' operation (insert or update).
+        Deletes every record whose `column` is one of `values`, with one `in`
+        statement per `chunk_size` values. Rows of other tables referencing
+        them are removed by the database's ON DELETE CASCADE.
+
+        Deleting is idempotent, so failed statements are retried. Returns the
+        number of records deleted, or None if any statement failed.
         """
+        unique_values = list(dict.fromkeys(v for v in values if v is not None))
+        deleted = 0
         try:
-            # Manually create a JSON-serializable dictionary
-            record_json = data.model_dump_json(by_alias=True)
-            record_dict = json.loads(record_json)
-
-            # Filter out None values to avoid issues with non-nullable columns
-            record_dict = {k: v for k, v in record_dict.items() if v is not None}
-            table_name_only = self.table_name.split(".")[1]
-            response = (
-                self.client.table(table_name_only)
-                .upsert(record_dict, on_conflict=on_conflict)
-                .execute()
+            for start in range(0, len(unique_values), chunk_size):
+                chunk = unique_values[start : start + chunk_size]
+                response = self.retrier.run(
+                    lambda attempt: self._execute(
+                        self._delete_request(column, chunk), "delete"
+                    )
+                )
+                deleted += len(response.data or [])
+        except Exception as e:
+            logger.error(
+                f"Error deleting records by {column} from {self.table_name} "
+                f"after {deleted} records: {e}"
             )
+            return None
+        finally:
+            self._clear_cache()
+        logger.info(f"Deleted {deleted} records from {self.table_name} by {column}")
+        return deleted
 
-            if response.data:
-                logger.info(f"Successfully upserted record in {self.table_name}")
-                return self.model.model_validate(response.data[0])
-            else:
-                logger.error(f"Failed to upsert record in {self.table_name}")
-                return None
+    def upsert(
+        self,
+        data: T,
+        on_conflict: str = "id",
+        return_minimal: bool = False,
+        ignore_duplicates: bool = False,
+    ) -> T:
+        """
+        Performs an 'upsert' operation (insert or update).
+
+        With `ignore_duplicates`, a conflicting row is left untouched instead
+        of being updated. `return_minimal` behaves as in `create`.
+        """
+        try:
+            record_dict = serialize_model(data)
+            response = self._upsert(
+                record_dict,
+                on_conflict,
+                self._returning(return_minimal),
+                ignore_duplicates,
+            )
+            self._invalidate([record_dict])
+            return self._written_one(data, response, return_minimal, "upserted")
         except Exception as e:
             logger.error(f"Error upserting record in {self.table_name}: {e}")
             return None
+
+    def upsert_many(
+        self,
+        data: List[Union[T, Dict[str, Any]]],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        return_minimal: bool = False,
+    ) -> List[Optional[T]]:
+        """
+        Inserts or updates many records with multi-row upserts of up to
+        `chunk_size` rows, resolving conflicts on `on_conflict` (a column or
+        comma-separated columns with a unique constraint; the primary key by
+        default).
+
+        Returns a list aligned with the input, as `create_many` does. With
+        `ignore_duplicates`, conflicting rows are left untouched and, unless
+        `return_minimal` is set, come back as None since the server does not
+        return them. Rows may also be given already serialized, as dicts.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        on_conflict = on_conflict or self.primary_key
+        if self.copy_loader is not None:
+            return self._copy_many(data, on_conflict, ignore_duplicates, chunk_size)
+
+        results: List[Optional[T]] = [None] * len(data)
+        written = 0
+        returning = self._returning(return_minimal)
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            end = start + len(chunk)
+            try:
+                records = serialize_records(chunk)
+                response = self._upsert(
+                    records,
+                    on_conflict,
+                    returning,
+                    ignore_duplicates,
+                    default_to_null=False,
+                )
+                self._invalidate(records)
+                written += len(chunk)
+                results[start:end] = self._upserted_chunk(
+                    chunk, records, response, return_minimal
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error upserting rows {start}-{end - 1} in {self.table_name}: {e}"
+                )
+
+        logger.info(f"Upserted {written}/{len(data)} records in {self.table_name}")
+        return results
+
+    def _copy_many(
+        self,
+        data: List[Union[T, Dict[str, Any]]],
+        on_conflict: Optional[str],
+        ignore_duplicates: bool,
+        chunk_size: int,
+    ) -> List[Optional[T]]:
+        """
+        Writes records through the COPY loader, one transaction per chunk,
+        inserting them as they are when there is no `on_conflict`. COPY
+        returns no rows, so stored records come back as the models given,
+        with rows given as dicts validated into models.
+        """
+        results: List[Optional[T]] = [None] * len(data)
+        written = 0
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            end = start + len(chunk)
+            try:
+                records = serialize_records(chunk)
+                with track(self.table_name, "copy", len(records)):
+                    self.copy_loader.load(
+                        self.table_name,
+                        records,
+                        on_conflict=on_conflict,
+                        ignore_duplicates=ignore_duplicates,
+                    )
+                self._invalidate(records)
+                written += len(chunk)
+                results[start:end] = [
+                    self.model.model_validate(item) if isinstance(item, dict) else item
+                    for item in chunk
+                ]
+            except Exception as e:
+                logger.error(
+                    f"Error copying rows {start}-{end - 1} into {self.table_name}: {e}"
+                )
+
+        logger.info(f"Copied {written}/{len(data)} records into {self.table_name}")
+        return results
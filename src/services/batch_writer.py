@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from pydantic import BaseModel
+
+from src.services.base_service import BaseService, serialize_model
+from src.services.schema import write_rank
+from src.utils.config import config
+from src.utils.logging import logger
+
+
+class _TableBuffer:
+    def __init__(self, service: BaseService, started_at: float):
+        self.service = service
+        self.rows: List[Dict[str, Any]] = []
+        self.bytes = 0
+        self.started_at = started_at
+
+
+class BatchWriter:
+    """
+    A write-behind buffer that collects records per table and sends each
+    table's records as multi-row upserts.
+
+    A table is flushed once it holds `max_rows` rows or about `max_bytes` of
+    payload, or once its oldest row has waited `max_delay_seconds` (checked
+    whenever a record is added). Every flush also flushes the tables that
+    come before it in TABLE_WRITE_ORDER, so a row is never sent before the
+    parent rows it references. Use `flush()`, or the writer as a context
+    manager, at the end of a unit of work to send whatever is left.
+
+    Writes are idempotent upserts on the primary key, like the managers'
+    direct writes. Rows of a failed chunk are counted in `failed_rows`.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = config.BATCH_WRITER_MAX_ROWS,
+        max_bytes: int = config.BATCH_WRITER_MAX_BYTES,
+        max_delay_seconds: float = config.BATCH_WRITER_MAX_DELAY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_rows < 1:
+            raise ValueError("max_rows must be a positive integer")
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_delay_seconds = max_delay_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._buffers: Dict[str, _TableBuffer] = {}
+        self.written_rows = 0
+        self.failed_rows = 0
+
+    def add(self, service: BaseService, model: BaseModel) -> BaseModel:
+        """
+        Buffers a record for `service`'s table, flushing if a limit is hit.
+        Returns the record, whose keys are generated client-side.
+        """
+        row = serialize_model(model)
+        # A cheap approximation of the row's JSON size
+        size = sum(len(key) + len(str(value)) + 6 for key, value in row.items())
+        with self._lock:
+            now = self._clock()
+            buffer = self._buffers.get(service.table_name)
+            if buffer is None:
+                buffer = _TableBuffer(service, now)
+                self._buffers[service.table_name] = buffer
+            elif not buffer.rows:
+                buffer.started_at = now
+            buffer.rows.append(row)
+            buffer.bytes += size
+
+            if len(buffer.rows) >= self.max_rows or buffer.bytes >= self.max_bytes:
+                self._flush_through(service.table_name)
+            elif now - self._oldest_start() >= self.max_delay_seconds:
+                self._flush_all()
+        return model
+
+    def flush(self):
+        """
+        Sends every buffered row, parent tables first.
+        """
+        with self._lock:
+            self._flush_all()
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def pending_rows(self) -> int:
+        """
+        Returns the number of rows waiting to be sent.
+        """
+        with self._lock:
+            return sum(len(buffer.rows) for buffer in self._buffers.values())
+
+    def _oldest_start(self) -> float:
+        starts = [b.started_at for b in self._buffers.values() if b.rows]
+        return min(starts) if starts else self._clock()
+
+    def _flush_all(self):
+        self._flush_tables(sorted(self._buffers, key=write_rank))
+
+    def _flush_through(self, table_name: str):
+        # Rows of the full table may reference buffered rows of any table
+        # before it in write order, so those are sent first.
+        rank = write_rank(table_name)
+        self._flush_tables(
+            sorted(
+                (name for name in self._buffers if write_rank(name) <= rank),
+                key=write_rank,
+            )
+        )
+
+    def _flush_tables(self, table_names: List[str]):
+        for table_name in table_names:
+            buffer = self._buffers[table_name]
+            if not buffer.rows:
+                continue
+            rows, buffer.rows, buffer.bytes = buffer.rows, [], 0
+            results = buffer.service.upsert_many(
+                rows,
+                ignore_duplicates=True,
+                chunk_size=self.max_rows,
+                return_minimal=True,
+            )
+            failed = sum(1 for result in results if result is None)
+            self.written_rows += len(rows) - failed
+            self.failed_rows += failed
+            if failed:
+                logger.error(f"Failed to write {failed} buffered rows to {table_name}")
@@ -0,0 +1,299 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Protocol
+
+import httpx
+from postgrest.utils import SyncClient
+from supabase import create_client, Client, AsyncClient
+from supabase.lib.client_options import ClientOptions, AsyncClientOptions
+from src.services.http2_transport import build_transport
+from src.services.service_metrics import (
+    record_request_bytes,
+    record_request_bytes_async,
+)
+from src.utils.config import config
+from src.utils.logging import logger
+
+
+class SupabaseClientRegistry:
+    """
+    A process-wide registry handing out one Supabase client per schema.
+
+    All clients share a single HTTP transport, so every service and thread in
+    the process draws from the same bounded pool of keep-alive connections
+    instead of opening its own sockets and TLS sessions.
+
+    With `http2`, the transport negotiates HTTP/2 over TLS, and concurrent
+    requests from all threads are multiplexed as streams over a few
+    connections (see Http2Transport) instead of each holding an HTTP/1.1
+    connection of its own. Disabling `http1` makes HTTP/2 mandatory, which
+    also allows it over cleartext (h2c) to servers known to speak it, such as
+    the fake PostgREST server.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http1: bool = True,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        if not (http1 or http2):
+            raise ValueError("At least one of http1 and http2 must be enabled")
+        self.url = url
+        self.key = key
+        self.http1 = http1
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Client] = {}
+        # Built from the settings above on first use unless given
+        self._transport = transport
+
+    def get_client(self, schema: str) -> Client:
+        """
+        Returns the shared client for `schema`, creating it on first use.
+        """
+        client = self._clients.get(schema)
+        if client is not None:
+            return client
+
+        with self._lock:
+            # Another thread may have created it while we waited for the lock
+            client = self._clients.get(schema)
+            if client is None:
+                client = self._create_client(schema)
+                self._clients[schema] = client
+                logger.info(f"Created shared Supabase client for schema '{schema}'")
+        return client
+
+    def _create_client(self, schema: str) -> Client:
+        if self._transport is None:
+            self._transport = build_transport(self.limits, self.http1, self.http2)
+
+        client = create_client(self.url, self.key, ClientOptions(schema=schema))
+
+        # Rebuild the PostgREST session on top of the shared transport so that
+        # the connection pool is shared across schemas, closing the session
+        # (and pool) create_client built.
+        postgrest = client.postgrest
+        postgrest.session.close()
+        postgrest.session = SyncClient(
+            base_url=postgrest.base_url,
+            headers=postgrest.headers,
+            timeout=postgrest.timeout,
+            transport=self._transport,
+            follow_redirects=True,
+            event_hooks={"request": [record_request_bytes]},
+        )
+        return client
+
+    def close(self):
+        """
+        Drops all cached clients and closes the shared connection pool.
+        """
+        with self._lock:
+            self._clients.clear()
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+
+
+class AsyncSupabaseClientRegistry:
+    """
+    The asyncio counterpart of SupabaseClientRegistry.
+
+    Async connections belong to the event loop that opened them, so the
+    clients, the shared transport and the in-flight semaphore are all tied to
+    the running loop and rebuilt if a different loop asks for them.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        max_in_flight: int,
+        http1: bool = True,
+        http2: bool = False,
+    ):
+        if not (http1 or http2):
+            raise ValueError("At least one of http1 and http2 must be enabled")
+        self.url = url
+        self.key = key
+        self.http1 = http1
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_in_flight = max_in_flight
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[str, AsyncClient] = {}
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _bind_to_running_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._clients = {}
+            self._transport = httpx.AsyncHTTPTransport(
+                limits=self.limits, http1=self.http1, http2=self.http2
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    def get_client(self, schema: str) -> AsyncClient:
+        """
+        Returns the shared async client for `schema` on the running loop.
+        """
+        self._bind_to_running_loop()
+        client = self._clients.get(schema)
+        if client is None:
+            client = AsyncClient(self.url, self.key, AsyncClientOptions(schema=schema))
+            postgrest = client.postgrest
+            postgrest.session = httpx.AsyncClient(
+                base_url=postgrest.base_url,
+                headers=postgrest.headers,
+                timeout=postgrest.timeout,
+                transport=self._transport,
+                follow_redirects=True,
+                event_hooks={"request": [record_request_bytes_async]},
+            )
+            self._clients[schema] = client
+            logger.info(f"Created shared async Supabase client for schema '{schema}'")
+        return client
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore bounding in-flight requests on the running loop.
+        """
+        self._bind_to_running_loop()
+        return self._semaphore
+
+    async def close(self):
+        """
+        Drops all cached clients and closes the shared connection pool.
+        """
+        self._clients = {}
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+        self._loop = None
+
+
+# Create singleton instances for easy access across the application
+client_registry = SupabaseClientRegistry(
+    config.SUPABASE_URL,
+    config.SUPABASE_SERVICE_ROLE_KEY,
+    max_connections=config.SUPABASE_MAX_CONNECTIONS,
+    max_keepalive_connections=config.SUPABASE_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=config.SUPABASE_KEEPALIVE_EXPIRY_SECONDS,
+    http1=not config.SUPABASE_HTTP2_PRIOR_KNOWLEDGE,
+    http2=config.SUPABASE_HTTP2 or config.SUPABASE_HTTP2_PRIOR_KNOWLEDGE,
+)
+async_client_registry = AsyncSupabaseClientRegistry(
+    config.SUPABASE_URL,
+    config.SUPABASE_SERVICE_ROLE_KEY,
+    max_connections=config.SUPABASE_MAX_CONNECTIONS,
+    max_keepalive_connections=config.SUPABASE_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=config.SUPABASE_KEEPALIVE_EXPIRY_SECONDS,
+    max_in_flight=config.SUPABASE_ASYNC_MAX_IN_FLIGHT,
+    http1=not config.SUPABASE_HTTP2_PRIOR_KNOWLEDGE,
+    http2=config.SUPABASE_HTTP2 or config.SUPABASE_HTTP2_PRIOR_KNOWLEDGE,
+)
+
+
+class StorageBackend(Protocol):
+    """
+    The storage behind the services, as a provider of per-schema clients.
+
+    A client must support what BaseService and AsyncBaseService use of the
+    Supabase client: `table(name)` returning a PostgREST-style query builder
+    (select, insert, upsert, delete, eq, in_, gt, order, limit) whose
+    `execute()` returns a response holding the rows in `data`, and
+    `rpc(name, params)`. Async clients return awaitable `execute()` calls.
+
+    `supports_rpc` tells whether the backend provides the database functions
+    of sql/functions, which the rpc and staging ingest modes call.
+    """
+
+    supports_rpc: bool
+
+    def get_client(self, schema: str) -> Any: ...
+
+    def get_async_client(self, schema: str) -> Any: ...
+
+
+# The backend replacing Supabase, if any; see set_storage_backend
+_storage_backend: Optional[StorageBackend] = None
+_storage_backend_lock = threading.Lock()
+
+
+def set_storage_backend(backend: Optional[StorageBackend]):
+    """
+    Routes every service created from now on through `backend`, or back to
+    Supabase when None.
+    """
+    global _storage_backend
+    with _storage_backend_lock:
+        _storage_backend = backend
+
+
+def get_storage_backend() -> Optional[StorageBackend]:
+    """
+    Returns the backend replacing Supabase, or None when services talk to
+    Supabase. With STORAGE_BACKEND=sqlite, an embedded SQLite backend at
+    SQLITE_DATABASE_PATH is created on first use.
+    """
+    global _storage_backend
+    if _storage_backend is None and config.STORAGE_BACKEND == "sqlite":
+        # Imported here, as the SQLite backend itself builds on the services
+        from src.services.sqlite_backend import SQLiteBackend
+
+        with _storage_backend_lock:
+            if _storage_backend is None:
+                _storage_backend = SQLiteBackend(config.SQLITE_DATABASE_PATH)
+    return _storage_backend
+
+
+def storage_supports_rpc() -> bool:
+    """
+    Tells whether the storage behind the services provides database
+    functions; Supabase always does.
+    """
+    backend = get_storage_backend()
+    return backend is None or backend.supports_rpc
+
+
+def get_supabase_client(schema: str) -> Client:
+    """
+    Returns the process-wide Supabase client for `schema`, or the client of
+    the storage backend replacing Supabase.
+    """
+    backend = get_storage_backend()
+    if backend is not None:
+        return backend.get_client(schema)
+    return client_registry.get_client(schema)
+
+
+def get_async_supabase_client(schema: str) -> AsyncClient:
+    """
+    Returns the async Supabase client for `schema` on the running event loop,
+    or the async client of the storage backend replacing Supabase.
+    """
+    backend = get_storage_backend()
+    if backend is not None:
+        return backend.get_async_client(schema)
+    return async_client_registry.get_client(schema)
@@ -0,0 +1,291 @@
+import csv
+import io
+import json
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.config import config
+from src.utils.logging import logger
+
+try:
+    import psycopg
+    from psycopg import sql
+    from psycopg.types.json import Jsonb
+except ImportError:  # psycopg is only needed for the COPY write backend
+    psycopg = None
+
+COPY_FORMATS = ("binary", "csv")
+
+# Written for missing values in CSV, so that NULL and "" stay distinct.
+CSV_NULL = "\\N"
+
+
+def _timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _uuid(value: Any) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+# Binary COPY needs values of the exact column type, while rows arrive as
+# JSON-ready dicts (see serialize_model). Converters are keyed by pg_type.typname.
+_BINARY_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "uuid": _uuid,
+    "timestamptz": _timestamp,
+    "timestamp": _timestamp,
+    "date": _date,
+    "int2": int,
+    "int4": int,
+    "int8": int,
+    "float4": float,
+    "float8": float,
+    "bool": bool,
+    "json": lambda value: Jsonb(value),
+    "jsonb": lambda value: Jsonb(value),
+}
+
+
+def _array_item(item: Any) -> str:
+    if item is None:
+        return "NULL"
+    return '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def csv_value(value: Any) -> str:
+    """
+    Returns the text form of a JSON-ready value in a CSV COPY stream.
+    """
+    if value is None:
+        return CSV_NULL
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, list):
+        # Postgres array literal; elements are quoted and escaped
+        return "{" + ",".join(_array_item(item) for item in value) + "}"
+    return str(value)
+
+
+def encode_csv(rows: List[Dict[str, Any]], columns: List[str]) -> bytes:
+    """
+    Encodes rows as a CSV COPY payload with the given column order.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([csv_value(row.get(column)) for column in columns])
+    return buffer.getvalue().encode("utf-8")
+
+
+def group_by_columns(
+    rows: List[Dict[str, Any]],
+) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """
+    Groups rows by the set of columns they carry.
+
+    serialize_model drops None values, so rows of one table can have different
+    columns; each group is copied with only its own columns, leaving the rest
+    to their column defaults as a PostgREST insert would.
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(row), []).append(row)
+    return groups
+
+
+class CopyLoader:
+    """
+    Writes rows straight to Postgres with `COPY ... FROM STDIN`, bypassing
+    PostgREST, for bulk backfills.
+
+    COPY cannot resolve conflicts, so each load copies rows into a temporary
+    table and moves them into the target with a single INSERT ... ON CONFLICT,
+    which keeps writes idempotent like the PostgREST upserts. Rows are sent in
+    binary format by default, or as CSV. Each thread uses its own connection.
+    """
+
+    def __init__(self, dsn: str, copy_format: str = "binary"):
+        if psycopg is None:
+            raise ImportError(
+                "psycopg is required for the COPY write backend: "
+                "pip install 'psycopg[binary]'"
+            )
+        if copy_format not in COPY_FORMATS:
+            raise ValueError(f"copy_format must be one of {COPY_FORMATS}")
+        self.dsn = dsn
+        self.copy_format = copy_format
+        self._local = threading.local()
+        self._column_types: Dict[str, Dict[str, Tuple[int, str]]] = {}
+
+    def _connection(self) -> "psycopg.Connection":
+        connection = getattr(self._local, "connection", None)
+        if connection is None or connection.closed:
+            # Autocommit, so each load's transaction() is a real transaction
+            connection = psycopg.connect(self.dsn, autocommit=True)
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """
+        Closes the calling thread's connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def column_types(self, table_name: str) -> Dict[str, Tuple[int, str]]:
+        """
+        Returns the (type oid, type name) of each column of `table_name`.
+        """
+        types = self._column_types.get(table_name)
+        if types is None:
+            with self._connection().cursor() as cursor:
+                cursor.execute(
+                    "SELECT a.attname, a.atttypid, t.typname FROM pg_attribute a "
+                    "JOIN pg_type t ON t.oid = a.atttypid "
+                    "WHERE a.attrelid = %s::regclass AND a.attnum > 0 "
+                    "AND NOT a.attisdropped",
+                    (table_name,),
+                )
+                types = {name: (oid, typname) for name, oid, typname in cursor}
+            self._column_types[table_name] = types
+        return types
+
+    def load(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: Optional[str] = "id",
+        ignore_duplicates: bool = False,
+    ) -> int:
+        """
+        Copies `rows` into `table_name` in one transaction and returns the
+        number of rows inserted or updated.
+
+        Conflicts on `on_conflict` update the existing row, or leave it
+        untouched with `ignore_duplicates`. With no `on_conflict`, rows are
+        inserted as they are and a conflicting row fails the load. Raises on
+        failure, in which case none of the rows are written.
+        """
+        if not rows:
+            return 0
+        schema, table = table_name.split(".")
+        target = sql.Identifier(schema, table)
+        staging = sql.Identifier(f"_copy_{schema}_{table}")
+        column_types = self.column_types(table_name)
+        written = 0
+
+        connection = self._connection()
+        with connection.transaction(), connection.cursor() as cursor:
+            # Defaults are copied so that columns a row omits can be left out
+            cursor.execute(
+                sql.SQL(
+                    "CREATE TEMP TABLE IF NOT EXISTS {} "
+                    "(LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP"
+                ).format(staging, target)
+            )
+            for columns, group in group_by_columns(rows).items():
+                column_list = sql.SQL(",").join(map(sql.Identifier, columns))
+                cursor.execute(sql.SQL("TRUNCATE {}").format(staging))
+                self._copy(cursor, staging, columns, column_list, group, column_types)
+                cursor.execute(
+                    sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {} ").format(
+                        target, column_list, column_list, staging
+                    )
+                    + self._conflict_clause(columns, on_conflict, ignore_duplicates)
+                )
+                written += max(cursor.rowcount, 0)
+        return written
+
+    def _copy(
+        self,
+        cursor: "psycopg.Cursor",
+        staging: "sql.Identifier",
+        columns: Tuple[str, ...],
+        column_list: "sql.Composed",
+        rows: List[Dict[str, Any]],
+        column_types: Dict[str, Tuple[int, str]],
+    ):
+        if self.copy_format == "csv":
+            statement = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT csv, NULL {})").format(
+                staging, column_list, sql.Literal(CSV_NULL)
+            )
+            with cursor.copy(statement) as copy:
+                copy.write(encode_csv(rows, list(columns)))
+            return
+
+        statement = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT binary)").format(
+            staging, column_list
+        )
+        converters = [
+            _BINARY_CONVERTERS.get(column_types[column][1]) for column in columns
+        ]
+        with cursor.copy(statement) as copy:
+            copy.set_types([column_types[column][0] for column in columns])
+            for row in rows:
+                copy.write_row(
+                    [
+                        (
+                            row[column]
+                            if row[column] is None or convert is None
+                            else convert(row[column])
+                        )
+                        for column, convert in zip(columns, converters)
+                    ]
+                )
+
+    def _conflict_clause(
+        self,
+        columns: Tuple[str, ...],
+        on_conflict: Optional[str],
+        ignore_duplicates: bool,
+    ) -> "sql.Composable":
+        if on_conflict is None:
+            return sql.SQL("")
+        conflict_columns = [column.strip() for column in on_conflict.split(",")]
+        updates = [column for column in columns if column not in conflict_columns]
+        if ignore_duplicates or not updates:
+            return sql.SQL("ON CONFLICT DO NOTHING")
+        return sql.SQL("ON CONFLICT ({}) DO UPDATE SET {}").format(
+            sql.SQL(",").join(map(sql.Identifier, conflict_columns)),
+            sql.SQL(",").join(
+                sql.SQL("{} = EXCLUDED.{}").format(
+                    sql.Identifier(column), sql.Identifier(column)
+                )
+                for column in updates
+            ),
+        )
+
+
+_loader: Optional[CopyLoader] = None
+_loader_lock = threading.Lock()
+
+
+def get_copy_loader() -> Optional[CopyLoader]:
+    """
+    Returns the process-wide COPY loader, or None unless
+    SUPABASE_WRITE_BACKEND is "copy".
+    """
+    global _loader
+    if config.SUPABASE_WRITE_BACKEND != "copy":
+        return None
+    with _loader_lock:
+        if _loader is None:
+            if not config.SUPABASE_DB_URL:
+                raise ValueError(
+                    "SUPABASE_DB_URL must be set to use the COPY write backend"
+                )
+            _loader = CopyLoader(config.SUPABASE_DB_URL, config.SUPABASE_COPY_FORMAT)
+            logger.info(f"Writing through COPY ({config.SUPABASE_COPY_FORMAT})")
+        return _loader
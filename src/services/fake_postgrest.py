@@ -0,0 +1,427 @@
+import csv
+import json
+import queue
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+import httpx
+from postgrest.types import ReturnMethod
+
+from src.services.sqlite_backend import SQLiteBackend, SQLiteQuery
+from src.utils.logging import logger
+
+REST_PREFIX = "/rest/v1/"
+
+# Sent first by clients speaking HTTP/2 without negotiating it (h2c)
+HTTP2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+# HTTP/2 flow control window of the server's connections and streams
+FLOW_CONTROL_WINDOW = 2**24
+
+# A JWT-shaped key; the Supabase client refuses keys of any other shape, but
+# the fake server does not check it.
+FAKE_API_KEY = "fake.fake.fake"
+
+# Query parameters that are not column filters
+_RESERVED_PARAMS = {"select", "columns", "on_conflict", "order", "limit"}
+
+
+class PostgrestError(Exception):
+    """
+    An error answered with a PostgREST-style JSON body.
+    """
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def parse_in_list(operand: str) -> List[str]:
+    """
+    Returns the values of an `in.(a,"b,c")` filter operand.
+    """
+    inner = operand[1:-1] if operand.startswith("(") else operand
+    return next(csv.reader([inner], skipinitialspace=True), [])
+
+
+def apply_filters(query: SQLiteQuery, params: List[Tuple[str, str]]) -> SQLiteQuery:
+    """
+    Applies the filter, order and limit parameters of a PostgREST request.
+    """
+    for key, value in params:
+        if key == "order":
+            column, _, direction = value.partition(".")
+            query = query.order(column, desc=direction.startswith("desc"))
+        elif key == "limit":
+            query = query.limit(int(value))
+        elif key not in _RESERVED_PARAMS:
+            operator, _, operand = value.partition(".")
+            if operator == "eq":
+                query = query.eq(key, operand)
+            elif operator == "gt":
+                query = query.gt(key, operand)
+            elif operator == "in":
+                query = query.in_(key, parse_in_list(operand))
+            else:
+                raise PostgrestError(
+                    400, "PGRST100", f"Unsupported operator '{operator}' on {key}"
+                )
+    return query
+
+
+class FakePostgrestServer:
+    """
+    A local HTTP server answering the subset of the PostgREST API that the
+    services use (select with eq/in/gt/order/limit, insert, upsert, delete,
+    and the Accept-Profile / Content-Profile schema headers), backed by an
+    in-memory SQLiteBackend, so the uploader can be load-tested end to end
+    without a Supabase project. Connections speak HTTP/1.1 with keep-alive,
+    or cleartext HTTP/2 when the client opens with the HTTP/2 preface.
+
+    Every request is delayed by `latency_seconds` plus a uniformly random
+    `jitter_seconds`, and fails with a 503 with probability `error_rate`.
+    Database functions (rpc) are answered with 404.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        backend: Optional[SQLiteBackend] = None,
+    ):
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.backend = backend or SQLiteBackend()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+        self.httpd = ThreadingHTTPServer((host, port), _FakePostgrestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL to use as SUPABASE_URL.
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakePostgrestServer":
+        """
+        Serves requests on a background thread.
+        """
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="fake-postgrest", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Fake PostgREST server listening on {self.url}")
+        return self
+
+    def stop(self):
+        """
+        Stops serving and logs the request counters.
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        logger.info(f"Fake PostgREST server stopped: {dict(self.stats)}")
+
+    def __enter__(self) -> "FakePostgrestServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _delay_and_maybe_fail(self) -> bool:
+        with self._lock:
+            delay = self.latency_seconds + self._random.uniform(0, self.jitter_seconds)
+            fail = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def handle(
+        self, method: str, path: str, headers: Mapping[str, str], body: Any
+    ) -> Tuple[int, Any]:
+        """
+        Answers one request, returning the status and the JSON body (None for
+        an empty body).
+        """
+        self._count(f"{method} requests")
+        if self._delay_and_maybe_fail():
+            self._count("injected errors")
+            raise PostgrestError(503, "PGRST000", "Injected error")
+
+        url = urlsplit(path)
+        if not url.path.startswith(REST_PREFIX):
+            raise PostgrestError(404, "PGRST125", f"Invalid path {url.path}")
+        table_name = url.path[len(REST_PREFIX) :]
+        if table_name.startswith("rpc/"):
+            raise PostgrestError(404, "PGRST202", f"Could not find {table_name}")
+
+        profile = "Accept-Profile" if method == "GET" else "Content-Profile"
+        schema = headers.get(profile) or "public"
+        params = parse_qsl(url.query, keep_blank_values=True)
+        prefer = dict(
+            item.strip().split("=", 1)
+            for item in headers.get("Prefer", "").split(",")
+            if "=" in item
+        )
+        returning = ReturnMethod(prefer.get("return", "representation"))
+
+        query = self.backend.get_client(schema).table(table_name)
+        if method == "GET":
+            query = query.select(dict(params).get("select", "*"))
+        elif method == "POST":
+            resolution = prefer.get("resolution")
+            if resolution:
+                query = query.upsert(
+                    body,
+                    returning=returning,
+                    ignore_duplicates=resolution == "ignore-duplicates",
+                    on_conflict=dict(params).get("on_conflict", ""),
+                )
+            else:
+                query = query.insert(body, returning=returning)
+        elif method == "DELETE":
+            query = query.delete(returning=returning)
+        else:
+            raise PostgrestError(405, "PGRST117", f"Unsupported method {method}")
+
+        query = apply_filters(query, params)
+        try:
+            data = query.execute().data
+        except sqlite3.IntegrityError as e:
+            raise PostgrestError(409, "23505", str(e))
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                raise PostgrestError(404, "42P01", str(e))
+            raise PostgrestError(400, "42703", str(e))
+
+        if method != "GET" and returning == ReturnMethod.minimal:
+            return 201 if method == "POST" else 204, None
+        return 201 if method == "POST" else 200, data
+
+
+def _respond(
+    fake: FakePostgrestServer, method: str, path: str, headers: Mapping, body: bytes
+) -> Tuple[int, bytes]:
+    # Answers a request of either protocol with a status and a JSON payload
+    try:
+        data = json.loads(body) if body else None
+        status, data = fake.handle(method, path, headers, data)
+    except PostgrestError as e:
+        status, data = e.status, {
+            "code": e.code,
+            "message": e.message,
+            "details": None,
+            "hint": None,
+        }
+    except Exception as e:
+        status, data = 500, {"code": "XX000", "message": str(e)}
+    payload = b"" if data is None else json.dumps(data, default=str).encode()
+    return status, payload
+
+
+class _FakePostgrestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients reuse connections as they would with Supabase
+    protocol_version = "HTTP/1.1"
+
+    def handle(self):
+        self.server.fake._count("connections")
+        if self.rfile.peek(len(HTTP2_PREFACE)).startswith(HTTP2_PREFACE):
+            _Http2Connection(self.server.fake, self.rfile, self.wfile).serve()
+        else:
+            super().handle()
+
+    def _handle(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload = _respond(
+            self.server.fake, method, self.path, self.headers, body
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def log_message(self, format, *args):
+        # Requests are counted in the server's stats instead of logged
+        pass
+
+
+class _Http2Connection:
+    """
+    Serves one cleartext HTTP/2 connection (h2c with prior knowledge).
+
+    Frames are read on the connection's thread and each request is answered
+    on a thread of its own, so that requests multiplexed on the connection
+    are delayed and served concurrently, as a real server would. Outgoing
+    frames are queued for a writer thread, so that reading never waits on a
+    client that is itself blocked sending.
+    """
+
+    def __init__(self, fake: FakePostgrestServer, rfile, wfile):
+        self.fake = fake
+        self.rfile = rfile
+        self.wfile = wfile
+        self.connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        # Guards the connection state machine; waited on for flow control
+        self.condition = threading.Condition()
+        self.requests: Dict[int, Tuple[List[Tuple[str, str]], bytearray]] = {}
+        self.outbox: queue.SimpleQueue = queue.SimpleQueue()
+        self.closed = False
+
+    def _flush(self):
+        # Called with the condition held, so frames are queued in order
+        data = self.connection.data_to_send()
+        if data:
+            self.outbox.put(data)
+
+    def _write(self):
+        while True:
+            data = self.outbox.get()
+            if data is None:
+                return
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except OSError:
+                return
+
+    def serve(self):
+        writer = threading.Thread(target=self._write, daemon=True)
+        writer.start()
+        with self.condition:
+            self.connection.initiate_connection()
+            # Large windows, so uploads are not paced by window updates
+            self.connection.update_settings(
+                {h2.settings.SettingCodes.INITIAL_WINDOW_SIZE: FLOW_CONTROL_WINDOW}
+            )
+            self.connection.increment_flow_control_window(
+                FLOW_CONTROL_WINDOW - self.connection.inbound_flow_control_window
+            )
+            self._flush()
+        try:
+            while not self.closed:
+                data = self.rfile.read1(65535)
+                if not data:
+                    break
+                with self.condition:
+                    events = self.connection.receive_data(data)
+                    for event in events:
+                        self._on_event(event)
+                    self._flush()
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            with self.condition:
+                self.closed = True
+                self.condition.notify_all()
+            self.outbox.put(None)
+            writer.join()
+
+    def _on_event(self, event):
+        if isinstance(event, h2.events.RequestReceived):
+            self.requests[event.stream_id] = (event.headers, bytearray())
+        elif isinstance(event, h2.events.DataReceived):
+            request = self.requests.get(event.stream_id)
+            if request is not None:
+                request[1].extend(event.data)
+            self.connection.acknowledge_received_data(
+                event.flow_controlled_length, event.stream_id
+            )
+        elif isinstance(event, h2.events.StreamEnded):
+            request = self.requests.pop(event.stream_id, None)
+            if request is not None:
+                threading.Thread(
+                    target=self._answer,
+                    args=(event.stream_id, *request),
+                    daemon=True,
+                ).start()
+        elif isinstance(event, h2.events.StreamReset):
+            self.requests.pop(event.stream_id, None)
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            self.closed = True
+        # A window update may let a waiting response continue
+        self.condition.notify_all()
+
+    def _answer(self, stream_id: int, headers: List[Tuple[str, str]], body: bytearray):
+        pseudo = {name: value for name, value in headers if name.startswith(":")}
+        status, payload = _respond(
+            self.fake,
+            pseudo[":method"],
+            pseudo[":path"],
+            httpx.Headers([(k, v) for k, v in headers if not k.startswith(":")]),
+            bytes(body),
+        )
+        try:
+            with self.condition:
+                self.connection.send_headers(
+                    stream_id,
+                    [
+                        (":status", str(status)),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(payload))),
+                    ],
+                    end_stream=not payload,
+                )
+                self._flush()
+                while payload:
+                    window = min(
+                        self.connection.local_flow_control_window(stream_id),
+                        self.connection.max_outbound_frame_size,
+                    )
+                    if window <= 0:
+                        if self.closed:
+                            return
+                        self.condition.wait()
+                        continue
+                    chunk, payload = payload[:window], payload[window:]
+                    self.connection.send_data(stream_id, chunk, end_stream=not payload)
+                    self._flush()
+        except (OSError, h2.exceptions.ProtocolError):
+            # The client reset the stream or went away
+            pass
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import httpx
+
+
+class Http2Transport(httpx.BaseTransport):
+    """
+    A synchronous transport whose requests are multiplexed over HTTP/2
+    connections owned by a private event loop thread.
+
+    httpcore's synchronous HTTP/2 connections are not safe to share between
+    threads: streams opened at the same time by different threads can reach
+    the server out of order, which it treats as a protocol error, closing the
+    connection and failing every request on it. Here every connection is
+    driven by one asyncio transport on a single thread, so any number of
+    worker threads can share a few connections; each caller blocks only on
+    its own response.
+
+    Responses are read in full before being handed back, which suits the
+    JSON bodies of PostgREST.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = httpx.Limits(),
+        http1: bool = True,
+        http2: bool = True,
+    ):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="http2-transport", daemon=True
+        )
+        self._thread.start()
+        self._transport = httpx.AsyncHTTPTransport(
+            limits=limits, http1=http1, http2=http2
+        )
+        self._closed = False
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._closed:
+            raise RuntimeError("Http2Transport is closed")
+        async_request = httpx.Request(
+            request.method,
+            request.url,
+            headers=request.headers,
+            content=request.read(),
+            extensions=request.extensions,
+        )
+        status_code, headers, content, extensions = asyncio.run_coroutine_threadsafe(
+            self._send(async_request), self._loop
+        ).result()
+        # Content is still encoded; the client decodes it as it would any body
+        return httpx.Response(
+            status_code, headers=headers, content=content, extensions=extensions
+        )
+
+    async def _send(self, request: httpx.Request):
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        extensions = {"http_version": response.extensions.get("http_version")}
+        return response.status_code, response.headers, content, extensions
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        asyncio.run_coroutine_threadsafe(self._transport.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def build_transport(
+    limits: httpx.Limits, http1: bool, http2: bool
+) -> httpx.BaseTransport:
+    """
+    Returns the transport for thread-shared synchronous clients: HTTP/2
+    through Http2Transport when enabled, pooled HTTP/1.1 otherwise.
+    """
+    if http2:
+        return Http2Transport(limits=limits, http1=http1, http2=True)
+    return httpx.HTTPTransport(limits=limits)
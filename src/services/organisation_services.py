@@ -5,7 +5,9 @@ from src.models import organisation as organisation_models
 class IdentityService(BaseService):
     def __init__(self):
         super().__init__(
-            table_name="organisation.identities", model=organisation_models.Identity
+            table_name="organisation.identities",
+            model=organisation_models.Identity,
+            primary_key="organisation_id",
         )
 
 
@@ -48,7 +50,9 @@ class PhoneService(BaseService):
 class OfficeService(BaseService):
     def __init__(self):
         super().__init__(
-            table_name="organisation.offices", model=organisation_models.Office
+            table_name="organisation.offices",
+            model=organisation_models.Office,
+            primary_key="office_id",
         )
 
 
@@ -4,12 +4,20 @@ from src.models import people as people_models
 
 class IdentityService(BaseService):
     def __init__(self):
-        super().__init__(table_name="people.identities", model=people_models.Identity)
+        super().__init__(
+            table_name="people.identities",
+            model=people_models.Identity,
+            primary_key="people_id",
+        )
 
 
 class ProfileService(BaseService):
     def __init__(self):
-        super().__init__(table_name="people.profiles", model=people_models.Profile)
+        super().__init__(
+            table_name="people.profiles",
+            model=people_models.Profile,
+            primary_key="people_id",
+        )
 
 
 class GenderService(BaseService):
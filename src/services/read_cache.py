@@ -0,0 +1,256 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from src.utils.config import config
+
+# Returned by ReadCache.get when a key is absent or expired, so that a cached
+# None ("known not to exist") can be told apart from a miss.
+MISSING = object()
+
+
+class ReadCache:
+    """
+    A thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Values of None record that a lookup found nothing (negative caching) and
+    may be given a shorter lifetime than positive entries, since another
+    writer can create the row at any time. Hit and miss counters are kept so
+    the cache can be sized from production runs.
+
+    Entries can be put under an owner, such as the primary key of the row
+    they hold, so that every entry of a row can be dropped at once. Every
+    invalidation also starts a new generation: a value read before it is
+    not cached, as it may predate the write.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = (
+            ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Hashable]]" = (
+            OrderedDict()
+        )
+        self._owned: Dict[Hashable, Set[Hashable]] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key: Hashable):
+        # Removes an entry and its owner's reference to it; lock held
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[2] is None:
+            return
+        keys = self._owned.get(entry[2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._owned[entry[2]]
+
+    def get(self, key: Hashable, accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Returns the cached value for `key`, or MISSING.
+
+        `accept` can reject a live value that cannot answer the caller, which
+        then counts as a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at <= self._clock():
+                    self._drop(key)
+                elif accept is None or accept(value):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return MISSING
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        owner: Optional[Hashable] = None,
+        generation: Optional[int] = None,
+    ):
+        """
+        Caches `value` under `key`, evicting the least recently used entry
+        when the cache is full.
+
+        `owner` files the entry under the row it holds. When `generation`,
+        read before the value was, is no longer current the value is
+        dropped instead.
+        """
+        ttl = self.negative_ttl_seconds if value is None else self.ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._drop(key)
+            self._entries[key] = (self._clock() + ttl, value, owner)
+            if owner is not None:
+                self._owned.setdefault(owner, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, keys: Iterable[Hashable], owners: Iterable[Hashable] = ()):
+        """
+        Drops each of `keys`, and every entry of each of `owners`, from the
+        cache, if present.
+        """
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._drop(key)
+            for owner in owners:
+                for key in list(self._owned.get(owner, ())):
+                    self._drop(key)
+
+    def clear(self):
+        """
+        Drops every entry. The counters are kept.
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._owned.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the counters and current size of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Service lookups are cached under (column, value) keys. An entry is None when
+# no row matched, or a (projection, row) pair where projection is the set of
+# columns that were fetched, or None for a full row.
+CacheEntry = Optional[Tuple[Optional[FrozenSet[str]], Dict[str, Any]]]
+
+
+def cache_key(column: str, value: Any) -> Tuple[str, str]:
+    """
+    Returns the cache key of a lookup of `column` = `value`.
+    """
+    return (column, str(value))
+
+
+def make_entry(
+    row: Optional[Dict[str, Any]], columns: Optional[List[str]]
+) -> CacheEntry:
+    """
+    Returns the cache entry for a row fetched with the projection `columns`.
+    """
+    if row is None:
+        return None
+    return (None if columns is None else frozenset(columns), row)
+
+
+def covers(entry: CacheEntry, columns: Optional[List[str]]) -> bool:
+    """
+    Tells whether a cache entry can answer a lookup for `columns`.
+    """
+    if entry is None:
+        return True
+    projection = entry[0]
+    return projection is None or (
+        columns is not None and projection.issuperset(columns)
+    )
+
+
+def entry_row(
+    entry: CacheEntry, columns: Optional[List[str]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the row held by a cache entry, narrowed to `columns`.
+    """
+    if entry is None:
+        return None
+    row = entry[1]
+    return row if columns is None else {column: row[column] for column in columns}
+
+
+def record_keys(record: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Returns every lookup key a written record could be cached under.
+    """
+    return [cache_key(column, value) for column, value in record.items()]
+
+
+_caches: Dict[str, ReadCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_read_cache(table_name: str) -> Optional[ReadCache]:
+    """
+    Returns the process-wide read cache for `table_name`, or None when read
+    caching is disabled (SUPABASE_READ_CACHE_SIZE=0).
+    """
+    if config.SUPABASE_READ_CACHE_SIZE < 1:
+        return None
+    with _caches_lock:
+        cache = _caches.get(table_name)
+        if cache is None:
+            cache = ReadCache(
+                config.SUPABASE_READ_CACHE_SIZE,
+                config.SUPABASE_READ_CACHE_TTL_SECONDS,
+                config.SUPABASE_READ_CACHE_NEGATIVE_TTL_SECONDS,
+            )
+            _caches[table_name] = cache
+        return cache
+
+
+def read_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the stats of every read cache in use, keyed by table name.
+    """
+    with _caches_lock:
+        caches = dict(_caches)
+    return {table_name: cache.stats() for table_name, cache in caches.items()}
+
+
+def clear_read_caches(table_names: Iterable[str]):
+    """
+    Empties the read caches of `table_names`, e.g. after rows were removed
+    from them by a cascading delete.
+    """
+    with _caches_lock:
+        caches = [_caches[name] for name in table_names if name in _caches]
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,128 @@
+import math
+import threading
+import types
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+from typing import get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+# Field types whose values are already JSON-ready and are written as-is
+_PLAIN_TYPES = (str, int, bool)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    # Optional[X] -> X; other unions are left to the generic converter
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _isoformat(value: Any) -> Any:
+    # Matches the datetime json_encoder of CustomBaseModel
+    return value.isoformat() if isinstance(value, (date, time)) else value
+
+
+def _float(value: Any) -> Optional[float]:
+    # NaN and infinity have no JSON form; pydantic writes them as null
+    return value if math.isfinite(value) else None
+
+
+def _copy_list(value: List[Any]) -> List[Any]:
+    return list(value)
+
+
+def _generic(annotation: Any) -> Callable[[Any], Any]:
+    adapter = TypeAdapter(annotation)
+    return lambda value: adapter.dump_python(value, mode="json")
+
+
+def field_converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the function turning a value of a field type into its JSON-ready
+    form, or None if values of that type need no conversion.
+    """
+    annotation = _unwrap_optional(annotation)
+    if annotation in _PLAIN_TYPES:
+        return None
+    if annotation is uuid.UUID:
+        return str
+    if annotation in (datetime, date, time):
+        return _isoformat
+    if annotation is float:
+        return _float
+    if get_origin(annotation) is list and get_args(annotation)[0] in (str, int):
+        return _copy_list
+    return _generic(annotation)
+
+
+class RowEncoder:
+    """
+    Turns instances of one model class into the dicts sent to PostgREST:
+    fields by alias, UUIDs and datetimes as strings, and None values left out
+    so that omitted columns take their database defaults.
+
+    The per-field conversions are worked out once from the model's field
+    types, so encoding a row is a single pass over its attributes instead of
+    dumping the model to a JSON string, parsing it back and filtering it.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields: List[Tuple[str, str, Optional[Callable[[Any], Any]]]] = [
+            (name, field.alias or name, field_converter(field.annotation))
+            for name, field in model.model_fields.items()
+        ]
+
+    def encode(self, data: BaseModel) -> Dict[str, Any]:
+        """
+        Returns the JSON-ready row for one model.
+        """
+        values = data.__dict__
+        row = {}
+        for name, key, convert in self.fields:
+            value = values[name]
+            if value is not None and convert is not None:
+                value = convert(value)
+            if value is not None:
+                row[key] = value
+        return row
+
+    def encode_many(self, data: Iterable[BaseModel]) -> List[Dict[str, Any]]:
+        """
+        Returns the JSON-ready rows for many models of this class.
+        """
+        # encode() inlined, as this runs for every row of a batch
+        fields = self.fields
+        rows = []
+        for item in data:
+            values = item.__dict__
+            row = {}
+            for name, key, convert in fields:
+                value = values[name]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                if value is not None:
+                    row[key] = value
+            rows.append(row)
+        return rows
+
+
+_encoders: Dict[Type[BaseModel], RowEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_row_encoder(model: Type[BaseModel]) -> RowEncoder:
+    """
+    Returns the shared encoder for a model class, compiling it on first use.
+    """
+    encoder = _encoders.get(model)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.get(model)
+            if encoder is None:
+                encoder = _encoders[model] = RowEncoder(model)
+    return encoder
@@ -0,0 +1,58 @@
+from typing import List
+
+# Every table written by the uploader, ordered so that each table comes after
+# the tables its foreign keys reference. Writing (or flushing) tables in this
+# order never inserts a row before its parent; deleting in reverse order never
+# leaves a dangling child.
+TABLE_WRITE_ORDER: List[str] = [
+    "people.identities",
+    "people.profiles",
+    "people.genders",
+    "people.social_links",
+    "people.statuses",
+    "people.emails",
+    "people.phones",
+    "people.addresses",
+    "organisation.identities",
+    "organisation.web_addresses",
+    "organisation.employees",
+    "organisation.social_links",
+    "organisation.industries",
+    "organisation.phones",
+    "organisation.offices",
+    "organisation.office_addresses",
+    "organisation.office_industries",
+    "people.experiences",
+    "people.job_title_details",
+    "people.job_functions",
+    "people.job_seniority",
+    "people.educations",
+    "people.certifications",
+    "people.memberships",
+    "people.publications",
+    "people.patents",
+    "people.awards",
+]
+
+_WRITE_RANK = {table_name: rank for rank, table_name in enumerate(TABLE_WRITE_ORDER)}
+
+
+def write_rank(table_name: str) -> int:
+    """
+    Returns the position of a table in TABLE_WRITE_ORDER. Unknown tables sort
+    after all known ones.
+    """
+    return _WRITE_RANK.get(table_name, len(TABLE_WRITE_ORDER))
+
+
+# Tables whose rows are referenced by foreign keys of other tables. A row of
+# these tables must be stored before any row referencing it is sent.
+PARENT_TABLES = frozenset(
+    {
+        "people.identities",
+        "people.profiles",
+        "people.experiences",
+        "organisation.identities",
+        "organisation.offices",
+    }
+)
@@ -0,0 +1,444 @@
+from src.services.read_cache import (
+    MISSING,
+    cache_key,
+    covers,
+    entry_row,
+    get_read_cache,
+    make_entry,
+    record_keys,
+)
+from src.services.row_encoder import get_row_encoder
+from src.services.write_retry import get_write_retrier
+from src.utils.logging import logger
+from postgrest.types import ReturnMethod
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+# Default number of rows sent in a single multi-row insert.
+DEFAULT_CHUNK_SIZE = 500
+
+# Default number of values per `in` filter; keeps request URLs well under limits.
+DEFAULT_LOOKUP_CHUNK_SIZE = 100
+
+# Default number of rows fetched per page when scanning a table.
+DEFAULT_PAGE_SIZE = 1000
+
+
+def serialize_model(data: BaseModel) -> Dict[str, Any]:
+    """
+    Converts a model into a JSON-serializable dictionary for PostgREST.
+    """
+    return get_row_encoder(type(data)).encode(data)
+
+
+def serialize_records(
+    data: Iterable[Union[BaseModel, Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """
+    Serializes a batch of models, passing already serialized dicts through.
+    """
+    records = []
+    encoder = None
+    for item in data:
+        if isinstance(item, dict):
+            records.append(item)
+            continue
+        if encoder is None or encoder.model is not type(item):
+            encoder = get_row_encoder(type(item))
+        records.append(encoder.encode(item))
+    return records
+
+
+def select_clause(columns: Optional[List[str]]) -> str:
+    """
+    Returns the PostgREST select clause for a column projection.
+    """
+    return ",".join(columns) if columns else "*"
+
+
+def neuron_id_column(table_name: str) -> Optional[str]:
+    """
+    Returns the column holding the neuron360 ID for a table, if it has one.
+    """
+    table_name_only = table_name.split(".")[1]
+    if table_name_only == "identities" and "organisation" in table_name:
+        return "neuron360_company_id"
+    elif table_name_only == "identities" and "people" in table_name:
+        return "neuron360_profile_id"
+    elif table_name_only == "offices":
+        return "neuron360_office_id"
+    return None
+
+
+def has_keys(
+    records: Union[Dict[str, Any], List[Dict[str, Any]]], columns: str
+) -> bool:
+    """
+    Tells whether every record has a value for each of the comma-separated
+    `columns`, i.e. whether writing the records again cannot duplicate them.
+    """
+    keys = [column.strip() for column in columns.split(",")]
+    rows = records if isinstance(records, list) else [records]
+    return all(row.get(key) is not None for row in rows for key in keys)
+
+
+def row_count(records: Union[Dict[str, Any], List[Dict[str, Any]]]) -> int:
+    """
+    Returns the number of rows in a write payload.
+    """
+    return len(records) if isinstance(records, list) else 1
+
+
+class ServiceCore(Generic[T]):
+    """
+    What BaseService and AsyncBaseService share: building the PostgREST
+    requests, the read cache, and turning responses into records aligned
+    with the input. None of it does I/O; the subclasses send the requests,
+    blocking or awaiting, through `_table()`.
+    """
+
+    def __init__(self, table_name: str, model: Type[T], primary_key: str = "id"):
+        self.table_name = table_name
+        self.model = model
+        self.primary_key = primary_key
+        self.schema = table_name.split(".")[0]
+        self.table_name_only = table_name.split(".")[1]
+
+        # Shared read-through cache for lookups, or None when disabled
+        self.cache = get_read_cache(table_name)
+
+        # Retries transient write failures within the table's retry budget
+        self.retrier = get_write_retrier(table_name)
+
+    def _table(self):
+        """
+        Returns a query builder for the service's table.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _returning(return_minimal: bool) -> ReturnMethod:
+        return ReturnMethod.minimal if return_minimal else ReturnMethod.representation
+
+    # Requests
+
+    def _insert_request(
+        self,
+        records: Union[Dict[str, Any], List[Dict[str, Any]]],
+        returning: ReturnMethod,
+        default_to_null: bool,
+        attempt: int,
+    ) -> Tuple[str, Any]:
+        """
+        Returns the operation and request of an insert attempt.
+
+        The primary key is the idempotency key of a record: a retry is sent
+        as an upsert on it that ignores duplicates, so if the failed attempt
+        was in fact stored the retry does not fail on a duplicate key, and a
+        row that already existed is left untouched rather than overwritten.
+        An ignored row is not returned, as with a failed insert. Records
+        without a client-side primary key are not retried.
+        """
+        if attempt == 0:
+            return "insert", self._table().insert(
+                records, returning=returning, default_to_null=default_to_null
+            )
+        return "upsert", self._table().upsert(
+            records,
+            on_conflict=self.primary_key,
+            returning=returning,
+            ignore_duplicates=True,
+            default_to_null=False,
+        )
+
+    def _upsert_request(
+        self,
+        records: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: str,
+        returning: ReturnMethod,
+        ignore_duplicates: bool,
+        default_to_null: bool,
+    ):
+        return self._table().upsert(
+            records,
+            on_conflict=on_conflict,
+            returning=returning,
+            ignore_duplicates=ignore_duplicates,
+            default_to_null=default_to_null,
+        )
+
+    def _select_request(
+        self, column: str, value: Any, columns: Optional[List[str]], unique: bool
+    ):
+        query = self._table().select(select_clause(self._fetched(columns)))
+        query = query.eq(column, value)
+        return query if unique else query.limit(1)
+
+    def _exists_request(self, column: str, value: Any):
+        return self._table().select(self.primary_key).eq(column, value).limit(1)
+
+    def _in_request(self, column: str, values: List[Any], columns: Optional[List[str]]):
+        query = self._table().select(select_clause(self._fetched(columns)))
+        return query.in_(column, values)
+
+    def _all_request(self, limit: int, columns: Optional[List[str]]):
+        return self._table().select(select_clause(columns)).limit(limit)
+
+    def _page_request(
+        self,
+        columns: Optional[List[str]],
+        filters: Optional[Dict[str, Any]],
+        last_key: Any,
+        batch_size: int,
+    ):
+        query = self._table().select(select_clause(columns))
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+        if last_key is not None:
+            query = query.gt(self.primary_key, last_key)
+        return query.order(self.primary_key).limit(batch_size)
+
+    def _delete_request(self, column: str, values: List[Any]):
+        return self._table().delete().in_(column, values)
+
+    # Read cache
+
+    def _invalidate(self, records: List[Dict[str, Any]]):
+        """
+        Drops every lookup a written row could answer: those of its new
+        values, including "not found", and those cached for the row before,
+        found by its primary key.
+        """
+        if self.cache is None:
+            return
+        if not has_keys(records, self.primary_key):
+            # The rows' earlier entries cannot be told apart from the others
+            self.cache.clear()
+            return
+        self.cache.invalidate(
+            (key for record in records for key in record_keys(record)),
+            owners=[self._owner(record) for record in records],
+        )
+
+    def _clear_cache(self):
+        # Deleted rows may be cached under any of their columns
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _generation(self) -> Optional[int]:
+        """
+        Returns the cache generation to read under, before sending a lookup.
+        """
+        return None if self.cache is None else self.cache.generation
+
+    def _owner(self, row: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        # Cached rows are filed under their primary key
+        return (
+            None if row is None else cache_key(self.primary_key, row[self.primary_key])
+        )
+
+    def _fetched(self, columns: Optional[List[str]]) -> Optional[List[str]]:
+        # Cached lookups also fetch the primary key, to file the row under it
+        if self.cache is None or columns is None or self.primary_key in columns:
+            return columns
+        return [self.primary_key, *columns]
+
+    def _cache_row(
+        self,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]],
+        row: Optional[Dict[str, Any]],
+        generation: Optional[int],
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        """
+        Caches the row found by a lookup and returns its record, narrowed to
+        `columns`.
+        """
+        entry = make_entry(row, self._fetched(columns))
+        if self.cache is not None:
+            self.cache.put(
+                cache_key(column, value), entry, self._owner(row), generation
+            )
+        return None if row is None else self._record(entry_row(entry, columns), columns)
+
+    def _record(
+        self, row: Dict[str, Any], columns: Optional[List[str]]
+    ) -> Union[T, Dict[str, Any]]:
+        # A projected row may lack required fields, so it is returned as-is
+        return self.model.model_validate(row) if columns is None else row
+
+    def _cached_one(self, column: str, value: Any, columns: Optional[List[str]]) -> Any:
+        """
+        Returns the cached record (or None) for a lookup, or MISSING.
+        """
+        if self.cache is None:
+            return MISSING
+        entry = self.cache.get(
+            cache_key(column, value), accept=lambda e: covers(e, columns)
+        )
+        if entry is MISSING:
+            return MISSING
+        row = entry_row(entry, columns)
+        return None if row is None else self._record(row, columns)
+
+    def _found_one(
+        self,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]],
+        response,
+        generation: Optional[int],
+    ) -> Optional[Union[T, Dict[str, Any]]]:
+        """
+        Caches and returns the record of a lookup response.
+        """
+        row = response.data[0] if response.data else None
+        return self._cache_row(column, value, columns, row, generation)
+
+    def _cached_exists(self, column: str, value: Any) -> Any:
+        """
+        Returns whether a cached lookup found a row, or MISSING.
+        """
+        if self.cache is None:
+            return MISSING
+        entry = self.cache.get(cache_key(column, value))
+        return entry if entry is MISSING else entry is not None
+
+    def _found_exists(
+        self, column: str, value: Any, response, generation: Optional[int]
+    ) -> bool:
+        row = response.data[0] if response.data else None
+        self._cache_row(column, value, [self.primary_key], row, generation)
+        return row is not None
+
+    def _neuron_lookup(
+        self, columns: Optional[List[str]], method: str
+    ) -> Optional[Tuple[str, Optional[List[str]]]]:
+        """
+        Returns the neuron360 ID column of the table and the projection to
+        fetch, which must include it, or None if the table has none.
+        """
+        id_column = neuron_id_column(self.table_name)
+        if id_column is None:
+            logger.error(f"{method} is not supported for table {self.table_name}")
+            return None
+        if columns is not None and id_column not in columns:
+            # The neuron360 ID is needed to key the result
+            columns = [id_column, *columns]
+        return id_column, columns
+
+    def _take_cached(
+        self,
+        column: str,
+        values: List[Any],
+        columns: Optional[List[str]],
+        found: Dict[Any, Union[T, Dict[str, Any]]],
+    ) -> List[Any]:
+        """
+        Moves the cached records for `values` into `found` and returns the
+        values that still need to be fetched.
+        """
+        uncached = []
+        for value in values:
+            record = self._cached_one(column, value, columns)
+            if record is MISSING:
+                uncached.append(value)
+            elif record is not None:
+                found[value] = record
+        return uncached
+
+    def _found_many(
+        self,
+        column: str,
+        values: List[Any],
+        columns: Optional[List[str]],
+        response,
+        generation: Optional[int],
+        found: Dict[Any, Union[T, Dict[str, Any]]],
+    ):
+        """
+        Caches the rows of an `in` lookup of `values`, including those not
+        found, and adds the records found to `found`.
+        """
+        rows = {row[column]: row for row in response.data or []}
+        for value in values:
+            record = self._cache_row(
+                column, value, columns, rows.get(value), generation
+            )
+            if record is not None:
+                found[value] = record
+
+    # Write results
+
+    def _written_one(
+        self, data: T, response, return_minimal: bool, action: str
+    ) -> Optional[T]:
+        """
+        Returns the record written by a single-row create or upsert.
+        """
+        if return_minimal:
+            logger.info(f"Successfully {action} record in {self.table_name}")
+            return data
+        if response.data:
+            logger.info(f"Successfully {action} record in {self.table_name}")
+            return self.model.model_validate(response.data[0])
+        logger.error(f"Failed to {action[:-1]} record in {self.table_name}")
+        return None
+
+    def _created_chunk(
+        self,
+        chunk: List[T],
+        response,
+        return_minimal: bool,
+        start: int,
+    ) -> Optional[List[T]]:
+        """
+        Returns the records created by a multi-row insert, aligned with the
+        chunk, or None if the response does not account for every row. With
+        `return_minimal`, the input models themselves are returned.
+        """
+        if return_minimal:
+            return list(chunk)
+        if not response.data or len(response.data) != len(chunk):
+            logger.error(
+                f"Failed to create rows {start}-{start + len(chunk) - 1} in "
+                f"{self.table_name}: expected {len(chunk)} rows, "
+                f"got {len(response.data or [])}"
+            )
+            return None
+        return [self.model.model_validate(row) for row in response.data]
+
+    def _upserted_chunk(
+        self,
+        chunk: List[Union[T, Dict[str, Any]]],
+        records: List[Dict[str, Any]],
+        response,
+        return_minimal: bool,
+    ) -> List[Optional[T]]:
+        """
+        Returns the records written by a multi-row upsert, aligned with the
+        chunk. Returned rows are matched back to the input by primary key,
+        since ignored duplicates leave gaps in the response.
+        """
+        if return_minimal:
+            return list(chunk)
+        returned = {str(row.get(self.primary_key)): row for row in response.data or []}
+        results: List[Optional[T]] = []
+        for record in records:
+            row = returned.get(str(record.get(self.primary_key)))
+            results.append(None if row is None else self.model.model_validate(row))
+        return results
@@ -0,0 +1,281 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.utils.logging import logger
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS_SECONDS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Path prefix of PostgREST requests, followed by the table name
+REST_PREFIX = "/rest/v1/"
+
+
+class OperationMetrics:
+    """
+    Request counts, failures, rows, bytes sent and a latency histogram for
+    one operation on one table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes_sent = 0
+        self.seconds = 0.0
+        # One count per bucket, plus one for slower requests
+        self.buckets = [0] * (len(LATENCY_BUCKETS_SECONDS) + 1)
+
+    def observe(self, seconds: float, rows: int = 0, error: bool = False):
+        """
+        Records one request.
+        """
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_SECONDS, seconds)
+        with self._lock:
+            self.count += 1
+            self.errors += error
+            self.rows += rows
+            self.seconds += seconds
+            self.buckets[bucket] += 1
+
+    def add_bytes(self, size: int):
+        """
+        Records the size of a request body.
+        """
+        with self._lock:
+            self.bytes_sent += size
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a latency quantile as the upper bound of the bucket it
+        falls in, or None if nothing was recorded.
+        """
+        with self._lock:
+            buckets = list(self.buckets)
+        total = sum(buckets)
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_SECONDS, buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the recorded values as a dict.
+        """
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        with self._lock:
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "rows": self.rows,
+                "bytes_sent": self.bytes_sent,
+                "seconds": self.seconds,
+                "mean_seconds": self.seconds / self.count if self.count else None,
+                "p50_seconds": p50,
+                "p99_seconds": p99,
+                "buckets": dict(
+                    zip([*LATENCY_BUCKETS_SECONDS, float("inf")], self.buckets)
+                ),
+            }
+
+
+class TrackedCall:
+    """
+    Times the block it wraps and records it as a request, failed if the
+    block raised. Set `rows` inside the block to count the rows it moved.
+    """
+
+    __slots__ = ("metrics", "rows", "_started")
+
+    def __init__(self, metrics: OperationMetrics, rows: int = 0):
+        self.metrics = metrics
+        self.rows = rows
+
+    def __enter__(self) -> "TrackedCall":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.observe(
+            time.perf_counter() - self._started, self.rows, exc_type is not None
+        )
+        return False
+
+
+_metrics: Dict[Tuple[str, str], OperationMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def get_operation_metrics(table_name: str, operation: str) -> OperationMetrics:
+    """
+    Returns the process-wide metrics of `operation` on `table_name`.
+    """
+    key = (table_name, operation)
+    metrics = _metrics.get(key)
+    if metrics is not None:
+        return metrics
+    with _metrics_lock:
+        metrics = _metrics.get(key)
+        if metrics is None:
+            metrics = _metrics[key] = OperationMetrics()
+        return metrics
+
+
+def track(table_name: str, operation: str, rows: int = 0) -> TrackedCall:
+    """
+    Returns a context manager recording one `operation` request on
+    `table_name`, e.g. `with track("people.emails", "insert", len(rows)):`.
+    """
+    return TrackedCall(get_operation_metrics(table_name, operation), rows)
+
+
+def request_operation(request: httpx.Request) -> Optional[Tuple[str, str]]:
+    """
+    Returns the table (or `schema.function` for rpc) and operation of a
+    PostgREST request, or None for other requests.
+    """
+    path = urlsplit(str(request.url)).path
+    if REST_PREFIX not in path:
+        return None
+    name = path.split(REST_PREFIX, 1)[1]
+    reading = request.method in ("GET", "HEAD")
+    schema = request.headers.get(
+        "Accept-Profile" if reading else "Content-Profile", "public"
+    )
+    if name.startswith("rpc/"):
+        return f"{schema}.{name[4:]}", "rpc"
+    if reading:
+        operation = "select"
+    elif request.method == "POST":
+        resolution = "resolution=" in request.headers.get("Prefer", "")
+        operation = "upsert" if resolution else "insert"
+    else:
+        operation = request.method.lower()
+    return f"{schema}.{name}", operation
+
+
+def record_request_bytes(request: httpx.Request):
+    """
+    An httpx request hook adding the size of PostgREST request bodies to
+    the bytes sent by their table and operation.
+    """
+    key = request_operation(request)
+    if key is None:
+        return
+    try:
+        size = len(request.content)
+    except httpx.RequestNotRead:
+        return  # Streamed bodies are not measured
+    get_operation_metrics(*key).add_bytes(size)
+
+
+async def record_request_bytes_async(request: httpx.Request):
+    """
+    The asyncio counterpart of record_request_bytes.
+    """
+    record_request_bytes(request)
+
+
+def metrics_snapshot() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Returns the metrics of every table and operation used, keyed by table
+    name and then operation.
+    """
+    with _metrics_lock:
+        items = sorted(_metrics.items())
+    snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (table_name, operation), metrics in items:
+        snapshot.setdefault(table_name, {})[operation] = metrics.snapshot()
+    return snapshot
+
+
+def _labels(table_name: str, operation: str, **extra: str) -> str:
+    # Table names and operations need no escaping
+    labels = {"table": table_name, "operation": operation, **extra}
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def prometheus_text(prefix: str = "goldilocks_service") -> str:
+    """
+    Returns the metrics in the Prometheus text exposition format.
+    """
+    snapshot = metrics_snapshot()
+    counters = [
+        ("requests_total", "count", "Requests sent."),
+        ("errors_total", "errors", "Requests that failed."),
+        ("rows_total", "rows", "Rows written, read or deleted."),
+        ("bytes_sent_total", "bytes_sent", "Bytes of request bodies sent."),
+    ]
+    lines: List[str] = []
+    for suffix, field, help_text in counters:
+        lines.append(f"# HELP {prefix}_{suffix} {help_text}")
+        lines.append(f"# TYPE {prefix}_{suffix} counter")
+        for table_name, operations in snapshot.items():
+            for operation, values in operations.items():
+                labels = _labels(table_name, operation)
+                lines.append(f"{prefix}_{suffix}{{{labels}}} {values[field]}")
+
+    name = f"{prefix}_request_duration_seconds"
+    lines.append(f"# HELP {name} Request latency.")
+    lines.append(f"# TYPE {name} histogram")
+    for table_name, operations in snapshot.items():
+        for operation, values in operations.items():
+            cumulative = 0
+            for bound, count in values["buckets"].items():
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _labels(table_name, operation, le=le)
+                lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+            labels = _labels(table_name, operation)
+            lines.append(f"{name}_sum{{{labels}}} {values['seconds']}")
+            lines.append(f"{name}_count{{{labels}}} {values['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def log_metrics_summary():
+    """
+    Logs one line per table and operation, the most time-consuming first.
+    """
+    rows = [
+        (table_name, operation, values)
+        for table_name, operations in metrics_snapshot().items()
+        for operation, values in operations.items()
+    ]
+    if not rows:
+        return
+    rows.sort(key=lambda row: row[2]["seconds"], reverse=True)
+    total_seconds = sum(values["seconds"] for _, _, values in rows) or 1
+    logger.info("Service calls by total time:")
+    for table_name, operation, values in rows:
+        p99 = values["p99_seconds"]
+        p99_text = "> 10s" if p99 == float("inf") else f"<= {p99 * 1000:.0f}ms"
+        logger.info(
+            f"  {table_name} {operation}: {values['count']} calls, "
+            f"{values['errors']} errors, {values['rows']} rows, "
+            f"{values['bytes_sent'] / 1024:.1f} KiB sent, "
+            f"{values['seconds']:.2f}s ({values['seconds'] / total_seconds:.0%}), "
+            f"mean {(values['mean_seconds'] or 0) * 1000:.1f}ms, "
+            f"p99 {p99_text}"
+        )
@@ -0,0 +1,369 @@
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from postgrest import APIResponse
+from postgrest.types import ReturnMethod
+
+from src.config.path_config import GOLDILOCKS_DATA_ROOT
+from src.services.service_core import neuron_id_column
+from src.utils.logging import logger
+
+DDL_DIR = os.path.join(GOLDILOCKS_DATA_ROOT, "sql", "table_creation_query")
+
+# Postgres column types and the SQLite types they are stored as. Lists and
+# JSON are stored as JSON text and booleans as 0/1, and decoded on read.
+_TYPE_SUBSTITUTIONS = [
+    (r"\bTIMESTAMP WITH TIME ZONE\b", "TEXT"),
+    (r"\bTIMESTAMP\b", "TEXT"),
+    (r"\bDATE\b", "TEXT"),
+    (r"\bUUID\b", "TEXT"),
+    (r"\bSERIAL\b", "TEXT"),
+    (r"\bTEXT\[\]", "TEXT"),
+    (r"\bJSONB?\b", "TEXT"),
+    (r"\bBOOLEAN\b", "INTEGER"),
+    (r"\bFLOAT\b", "REAL"),
+    (r"\s+DEFAULT gen_random_uuid\(\)", ""),
+    (r"\bUNLOGGED\s+", ""),
+]
+_JSON_TYPES = ("TEXT[]", "JSON", "JSONB")
+_CREATE_TABLE = re.compile(r"CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(\w+)\.(\w+)", re.I)
+_COLUMN = re.compile(r"^\s*(\w+)\s+(TEXT\[\]|JSONB|JSON|BOOLEAN)(?!\w)", re.M)
+_QUALIFIED_NAME = re.compile(r"\b(people|organisation|staging)\.(\w+)\b")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def translate_ddl(statement: str) -> str:
+    """
+    Rewrites a Postgres CREATE TABLE statement for SQLite. Schema-qualified
+    names become quoted "schema.table" names.
+    """
+    for pattern, replacement in _TYPE_SUBSTITUTIONS:
+        statement = re.sub(pattern, replacement, statement)
+    return _QUALIFIED_NAME.sub(lambda m: _quote(f"{m[1]}.{m[2]}"), statement)
+
+
+def table_statements(sql_text: str) -> List[str]:
+    """
+    Returns the CREATE TABLE statements of a DDL script. Functions, triggers,
+    indexes and grants have no SQLite equivalent and are left out.
+    """
+    # Drop comments and function bodies, which may contain semicolons
+    sql_text = re.sub(r"\$\$.*?\$\$", "", sql_text, flags=re.S)
+    sql_text = re.sub(r"--[^\n]*", "", sql_text)
+    return [
+        statement.strip()
+        for statement in sql_text.split(";")
+        if _CREATE_TABLE.search(statement)
+    ]
+
+
+class SQLiteDatabase:
+    """
+    An embedded SQLite database mirroring the tables created by the scripts
+    in sql/table_creation_query, for offline runs and tests.
+
+    Each Postgres table `schema.table` is a SQLite table of that quoted name.
+    Foreign keys are enforced and the Neuron360 IDs are unique, as in the
+    migrated Postgres schema, so write order and idempotency behave the
+    same. Statements are serialized on one connection shared by all threads.
+    """
+
+    def __init__(self, path: str = ":memory:", ddl_dir: str = DDL_DIR):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self.lock = threading.RLock()
+        # Columns decoded on read, per table: name -> "json" or "bool"
+        self.decoders: Dict[str, Dict[str, str]] = {}
+        self.primary_keys: Dict[str, List[str]] = {}
+        self._create_tables(ddl_dir)
+
+    def _create_tables(self, ddl_dir: str):
+        with self.lock, self.connection:
+            for ddl_path in sorted(glob.glob(os.path.join(ddl_dir, "*.sql"))):
+                with open(ddl_path, "r") as f:
+                    statements = table_statements(f.read())
+                for statement in statements:
+                    schema, table = _CREATE_TABLE.search(statement).groups()
+                    table_name = f"{schema}.{table}"
+                    self.decoders[table_name] = {
+                        column: "json" if pg_type in _JSON_TYPES else "bool"
+                        for column, pg_type in _COLUMN.findall(statement)
+                    }
+                    self.connection.execute(
+                        translate_ddl(statement).replace(
+                            "CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1
+                        )
+                    )
+                    column = neuron_id_column(table_name)
+                    if column is not None:
+                        self.connection.execute(
+                            f"CREATE UNIQUE INDEX IF NOT EXISTS "
+                            f"{_quote(f'uq_{schema}_{table}_{column}')} "
+                            f"ON {_quote(table_name)} ({_quote(column)})"
+                        )
+        logger.info(
+            f"SQLite database ready at {self.path} ({len(self.decoders)} tables)"
+        )
+
+    def primary_key(self, table_name: str) -> List[str]:
+        """
+        Returns the primary key columns of a table.
+        """
+        key = self.primary_keys.get(table_name)
+        if key is None:
+            rows = self.connection.execute(
+                f"PRAGMA table_info({_quote(table_name)})"
+            ).fetchall()
+            key = [
+                row["name"] for row in sorted(rows, key=lambda r: r["pk"]) if row["pk"]
+            ]
+            self.primary_keys[table_name] = key
+        return key
+
+    def decode(self, table_name: str, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Returns a stored row as PostgREST would, with lists, JSON and booleans
+        restored.
+        """
+        decoders = self.decoders.get(table_name, {})
+        record = dict(row)
+        for column, kind in decoders.items():
+            value = record.get(column)
+            if value is None:
+                continue
+            record[column] = json.loads(value) if kind == "json" else bool(value)
+        return record
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class SQLiteQuery:
+    """
+    The subset of the PostgREST query builder used by the services, run
+    against a SQLiteDatabase when `execute` is called.
+    """
+
+    def __init__(self, database: SQLiteDatabase, table_name: str):
+        self.database = database
+        self.table_name = table_name
+        self._action = "select"
+        self._columns = "*"
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._order: Optional[Tuple[str, bool]] = None
+        self._limit: Optional[int] = None
+        self._rows: List[Dict[str, Any]] = []
+        self._returning = ReturnMethod.representation
+        self._on_conflict: List[str] = []
+        self._ignore_duplicates = False
+
+    def select(self, *columns: str, **kwargs) -> "SQLiteQuery":
+        self._action = "select"
+        self._columns = ",".join(columns) or "*"
+        return self
+
+    def insert(
+        self,
+        json: Union[Dict[str, Any], List[Dict[str, Any]]],
+        returning: ReturnMethod = ReturnMethod.representation,
+        **kwargs,
+    ) -> "SQLiteQuery":
+        return self.upsert(json, returning=returning, _action="insert")
+
+    def upsert(
+        self,
+        json: Union[Dict[str, Any], List[Dict[str, Any]]],
+        returning: ReturnMethod = ReturnMethod.representation,
+        ignore_duplicates: bool = False,
+        on_conflict: str = "",
+        _action: str = "upsert",
+        **kwargs,
+    ) -> "SQLiteQuery":
+        self._action = _action
+        self._rows = json if isinstance(json, list) else [json]
+        self._returning = returning
+        self._ignore_duplicates = ignore_duplicates
+        self._on_conflict = [c.strip() for c in on_conflict.split(",") if c.strip()]
+        return self
+
+    def delete(self, returning: ReturnMethod = ReturnMethod.representation, **kwargs):
+        self._action = "delete"
+        self._returning = returning
+        return self
+
+    def eq(self, column: str, value: Any) -> "SQLiteQuery":
+        self._filters.append((column, "=", value))
+        return self
+
+    def gt(self, column: str, value: Any) -> "SQLiteQuery":
+        self._filters.append((column, ">", value))
+        return self
+
+    def in_(self, column: str, values: List[Any]) -> "SQLiteQuery":
+        self._filters.append((column, "IN", list(values)))
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs) -> "SQLiteQuery":
+        self._order = (column, desc)
+        return self
+
+    def limit(self, size: int, **kwargs) -> "SQLiteQuery":
+        self._limit = size
+        return self
+
+    def execute(self) -> APIResponse:
+        with self.database.lock, self.database.connection:
+            if self._action == "select":
+                data = self._select()
+            elif self._action == "delete":
+                data = self._delete()
+            else:
+                data = self._write()
+        if self._action != "select" and self._returning == ReturnMethod.minimal:
+            data = []
+        return APIResponse(data=data, count=None)
+
+    def _where(self) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column, operator, value in self._filters:
+            if operator == "IN":
+                if not value:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{_quote(column)} IN ({','.join('?' * len(value))})")
+                params.extend(_encode(item) for item in value)
+            else:
+                clauses.append(f"{_quote(column)} {operator} ?")
+                params.append(_encode(value))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _select(self) -> List[Dict[str, Any]]:
+        columns = (
+            "*"
+            if self._columns == "*"
+            else ",".join(_quote(c.strip()) for c in self._columns.split(","))
+        )
+        where, params = self._where()
+        statement = f"SELECT {columns} FROM {_quote(self.table_name)}{where}"
+        if self._order is not None:
+            column, desc = self._order
+            statement += f" ORDER BY {_quote(column)}{' DESC' if desc else ''}"
+        if self._limit is not None:
+            statement += f" LIMIT {int(self._limit)}"
+        rows = self.database.connection.execute(statement, params).fetchall()
+        return [self.database.decode(self.table_name, row) for row in rows]
+
+    def _delete(self) -> List[Dict[str, Any]]:
+        where, params = self._where()
+        rows = self.database.connection.execute(
+            f"DELETE FROM {_quote(self.table_name)}{where} RETURNING *", params
+        ).fetchall()
+        return [self.database.decode(self.table_name, row) for row in rows]
+
+    def _conflict_clause(self, columns: Tuple[str, ...]) -> str:
+        if self._action == "insert":
+            return ""
+        target = self._on_conflict or self.database.primary_key(self.table_name)
+        updates = [column for column in columns if column not in target]
+        if self._ignore_duplicates or not updates:
+            return " ON CONFLICT DO NOTHING"
+        return (
+            f" ON CONFLICT ({','.join(map(_quote, target))}) DO UPDATE SET "
+            + ",".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in updates)
+        )
+
+    def _write(self) -> List[Dict[str, Any]]:
+        returned = []
+        for row in self._rows:
+            columns = tuple(row)
+            statement = (
+                f"INSERT INTO {_quote(self.table_name)} "
+                f"({','.join(map(_quote, columns))}) "
+                f"VALUES ({','.join('?' * len(columns))})"
+                f"{self._conflict_clause(columns)} RETURNING *"
+            )
+            returned.extend(
+                self.database.connection.execute(
+                    statement, [_encode(row[column]) for column in columns]
+                ).fetchall()
+            )
+        return [self.database.decode(self.table_name, row) for row in returned]
+
+
+class _AsyncSQLiteQuery(SQLiteQuery):
+    async def execute(self) -> APIResponse:
+        return super().execute()
+
+
+class SQLiteClient:
+    """
+    A client for one schema of a SQLiteDatabase, standing in for a Supabase
+    client. Database functions are not available.
+    """
+
+    _query_class = SQLiteQuery
+
+    def __init__(self, database: SQLiteDatabase, schema: str):
+        self.database = database
+        self.schema = schema
+
+    def table(self, table_name: str) -> SQLiteQuery:
+        return self._query_class(self.database, f"{self.schema}.{table_name}")
+
+    def rpc(self, function_name: str, params: Dict[str, Any]):
+        raise NotImplementedError(
+            f"Database function {self.schema}.{function_name} is not available "
+            "with the SQLite storage backend"
+        )
+
+
+class AsyncSQLiteClient(SQLiteClient):
+    """
+    The asyncio counterpart of SQLiteClient. Queries run synchronously
+    when awaited.
+    """
+
+    _query_class = _AsyncSQLiteQuery
+
+
+class SQLiteBackend:
+    """
+    A storage backend keeping every schema in one embedded SQLite database.
+    Only tables are mirrored, not the database functions.
+    """
+
+    supports_rpc = False
+
+    def __init__(self, path: str = ":memory:", ddl_dir: str = DDL_DIR):
+        self.database = SQLiteDatabase(path, ddl_dir)
+
+    def get_client(self, schema: str) -> SQLiteClient:
+        return SQLiteClient(self.database, schema)
+
+    def get_async_client(self, schema: str) -> AsyncSQLiteClient:
+        return AsyncSQLiteClient(self.database, schema)
+
+    def close(self):
+        self.database.close()
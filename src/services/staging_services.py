@@ -0,0 +1,29 @@
+import uuid
+from typing import Dict, List, Optional
+from src.services.base_service import BaseService
+from src.services.schema import TABLE_WRITE_ORDER
+from src.models import staging as staging_models
+
+# Postgres function moving a batch of staged rows into the people and
+# organisation schemas, see
+# sql/functions/create_staging_schema_merge_batch_function.sql
+MERGE_BATCH_FUNCTION = "merge_batch"
+
+
+class StagedRowService(BaseService):
+    def __init__(self):
+        super().__init__(table_name="staging.rows", model=staging_models.StagedRow)
+
+    def merge_batch(
+        self, batch_id: uuid.UUID, tables: List[str] = TABLE_WRITE_ORDER
+    ) -> Optional[Dict[str, int]]:
+        """
+        Merges a staged batch into `tables`, parents first, and returns the
+        number of rows inserted per table, or None if the merge failed.
+        """
+        result = self.rpc(
+            MERGE_BATCH_FUNCTION, {"p_batch_id": str(batch_id), "p_tables": tables}
+        )
+        if result is None:
+            return None
+        return {row["target_table"]: row["merged_rows"] for row in result}
@@ -0,0 +1,172 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from src.services.base_service import BaseService, serialize_model
+from src.utils.config import config
+from src.utils.logging import logger
+
+# Tells a writer thread to send what it holds and stop.
+_STOP = object()
+
+
+class WriteCoalescer:
+    """
+    Funnels the records written by many producer threads into a few large
+    statements.
+
+    Producers only enqueue records with `submit`. Each table gets one writer
+    thread, started on first use, which takes up to `max_batch_rows` queued
+    records, waiting at most `max_wait_seconds` for more to arrive after the
+    first, and sends them as a single idempotent multi-row upsert. Database
+    concurrency is therefore bounded by the number of tables, however many
+    producer threads there are.
+
+    Each submitted record gets a Future resolved to True once its batch is
+    stored, or False if it could not be. When a batch fails, the records of
+    each producer thread in it are resent on their own, so a rejected row
+    only fails the records of the producer that submitted it. Writers of
+    different tables run independently, so a producer must wait for a
+    parent row's Future before submitting rows that reference it.
+    """
+
+    def __init__(
+        self,
+        max_batch_rows: int = config.WRITE_COALESCER_MAX_BATCH_ROWS,
+        max_wait_seconds: float = config.WRITE_COALESCER_MAX_WAIT_SECONDS,
+    ):
+        if max_batch_rows < 1:
+            raise ValueError("max_batch_rows must be a positive integer")
+        self.max_batch_rows = max_batch_rows
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._queues: Dict[str, queue.Queue] = {}
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self.batches_sent = 0
+        self.rows_sent = 0
+
+    def submit(self, service: BaseService, model: BaseModel) -> Future:
+        """
+        Queues a record for `service`'s table and returns its Future.
+        """
+        future: Future = Future()
+        row = serialize_model(model)
+        producer = threading.get_ident()
+        self._queue_for(service).put((service, row, future, producer))
+        return future
+
+    def close(self):
+        """
+        Sends every queued record and stops the writer threads.
+        """
+        with self._lock:
+            self._closed = True
+            queues = list(self._queues.values())
+            threads = list(self._threads)
+        for writer_queue in queues:
+            writer_queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+        logger.info(
+            f"Write coalescer sent {self.rows_sent} rows in "
+            f"{self.batches_sent} statements"
+        )
+
+    def __enter__(self) -> "WriteCoalescer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _queue_for(self, service: BaseService) -> queue.Queue:
+        writer_queue = self._queues.get(service.table_name)
+        if writer_queue is not None:
+            return writer_queue
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WriteCoalescer is closed")
+            writer_queue = self._queues.get(service.table_name)
+            if writer_queue is None:
+                writer_queue = queue.Queue()
+                thread = threading.Thread(
+                    target=self._run,
+                    args=(writer_queue,),
+                    name=f"writer-{service.table_name}",
+                    daemon=True,
+                )
+                self._queues[service.table_name] = writer_queue
+                self._threads.append(thread)
+                thread.start()
+            return writer_queue
+
+    def _run(self, writer_queue: queue.Queue):
+        stopping = False
+        while not stopping:
+            item = writer_queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait_seconds
+            while len(batch) < self.max_batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = writer_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._write(batch)
+            except Exception as e:
+                # The writer must outlive any batch, or its producers would
+                # wait on their futures forever
+                logger.error(f"Error writing batch: {e}", exc_info=True)
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_result(False)
+
+    def _write(self, batch: List[Tuple[BaseService, dict, Future, int]]):
+        service = batch[0][0]
+        results = self._upsert(service, [row for _, row, _, _ in batch])
+
+        retry: Dict[int, List[int]] = {}
+        for position, result in enumerate(results):
+            if result is None:
+                retry.setdefault(batch[position][3], []).append(position)
+        # Resending the rows of a lone producer would fail them again
+        if len(retry) > 1:
+            for positions in retry.values():
+                rows = [batch[position][1] for position in positions]
+                for position, result in zip(positions, self._upsert(service, rows)):
+                    results[position] = result
+
+        for (_, _, future, _), result in zip(batch, results):
+            future.set_result(result is not None)
+
+    def _upsert(self, service: BaseService, rows: List[dict]) -> List[Any]:
+        """
+        Sends rows as one statement, returning None for each row not stored.
+        """
+        try:
+            results = service.upsert_many(
+                rows,
+                ignore_duplicates=True,
+                chunk_size=self.max_batch_rows,
+                return_minimal=True,
+            )
+        except Exception as e:
+            logger.error(f"Error writing batch to {service.table_name}: {e}")
+            results = [None] * len(rows)
+        with self._lock:
+            self.batches_sent += 1
+            self.rows_sent += len(rows)
+        return list(results)
@@ -0,0 +1,218 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+from postgrest.exceptions import APIError
+
+from src.utils.config import config
+from src.utils.logging import logger
+
+R = TypeVar("R")
+
+# HTTP statuses worth retrying: timeouts, rate limiting and gateway errors.
+# Non-JSON error bodies (e.g. from a proxy) surface as an APIError whose code
+# is the status.
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# PostgREST connection errors: database unreachable, pool timeout, etc.
+TRANSIENT_POSTGREST_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+
+# Postgres SQLSTATEs of failures that a retry can succeed past: connection
+# exceptions, serialization failure, deadlock, lock timeout, statement
+# timeout, too many connections, out of resources and server shutdown.
+TRANSIENT_SQLSTATES = {"40001", "40P01", "55P03", "57014", "57P01", "57P02", "57P03"}
+TRANSIENT_SQLSTATE_CLASSES = ("08", "53")
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Tells whether a failed request may succeed if sent again.
+
+    Network failures, timeouts and server-side overload are transient;
+    constraint violations, bad requests and other client errors are not.
+    """
+    if isinstance(error, httpx.TransportError):
+        # Covers timeouts, connection failures and dropped connections, but
+        # not malformed requests, which fail the same way every time
+        return not isinstance(
+            error, (httpx.UnsupportedProtocol, httpx.LocalProtocolError)
+        )
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        if code.isdigit() and int(code) in TRANSIENT_STATUSES:
+            return True
+        return (
+            code in TRANSIENT_POSTGREST_CODES
+            or code in TRANSIENT_SQLSTATES
+            or code.startswith(TRANSIENT_SQLSTATE_CLASSES)
+        )
+    return False
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of requests, so a failing database sees at
+    most `ratio` extra load instead of every caller retrying at once.
+
+    Each request deposits `ratio` of a retry and each retry withdraws one.
+    The balance starts at, and never exceeds, `reserve`, which allows short
+    bursts of failures to be retried in full after a quiet period.
+    """
+
+    def __init__(self, ratio: float, reserve: float):
+        if ratio < 0 or reserve < 0:
+            raise ValueError("ratio and reserve must not be negative")
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = reserve
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self):
+        """
+        Records a request.
+        """
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Takes one retry from the budget, returning False if none is left.
+        """
+        with self._lock:
+            if self._balance < 1:
+                self.exhausted += 1
+                return False
+            self._balance -= 1
+            self.retries += 1
+            return True
+
+
+class WriteRetrier:
+    """
+    Sends a write, retrying transient failures with exponential backoff and
+    full jitter (a random delay of up to base * 2^attempt, capped at
+    `max_delay`) while the table's RetryBudget allows.
+
+    The write is given the attempt number, so that a retry can be sent in an
+    idempotent form. Writes that are not idempotent are never retried, as
+    their first attempt may have been stored before the failure was seen.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        max_attempts: int = config.SUPABASE_WRITE_MAX_ATTEMPTS,
+        base_delay_seconds: float = config.SUPABASE_WRITE_RETRY_BASE_DELAY_SECONDS,
+        max_delay_seconds: float = config.SUPABASE_WRITE_RETRY_MAX_DELAY_SECONDS,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+        self.table_name = table_name
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.budget = budget or RetryBudget(
+            config.SUPABASE_WRITE_RETRY_BUDGET_RATIO,
+            config.SUPABASE_WRITE_RETRY_BUDGET_RESERVE,
+        )
+        self._sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the delay before retry number `attempt` (from 1).
+        """
+        ceiling = min(
+            self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)
+        )
+        return random.uniform(0, ceiling)
+
+    def _retry_delay(
+        self, error: Exception, attempt: int, idempotent: bool
+    ) -> Optional[float]:
+        # The delay before the next attempt, or None to give up
+        if (
+            not idempotent
+            or attempt + 1 >= self.max_attempts
+            or not is_transient(error)
+            or not self.budget.withdraw()
+        ):
+            return None
+        delay = self.backoff(attempt + 1)
+        logger.warning(
+            f"Retrying write to {self.table_name} in {delay:.2f}s "
+            f"(attempt {attempt + 2}/{self.max_attempts}): {error}"
+        )
+        return delay
+
+    def run(self, send: Callable[[int], R], idempotent: bool = True) -> R:
+        """
+        Calls `send(attempt)` until it succeeds or fails for good, in which
+        case the last error is raised.
+        """
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return send(attempt)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+            self._sleep(delay)
+            attempt += 1
+
+    async def run_async(
+        self, send: Callable[[int], Awaitable[R]], idempotent: bool = True
+    ) -> R:
+        """
+        The asyncio counterpart of `run`.
+        """
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return await send(attempt)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+_retriers: Dict[str, WriteRetrier] = {}
+_retriers_lock = threading.Lock()
+
+
+def get_write_retrier(table_name: str) -> WriteRetrier:
+    """
+    Returns the process-wide write retrier for `table_name`, so that every
+    service instance of a table draws on the same retry budget.
+    """
+    with _retriers_lock:
+        retrier = _retriers.get(table_name)
+        if retrier is None:
+            retrier = _retriers[table_name] = WriteRetrier(table_name)
+        return retrier
+
+
+def write_retry_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the retries made and refused by each table's budget.
+    """
+    with _retriers_lock:
+        retriers = dict(_retriers)
+    return {
+        table_name: {
+            "retries": retrier.budget.retries,
+            "budget_exhausted": retrier.budget.exhausted,
+        }
+        for table_name, retrier in retriers.items()
+    }
@@ -0,0 +1,9 @@
+from .field_mapping import FieldSpec, compile_mapping
+from .profile_transformer import (
+    OrganisationBundle,
+    ProfileBundle,
+    ProfileTransformer,
+    Row,
+    TransformError,
+    transform_records,
+)
@@ -0,0 +1,116 @@
+import operator
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+# Stands in for a missing or null nested object, so its fields read as None
+_EMPTY: Dict[str, Any] = MappingProxyType({})
+
+Extractor = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    Where one column of a model comes from in a Neuron360 object: a dotted
+    `path` of keys (the column name by default), an optional `converter`
+    applied to values that are present, and a `default` for those that are
+    missing or null.
+    """
+
+    column: str
+    path: Optional[str] = None
+    converter: Optional[Callable[[Any], Any]] = None
+    default: Any = None
+
+
+def _compile_level(
+    specs: List[Tuple[str, Tuple[str, ...]]],
+) -> Callable[[Any, Dict[str, Any]], None]:
+    """
+    Compiles the fields read at one level of nesting into a function adding
+    them to a dict of values. Fields at this level are read with a single
+    itemgetter, falling back to dict.get when a key is missing; nested
+    objects are looked up once for all of their fields, and those holding a
+    single field are read in place rather than by a nested function.
+    """
+    columns = tuple(column for column, keys in specs if len(keys) == 1)
+    keys = tuple(keys[0] for _, keys in specs if len(keys) == 1)
+    nested: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+    for column, path in specs:
+        if len(path) > 1:
+            nested.setdefault(path[0], []).append((column, path[1:]))
+    # (key, column, nested key) of nested objects read for one field only
+    pairs = tuple(
+        (key, child[0][0], child[0][1][0])
+        for key, child in nested.items()
+        if len(child) == 1 and len(child[0][1]) == 1
+    )
+    children = tuple(
+        (key, _compile_level(child))
+        for key, child in nested.items()
+        if len(child) > 1 or len(child[0][1]) > 1
+    )
+    getter = operator.itemgetter(*keys) if len(keys) > 1 else None
+
+    def read(data: Any, values: Dict[str, Any]):
+        if getter is not None:
+            try:
+                values.update(zip(columns, getter(data)))
+            except KeyError:
+                values.update(zip(columns, map(data.get, keys)))
+        elif keys:
+            values[columns[0]] = data.get(keys[0])
+        for key, column, child_key in pairs:
+            values[column] = (data.get(key) or _EMPTY).get(child_key)
+        for key, child in children:
+            child(data.get(key) or _EMPTY, values)
+
+    return read
+
+
+def compile_mapping(
+    model: Type[BaseModel], specs: Sequence[FieldSpec], omit_none: bool = False
+) -> Extractor:
+    """
+    Compiles the field specs of a model into a function returning the
+    values of those columns read from a source object, to be passed to the
+    model as keyword arguments. With `omit_none`, columns without a value
+    are left out, so the model's own defaults apply.
+
+    Paths are split and grouped once, here, rather than on every record.
+    Columns that are not fields of `model` raise a ValueError. The specs are
+    kept on the function as `specs`.
+    """
+    unknown = [spec.column for spec in specs if spec.column not in model.model_fields]
+    if unknown:
+        raise ValueError(f"{model.__name__} has no fields {', '.join(unknown)}")
+
+    read = _compile_level(
+        [(spec.column, tuple((spec.path or spec.column).split("."))) for spec in specs]
+    )
+    post = tuple(
+        (spec.column, spec.converter, spec.default)
+        for spec in specs
+        if spec.converter is not None or spec.default is not None
+    )
+
+    def extract(data: Dict[str, Any]) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        read(data, values)
+        for column, convert, default in post:
+            value = values[column]
+            if value is None:
+                values[column] = default
+            elif convert is not None:
+                values[column] = convert(value)
+        if omit_none:
+            return {
+                column: value for column, value in values.items() if value is not None
+            }
+        return values
+
+    extract.specs = tuple(specs)
+    return extract
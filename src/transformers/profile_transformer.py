@@ -0,0 +1,634 @@
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+import uuid
+
+from pydantic import BaseModel
+
+from src.models import organisation as org_models
+from src.models import people as people_models
+from src.transformers.field_mapping import FieldSpec, compile_mapping
+from src.utils.identifiers import stable_id
+
+# A record paired with the name of the table it is stored in
+Row = Tuple[str, BaseModel]
+
+
+def _to_date(value: Any) -> Optional[date]:
+    """
+    Safely converts a date string (in various formats) to a date object.
+    """
+    if (
+        isinstance(value, str)
+        and value[4:5] == value[7:8] == "-"
+        and value[10:11] in ("", " ")
+    ):
+        # Neuron360 dates are "YYYY-MM-DD 00:00:00", which needs no strptime
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(str(value).split(" ")[0], "%Y-%m-%d").date()
+    except (ValueError, AttributeError):
+        return None
+
+
+# How the columns of each model are read from Neuron360 objects. The specs
+# are compiled once, at import; see field_mapping.FieldSpec.
+PEOPLE_IDENTITY = compile_mapping(
+    people_models.Identity,
+    [
+        FieldSpec("neuron360_profile_id", "profile_id"),
+        FieldSpec("first_name", "profile_first_name"),
+        FieldSpec("last_name", "profile_last_name"),
+        FieldSpec("full_name", "profile_full_name"),
+        FieldSpec("picture_url", "profile_picture.url"),
+        FieldSpec("last_modified_date", "profile_last_modified_date"),
+        FieldSpec("last_seen_date", "profile_last_seen_date"),
+    ],
+)
+
+PROFILE = compile_mapping(
+    people_models.Profile,
+    [
+        FieldSpec("summary", "profile_summary"),
+        FieldSpec("languages", "profile_languages"),
+        FieldSpec("expertises", "profile_expertises"),
+        FieldSpec("tags", "profile_tags"),
+        FieldSpec("prior_industries", "profile_prior_industries"),
+        FieldSpec("raw_location"),
+        FieldSpec("headline", "profile_headline"),
+    ],
+)
+
+GENDER = compile_mapping(
+    people_models.Gender, [FieldSpec("gender"), FieldSpec("confidence_score")]
+)
+
+STATUS = compile_mapping(people_models.Status, [FieldSpec("status")])
+
+EXPERIENCE = compile_mapping(
+    people_models.Experience,
+    [
+        FieldSpec("job_title"),
+        FieldSpec("start_date", converter=_to_date),
+        FieldSpec("end_date", converter=_to_date),
+        FieldSpec("summary"),
+        FieldSpec("current"),
+        FieldSpec("priority"),
+        FieldSpec("raw_location"),
+    ],
+)
+
+# Only the titles that are given are set, and none at all when none is
+JOB_TITLE_DETAIL = compile_mapping(
+    people_models.JobTitleDetail,
+    [
+        FieldSpec("raw_job_title", "raw_job_title.job_title"),
+        FieldSpec("raw_job_title_language_code", "raw_job_title.language_code"),
+        FieldSpec(
+            "raw_job_title_language_detection_confidence_score",
+            "raw_job_title.language_detection_confidence_score",
+        ),
+        FieldSpec("raw_translated_job_title", "raw_translated_job_title.job_title"),
+        FieldSpec(
+            "raw_translated_job_title_language_code",
+            "raw_translated_job_title.language_code",
+        ),
+        FieldSpec("normalized_job_title_id", "normalized_job_title.id"),
+        FieldSpec("normalized_job_title", "normalized_job_title.job_title"),
+    ],
+    omit_none=True,
+)
+
+# The three levels of a job function are flattened into one row
+JOB_FUNCTION = compile_mapping(
+    people_models.JobFunction,
+    [
+        FieldSpec("priority"),
+        *(
+            FieldSpec(f"level{level}_{field}", f"level{level}.{field}")
+            for level in (1, 2, 3)
+            for field in ("code", "name", "confidence_score")
+        ),
+    ],
+)
+
+_WEB_ADDRESS = [
+    FieldSpec("web_address_url", "web_address.url"),
+    FieldSpec("web_address_rank", "web_address.rank"),
+]
+
+# (resume key, table, model, extractor) of each kind of resume item
+RESUME_ITEMS = [
+    (
+        "educations",
+        "people.educations",
+        people_models.Education,
+        compile_mapping(
+            people_models.Education,
+            [
+                FieldSpec("educational_establishment"),
+                FieldSpec("diploma"),
+                FieldSpec("specialization"),
+                FieldSpec("start_date", converter=_to_date),
+                FieldSpec("end_date", converter=_to_date),
+                FieldSpec("priority"),
+                FieldSpec(
+                    "web_address_url", "educational_establishment_web_address.url"
+                ),
+                FieldSpec(
+                    "web_address_rank", "educational_establishment_web_address.rank"
+                ),
+            ],
+        ),
+    ),
+    (
+        "certifications",
+        "people.certifications",
+        people_models.Certification,
+        compile_mapping(
+            people_models.Certification,
+            [
+                FieldSpec("name"),
+                FieldSpec("start_date"),
+                FieldSpec("end_date"),
+                FieldSpec("authority"),
+                *_WEB_ADDRESS,
+            ],
+        ),
+    ),
+    (
+        "memberships",
+        "people.memberships",
+        people_models.Membership,
+        compile_mapping(
+            people_models.Membership,
+            [
+                FieldSpec("title"),
+                FieldSpec("description"),
+                FieldSpec("reference"),
+                FieldSpec("name"),
+                FieldSpec("start_date"),
+                FieldSpec("end_date"),
+                FieldSpec("location"),
+                FieldSpec("priority"),
+                *_WEB_ADDRESS,
+            ],
+        ),
+    ),
+    (
+        "publications",
+        "people.publications",
+        people_models.Publication,
+        compile_mapping(
+            people_models.Publication,
+            [
+                FieldSpec("name"),
+                FieldSpec("date"),
+                FieldSpec("description"),
+                *_WEB_ADDRESS,
+            ],
+        ),
+    ),
+    (
+        "patents",
+        "people.patents",
+        people_models.Patent,
+        compile_mapping(
+            people_models.Patent,
+            [
+                FieldSpec("name"),
+                FieldSpec("issue"),
+                FieldSpec("number"),
+                FieldSpec("start_date", converter=_to_date),
+                FieldSpec("end_date", converter=_to_date),
+                FieldSpec("priority"),
+                *_WEB_ADDRESS,
+            ],
+        ),
+    ),
+    (
+        "awards",
+        "people.awards",
+        people_models.Award,
+        compile_mapping(
+            people_models.Award,
+            [
+                FieldSpec("name"),
+                FieldSpec("description"),
+                FieldSpec("issue"),
+                FieldSpec("date"),
+                FieldSpec("priority"),
+            ],
+        ),
+    ),
+]
+
+ORGANISATION_IDENTITY = compile_mapping(
+    org_models.Identity,
+    [
+        FieldSpec("neuron360_company_id", "company_id"),
+        FieldSpec("name", "company_name"),
+        FieldSpec("domain", "company_domain"),
+        FieldSpec("logo_url", "company_logo_url"),
+        FieldSpec("industry", "company_industry"),
+    ],
+)
+
+# company_social_links holds one {"url": ...} object per network
+ORGANISATION_SOCIAL_LINK = compile_mapping(
+    org_models.SocialLink,
+    [
+        FieldSpec(f"{network}_url", f"{network}.url")
+        for network in (
+            "linkedin",
+            "twitter",
+            "facebook",
+            "instagram",
+            "youtube",
+            "crunchbase",
+            "yelp",
+        )
+    ],
+)
+
+# Industry codes are numbers in the source but text in the tables
+_INDUSTRY = [
+    FieldSpec("industry_id", "id"),
+    *(FieldSpec(f"code{level}", converter=str) for level in range(2, 7)),
+    *(FieldSpec(f"name{level}") for level in range(2, 7)),
+    FieldSpec("standard"),
+    FieldSpec("activity_priority"),
+    FieldSpec("priority"),
+]
+INDUSTRY = compile_mapping(org_models.Industry, _INDUSTRY)
+OFFICE_INDUSTRY = compile_mapping(org_models.OfficeIndustry, _INDUSTRY)
+
+OFFICE = compile_mapping(
+    org_models.Office, [FieldSpec("neuron360_office_id", "office_id")], omit_none=True
+)
+
+
+def _keyed(parent_id: Any, rows: List[Row]) -> List[Row]:
+    """
+    Gives leaf records keys derived from their parent's key, their table
+    and their position among the parent's records in that table.
+    """
+    positions: Dict[str, int] = {}
+    for table_name, model in rows:
+        position = positions.get(table_name, 0)
+        positions[table_name] = position + 1
+        model.id = stable_id(parent_id, table_name, position)
+    return rows
+
+
+class TransformError(Exception):
+    """
+    A record that could not be turned into rows. It only carries a message,
+    so it can be sent back from a worker process.
+    """
+
+
+@dataclass
+class OrganisationBundle:
+    """
+    The rows of a company named by an experience: its identity and details
+    and, if the experience names an office, the office and its details.
+    """
+
+    neuron360_company_id: str
+    rows: List[Row]
+    office: Optional[org_models.Office] = None
+    office_rows: List[Row] = field(default_factory=list)
+
+    def office_rows_for(self, office_id: Any) -> List[Row]:
+        """
+        Returns the office details, keyed under `office_id` if the office
+        is already stored under another key than the one built.
+        """
+        if self.office is None or office_id == self.office.office_id:
+            return self.office_rows
+        rows = []
+        for table_name, model in self.office_rows:
+            update = (
+                {"office_id": office_id}
+                if "office_id" in type(model).model_fields
+                else {}
+            )
+            rows.append((table_name, model.model_copy(update=update)))
+        return _keyed(office_id, rows)
+
+
+@dataclass
+class ProfileBundle:
+    """
+    Every row built from one Neuron360 record. `rows` holds the person's
+    records, the identity first and each parent before its children;
+    `organisations` the companies of their experiences, each once.
+    """
+
+    neuron360_profile_id: Optional[str]
+    people_id: uuid.UUID
+    rows: List[Row]
+    organisations: List[OrganisationBundle]
+
+    def all_rows(self) -> List[Row]:
+        """
+        Returns the person's rows followed by those of every company, as
+        written when none of them exists yet.
+        """
+        rows = list(self.rows)
+        for organisation in self.organisations:
+            rows.extend(organisation.rows)
+            if organisation.office is not None:
+                rows.append(("organisation.offices", organisation.office))
+                rows.extend(organisation.office_rows)
+        return rows
+
+
+class ProfileTransformer:
+    """
+    Turns Neuron360 records into the rows of the people and organisation
+    tables, without any I/O: it neither looks anything up nor writes, so
+    the same record always yields the same rows, with the same keys.
+
+    Which rows are actually written (e.g. not those of companies that
+    already exist) is left to the managers. Records can be transformed in
+    worker processes with transform_records.
+    """
+
+    def transform(self, record: Dict[str, Any]) -> Optional[ProfileBundle]:
+        """
+        Returns the rows of a `results[]` record, or None if it has no
+        profile data.
+        """
+        profile_data = record.get("profile_data", {})
+        if not profile_data:
+            return None
+        return self.transform_profile(profile_data, record.get("resume_data", {}) or {})
+
+    def transform_profile(
+        self, profile_data: Dict[str, Any], resume_data: Dict[str, Any]
+    ) -> ProfileBundle:
+        """
+        Returns the rows of a person, given their profile and resume data.
+        """
+        identity = self.build_identity(profile_data)
+        people_id = identity.people_id
+        rows: List[Row] = [
+            ("people.identities", identity),
+            ("people.profiles", self.build_profile(profile_data, people_id)),
+        ]
+        rows.extend(self.build_profile_children(profile_data, people_id))
+
+        organisations = []
+        company_ids: Set[str] = set()
+        for position, exp_data in enumerate(resume_data.get("experiences", [])):
+            company_id = exp_data.get("company_id")
+            if company_id and company_id not in company_ids:
+                company_ids.add(company_id)
+                organisations.append(self.build_organisation(exp_data))
+            experience = self.build_experience(exp_data, people_id, position)
+            rows.append(("people.experiences", experience))
+            rows.extend(self.build_experience_children(exp_data, experience.id))
+
+        rows.extend(self.build_resume_items(resume_data, people_id))
+        return ProfileBundle(
+            neuron360_profile_id=identity.neuron360_profile_id,
+            people_id=people_id,
+            rows=rows,
+            organisations=organisations,
+        )
+
+    def build_organisation(self, exp_data: Dict[str, Any]) -> OrganisationBundle:
+        """
+        Returns the rows of the company (and office) of an experience.
+        """
+        identity = self.build_organisation_identity(exp_data)
+        org_id = identity.organisation_id
+        bundle = OrganisationBundle(
+            neuron360_company_id=identity.neuron360_company_id,
+            rows=[("organisation.identities", identity)],
+        )
+        bundle.rows.extend(self.build_organisation_details(exp_data, org_id))
+        if exp_data.get("office_id"):
+            bundle.office = self.build_office(exp_data, org_id)
+            bundle.office_rows = self.build_office_details(
+                exp_data, org_id, bundle.office.office_id
+            )
+        return bundle
+
+    def build_identity(self, profile_data: Dict[str, Any]) -> people_models.Identity:
+        identity = people_models.Identity(**PEOPLE_IDENTITY(profile_data))
+        if identity.neuron360_profile_id:
+            # The same profile always maps to the same person key
+            identity.people_id = stable_id(
+                "people.identities", identity.neuron360_profile_id
+            )
+        return identity
+
+    def build_profile(
+        self, data: Dict[str, Any], people_id: Any
+    ) -> people_models.Profile:
+        return people_models.Profile(people_id=people_id, **PROFILE(data))
+
+    def build_profile_children(self, data: Dict[str, Any], people_id: Any) -> List[Row]:
+        """
+        Builds the records hanging off the profile, paired with their tables.
+        """
+        rows = []
+        if data.get("profile_gender"):
+            gender = people_models.Gender(
+                people_id=people_id, **GENDER(data["profile_gender"])
+            )
+            rows.append(("people.genders", gender))
+
+        if data.get("profile_social_links"):
+            for link in data["profile_social_links"]:
+                s_link = people_models.SocialLink(people_id=people_id, **link)
+                rows.append(("people.social_links", s_link))
+
+        if data.get("profile_status"):
+            status = people_models.Status(
+                people_id=people_id, **STATUS(data["profile_status"])
+            )
+            rows.append(("people.statuses", status))
+
+        if data.get("profile_emails"):
+            for email_data in data["profile_emails"]:
+                em = people_models.Email(people_id=people_id, **email_data)
+                rows.append(("people.emails", em))
+
+        if data.get("profile_phones"):
+            for phone_data in data["profile_phones"]:
+                ph = people_models.Phone(people_id=people_id, **phone_data)
+                rows.append(("people.phones", ph))
+
+        if data.get("profile_address"):
+            address = people_models.Address(
+                people_id=people_id, **data["profile_address"]
+            )
+            rows.append(("people.addresses", address))
+
+        return _keyed(people_id, rows)
+
+    def build_experience(
+        self, exp_data: Dict[str, Any], people_id: Any, position: int
+    ) -> people_models.Experience:
+        return people_models.Experience(
+            id=stable_id(people_id, "people.experiences", position),
+            people_id=people_id,
+            **EXPERIENCE(exp_data),
+        )
+
+    def build_experience_children(
+        self, exp_data: Dict[str, Any], exp_id: Any
+    ) -> List[Row]:
+        """
+        Builds the job title, function and seniority records of an experience.
+        """
+        rows = []
+        if exp_data.get("job_title_details"):
+            job_title_details = JOB_TITLE_DETAIL(exp_data["job_title_details"])
+            if job_title_details:
+                jtd = people_models.JobTitleDetail(
+                    experience_id=exp_id, **job_title_details
+                )
+                rows.append(("people.job_title_details", jtd))
+
+        for jf_data in exp_data.get("job_functions", []):
+            jf = people_models.JobFunction(
+                experience_id=exp_id, **JOB_FUNCTION(jf_data)
+            )
+            rows.append(("people.job_functions", jf))
+
+        job_seniority_data = exp_data.get("job_seniority")
+        if job_seniority_data:
+            js = people_models.JobSeniority(experience_id=exp_id, **job_seniority_data)
+            rows.append(("people.job_seniority", js))
+
+        return _keyed(exp_id, rows)
+
+    def build_resume_items(
+        self, resume_data: Dict[str, Any], people_id: Any
+    ) -> List[Row]:
+        """
+        Builds the education, certification, membership, publication, patent
+        and award records of a resume, paired with their tables.
+        """
+        rows = []
+        for key, table_name, model, extract in RESUME_ITEMS:
+            for item in resume_data.get(key) or []:
+                rows.append((table_name, model(people_id=people_id, **extract(item))))
+        return _keyed(people_id, rows)
+
+    def build_organisation_identity(
+        self, exp_data: Dict[str, Any]
+    ) -> org_models.Identity:
+        identity = org_models.Identity(**ORGANISATION_IDENTITY(exp_data))
+        if identity.neuron360_company_id:
+            identity.organisation_id = stable_id(
+                "organisation.identities", identity.neuron360_company_id
+            )
+        return identity
+
+    def build_organisation_details(
+        self, company_details: Dict[str, Any], org_id: Any
+    ) -> List[Row]:
+        """
+        Builds the organisation sub-records, paired with their tables.
+        """
+        rows = []
+        if company_details.get("company_web_address"):
+            web_addr = org_models.WebAddress(
+                organisation_id=org_id, **company_details["company_web_address"]
+            )
+            rows.append(("organisation.web_addresses", web_addr))
+
+        if company_details.get("company_employees"):
+            emp = org_models.Employee(
+                organisation_id=org_id, **company_details["company_employees"]
+            )
+            rows.append(("organisation.employees", emp))
+
+        if company_details.get("company_social_links"):
+            sl = org_models.SocialLink(
+                organisation_id=org_id,
+                **ORGANISATION_SOCIAL_LINK(company_details["company_social_links"]),
+            )
+            rows.append(("organisation.social_links", sl))
+
+        if company_details.get("company_industries"):
+            for industry_data in company_details["company_industries"]:
+                ind = org_models.Industry(
+                    organisation_id=org_id, **INDUSTRY(industry_data)
+                )
+                rows.append(("organisation.industries", ind))
+
+        if company_details.get("company_phones"):
+            for phone_data in company_details["company_phones"]:
+                phone = org_models.Phone(organisation_id=org_id, **phone_data)
+                rows.append(("organisation.phones", phone))
+
+        return _keyed(org_id, rows)
+
+    def build_office(
+        self, office_details: Dict[str, Any], org_id: Any
+    ) -> org_models.Office:
+        office = org_models.Office(organisation_id=org_id, **OFFICE(office_details))
+        if office.neuron360_office_id:
+            office.office_id = stable_id(
+                "organisation.offices", office.neuron360_office_id
+            )
+        return office
+
+    def build_office_details(
+        self, office_details: Dict[str, Any], org_id: Any, office_id: Any
+    ) -> List[Row]:
+        """
+        Builds the office sub-records, paired with their tables.
+        """
+        rows = []
+        if office_details.get("office_address"):
+            addr = org_models.OfficeAddress(
+                office_id=office_id, **office_details["office_address"]
+            )
+            rows.append(("organisation.office_addresses", addr))
+
+        if office_details.get("office_phones"):
+            for phone_data in office_details["office_phones"]:
+                phone = org_models.Phone(organisation_id=org_id, **phone_data)
+                rows.append(("organisation.phones", phone))
+
+        if office_details.get("office_industries"):
+            for industry in office_details["office_industries"]:
+                oi = org_models.OfficeIndustry(
+                    office_id=office_id, **OFFICE_INDUSTRY(industry)
+                )
+                rows.append(("organisation.office_industries", oi))
+
+        return _keyed(office_id, rows)
+
+
+_transformer = ProfileTransformer()
+
+
+def transform_records(
+    records: List[Dict[str, Any]],
+) -> List[Union[ProfileBundle, TransformError, None]]:
+    """
+    Transforms a list of `results[]` records, returning for each its bundle,
+    None if it has no profile data, or a TransformError if it is invalid.
+    As a module-level function, it can be run in a worker process, e.g.
+    `executor.submit(transform_records, records)` on a ProcessPoolExecutor.
+    """
+    bundles: List[Union[ProfileBundle, TransformError, None]] = []
+    for record in records:
+        try:
+            bundles.append(_transformer.transform(record))
+        except Exception as e:
+            # Validation errors do not survive pickling, their messages do
+            bundles.append(TransformError(f"{type(e).__name__}: {e}"))
+    return bundles
@@ -19,6 +19,72 @@ class Config:
     SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
     SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
     SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+    SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", 100))
+    SUPABASE_MAX_KEEPALIVE_CONNECTIONS = int(
+        os.getenv("SUPABASE_MAX_KEEPALIVE_CONNECTIONS", 50)
+    )
+    SUPABASE_KEEPALIVE_EXPIRY_SECONDS = float(
+        os.getenv("SUPABASE_KEEPALIVE_EXPIRY_SECONDS", 30)
+    )
+    # HTTP/2 multiplexes concurrent requests over a few connections; with
+    # prior knowledge it is used without negotiation, e.g. over cleartext.
+    # Off by default, as benchmarks.bench_http2 showed no gain at 50 workers
+    # and a worse p99 than pooled HTTP/1.1.
+    SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "False").lower() in ("true", "1", "t")
+    SUPABASE_HTTP2_PRIOR_KNOWLEDGE = os.getenv(
+        "SUPABASE_HTTP2_PRIOR_KNOWLEDGE", "False"
+    ).lower() in ("true", "1", "t")
+    SUPABASE_ASYNC_MAX_IN_FLIGHT = int(os.getenv("SUPABASE_ASYNC_MAX_IN_FLIGHT", 200))
+    # Read-through cache for BaseService lookups; a size of 0 disables it
+    SUPABASE_READ_CACHE_SIZE = int(os.getenv("SUPABASE_READ_CACHE_SIZE", 0))
+    SUPABASE_READ_CACHE_TTL_SECONDS = float(
+        os.getenv("SUPABASE_READ_CACHE_TTL_SECONDS", 300)
+    )
+    SUPABASE_READ_CACHE_NEGATIVE_TTL_SECONDS = float(
+        os.getenv("SUPABASE_READ_CACHE_NEGATIVE_TTL_SECONDS", 60)
+    )
+    # Write-behind buffering of records per table
+    BATCH_WRITER_MAX_ROWS = int(os.getenv("BATCH_WRITER_MAX_ROWS", 500))
+    BATCH_WRITER_MAX_BYTES = int(os.getenv("BATCH_WRITER_MAX_BYTES", 1_000_000))
+    BATCH_WRITER_MAX_DELAY_SECONDS = float(
+        os.getenv("BATCH_WRITER_MAX_DELAY_SECONDS", 5)
+    )
+    # Cross-thread write coalescing: rows per statement and how long a
+    # writer thread waits for more rows before sending a partial batch
+    WRITE_COALESCER_MAX_BATCH_ROWS = int(
+        os.getenv("WRITE_COALESCER_MAX_BATCH_ROWS", 500)
+    )
+    WRITE_COALESCER_MAX_WAIT_SECONDS = float(
+        os.getenv("WRITE_COALESCER_MAX_WAIT_SECONDS", 0.05)
+    )
+
+    # Retries of transient write failures: attempts per write, the jittered
+    # exponential backoff between them, and the per-table retry budget (the
+    # fraction of writes that may be retried, plus a reserve for bursts)
+    SUPABASE_WRITE_MAX_ATTEMPTS = int(os.getenv("SUPABASE_WRITE_MAX_ATTEMPTS", 4))
+    SUPABASE_WRITE_RETRY_BASE_DELAY_SECONDS = float(
+        os.getenv("SUPABASE_WRITE_RETRY_BASE_DELAY_SECONDS", 0.25)
+    )
+    SUPABASE_WRITE_RETRY_MAX_DELAY_SECONDS = float(
+        os.getenv("SUPABASE_WRITE_RETRY_MAX_DELAY_SECONDS", 5)
+    )
+    SUPABASE_WRITE_RETRY_BUDGET_RATIO = float(
+        os.getenv("SUPABASE_WRITE_RETRY_BUDGET_RATIO", 0.2)
+    )
+    SUPABASE_WRITE_RETRY_BUDGET_RESERVE = float(
+        os.getenv("SUPABASE_WRITE_RETRY_BUDGET_RESERVE", 20)
+    )
+
+    # Backend for multi-row writes: "postgrest", or "copy" to stream rows
+    # straight to Postgres at SUPABASE_DB_URL with COPY (binary or csv)
+    SUPABASE_WRITE_BACKEND = os.getenv("SUPABASE_WRITE_BACKEND", "postgrest")
+    SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
+    SUPABASE_COPY_FORMAT = os.getenv("SUPABASE_COPY_FORMAT", "binary")
+
+    # Storage behind the services: "supabase", or "sqlite" for an embedded
+    # database mirroring sql/table_creation_query (":memory:" or a file path)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+    SQLITE_DATABASE_PATH = os.getenv("SQLITE_DATABASE_PATH", ":memory:")
 
     # Neuron360
     NEURON360_API_KEY = os.getenv("NEURON360_API_KEY")
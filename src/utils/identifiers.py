@@ -0,0 +1,18 @@
+import uuid
+from typing import Any
+
+# Namespace of the identifiers derived from Neuron360 data. Changing it would
+# give every re-ingested record a new key, so it must stay fixed.
+NEURON360_NAMESPACE = uuid.UUID("6f1c7a52-3d0e-4b8f-9a57-2c1de0b4f9a3")
+
+
+def stable_id(*parts: Any) -> uuid.UUID:
+    """
+    Returns a deterministic UUID (version 5) for a record identified by
+    `parts`, such as a table name and a Neuron360 ID, or a parent key, a
+    table name and a position.
+
+    Re-ingesting the same data yields the same keys, so retried writes hit
+    the existing rows instead of duplicating them.
+    """
+    return uuid.uuid5(NEURON360_NAMESPACE, "/".join(str(part) for part in parts))
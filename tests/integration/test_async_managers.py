@@ -0,0 +1,102 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock
+from src.managers.people_manager import PeopleManager
+from src.managers.organisation_manager import OrganisationManager
+
+
+class FakeAsyncService:
+    """
+    Records the writes an AsyncBaseService would send, without a database.
+    """
+
+    created = []
+
+    def __init__(self, table_name, model, primary_key="id"):
+        self.table_name = table_name
+        self.model = model
+
+    async def get_by_neuron_id(self, neuron_id, columns=None):
+        return None
+
+    async def exists(self, column, value):
+        return False
+
+    async def get_many_by_neuron_ids(self, neuron_ids, columns=None):
+        return []
+
+    async def create(self, data, return_minimal=False):
+        await asyncio.sleep(0)
+        FakeAsyncService.created.append((self.table_name, data))
+        return data
+
+    async def upsert(self, data, on_conflict="id", **kwargs):
+        return await self.create(data)
+
+
+@pytest.fixture
+def managers(mocker):
+    mocker.patch(
+        "src.services.base_service.get_supabase_client", return_value=MagicMock()
+    )
+    mocker.patch("src.managers.base_manager.AsyncBaseService", FakeAsyncService)
+    FakeAsyncService.created = []
+    org_manager = OrganisationManager()
+    return PeopleManager(org_manager=org_manager), org_manager
+
+
+def test_process_person_data_async_writes_whole_graph(managers, single_profile_record):
+    """
+    Tests that the async pipeline writes the person graph with local keys.
+    """
+    people_manager, _ = managers
+
+    asyncio.run(people_manager.process_person_data_async(single_profile_record))
+
+    tables = [table for table, _ in FakeAsyncService.created]
+    identity = next(d for t, d in FakeAsyncService.created if t == "people.identities")
+    assert tables.count("people.identities") == 1
+    assert "people.profiles" in tables
+    assert "people.experiences" in tables
+    assert "organisation.identities" in tables
+    for table, data in FakeAsyncService.created:
+        if table.startswith("people.") and hasattr(data, "people_id"):
+            assert data.people_id == identity.people_id
+
+
+def test_concurrent_organisation_writes_are_shared(managers, single_profile_record):
+    """
+    Tests that the same company seen twice concurrently is only written once.
+    """
+    _, org_manager = managers
+    exp_data = single_profile_record["resume_data"]["experiences"][0]
+
+    async def run():
+        await asyncio.gather(
+            org_manager.process_organisation_data_async(exp_data),
+            org_manager.process_organisation_data_async(exp_data),
+        )
+
+    asyncio.run(run())
+
+    tables = [table for table, _ in FakeAsyncService.created]
+    assert tables.count("organisation.identities") == 1
+
+
+def test_failed_identity_write_is_counted(
+    managers, single_profile_record, tmp_path, mocker
+):
+    """
+    Tests that a person whose identity is not stored counts as failed in
+    the file, and that their other rows are not written.
+    """
+    people_manager, _ = managers
+    file_path = tmp_path / "profiles.json"
+    file_path.write_text(json.dumps({"results": [single_profile_record]}))
+    mocker.patch.object(people_manager, "_store_async", return_value=None)
+
+    result = asyncio.run(people_manager.process_people_from_file_async(file_path))
+
+    assert result == (0, 1)
+    people_manager._store_async.assert_called_once()
@@ -0,0 +1,116 @@
+import os
+import uuid
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from src.services.copy_loader import CopyLoader  # noqa: E402
+
+# A disposable local database, e.g. postgresql://postgres@localhost/postgres
+DATABASE_URL = os.getenv("COPY_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="COPY_TEST_DATABASE_URL is not set"
+)
+
+
+@pytest.fixture
+def scratch_table():
+    """
+    Creates a table covering the column types used by the people and
+    organisation schemas, and drops it afterwards.
+    """
+    with psycopg.connect(DATABASE_URL, autocommit=True) as connection:
+        connection.execute("CREATE SCHEMA IF NOT EXISTS copy_test")
+        connection.execute("""
+            CREATE TABLE copy_test.profiles (
+                id UUID PRIMARY KEY,
+                name TEXT NOT NULL,
+                languages TEXT[],
+                priority INTEGER,
+                score FLOAT,
+                ddi BOOLEAN,
+                start_date DATE,
+                extra JSONB,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+        yield connection
+        connection.execute("DROP TABLE copy_test.profiles")
+
+
+def _rows(count):
+    return [
+        {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_OID, str(i))),
+            "name": f'person "{i}", jr',
+            "languages": ["en", "fr"],
+            "priority": i,
+            "score": i / 2,
+            "ddi": i % 2 == 0,
+            "start_date": "2020-01-31",
+            "extra": {"rank": i},
+        }
+        for i in range(count)
+    ] + [{"id": str(uuid.uuid4()), "name": "partial"}]
+
+
+@pytest.mark.parametrize("copy_format", ["binary", "csv"])
+def test_load_copies_rows_idempotently(scratch_table, copy_format):
+    """
+    Tests that rows round-trip through COPY and that reloading them neither
+    duplicates nor fails.
+    """
+    loader = CopyLoader(DATABASE_URL, copy_format)
+    rows = _rows(50)
+
+    assert loader.load("copy_test.profiles", rows) == 51
+    assert loader.load("copy_test.profiles", rows, ignore_duplicates=True) == 0
+
+    count, languages, extra, created = scratch_table.execute(
+        "SELECT count(*), max(languages), max(extra::text), "
+        "bool_and(created_at IS NOT NULL) FROM copy_test.profiles"
+    ).fetchone()
+    assert count == 51
+    assert languages == ["en", "fr"]
+    assert extra == '{"rank": 9}'
+    assert created
+    loader.close()
+
+
+def test_load_updates_conflicting_rows(scratch_table):
+    """
+    Tests that conflicts update the existing row unless duplicates are ignored.
+    """
+    loader = CopyLoader(DATABASE_URL)
+    row = _rows(1)[0]
+    loader.load("copy_test.profiles", [row])
+
+    loader.load("copy_test.profiles", [{**row, "name": "renamed"}])
+
+    name = scratch_table.execute(
+        "SELECT name FROM copy_test.profiles WHERE id = %s", (row["id"],)
+    ).fetchone()[0]
+    assert name == "renamed"
+    loader.close()
+
+
+def test_load_without_conflict_target_inserts(scratch_table):
+    """
+    Tests that a load without `on_conflict` inserts, failing on an existing
+    row and leaving it untouched.
+    """
+    loader = CopyLoader(DATABASE_URL)
+    row = _rows(1)[0]
+    loader.load("copy_test.profiles", [row], on_conflict=None)
+
+    with pytest.raises(psycopg.errors.UniqueViolation):
+        loader.load(
+            "copy_test.profiles", [{**row, "name": "renamed"}], on_conflict=None
+        )
+
+    name = scratch_table.execute(
+        "SELECT name FROM copy_test.profiles WHERE id = %s", (row["id"],)
+    ).fetchone()[0]
+    assert name == row["name"]
+    loader.close()
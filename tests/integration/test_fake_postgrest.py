@@ -0,0 +1,121 @@
+import concurrent.futures
+import time
+import pytest
+from src.managers.people_manager import PeopleManager
+from src.managers.organisation_manager import OrganisationManager
+from src.models.people import Identity
+from src.services import client_registry as registry
+from src.services.fake_postgrest import (
+    FAKE_API_KEY,
+    FakePostgrestServer,
+    parse_in_list,
+)
+from src.services.people_services import IdentityService
+
+
+def _serve(mocker, **kwargs) -> FakePostgrestServer:
+    server = FakePostgrestServer(seed=1, **kwargs).start()
+    client_registry = registry.SupabaseClientRegistry(
+        server.url,
+        FAKE_API_KEY,
+        max_connections=10,
+        max_keepalive_connections=10,
+        keepalive_expiry=30,
+    )
+    mocker.patch.object(registry, "client_registry", client_registry)
+    return server
+
+
+@pytest.fixture
+def server(mocker):
+    server = _serve(mocker)
+    yield server
+    server.stop()
+
+
+def test_parse_in_list_handles_quoted_values():
+    """
+    Tests that `in` filter operands are split like PostgREST does.
+    """
+    assert parse_in_list('(a,"b,c",d)') == ["a", "b,c", "d"]
+    assert parse_in_list("()") == []
+
+
+def test_services_talk_to_the_fake_server(server):
+    """
+    Tests the PostgREST subset used by the services over HTTP.
+    """
+    identity_service = IdentityService()
+    identities = [Identity(neuron360_profile_id=f"p-{i}") for i in range(3)]
+
+    results = identity_service.upsert_many(identities, ignore_duplicates=True)
+    assert [r.people_id for r in results] == [i.people_id for i in identities]
+    assert identity_service.upsert_many(identities, ignore_duplicates=True) == [
+        None,
+        None,
+        None,
+    ]
+
+    found = identity_service.get_many_by_neuron_ids(["p-0", "p-2", "p-9"])
+    assert set(found) == {"p-0", "p-2"}
+    assert identity_service.exists("neuron360_profile_id", "p-1") is True
+    assert identity_service.get_by_neuron_id("p-9") is None
+    assert len(list(identity_service.iter_all(batch_size=2))) == 3
+    assert server.stats["POST requests"] == 2
+
+
+def test_file_is_uploaded_end_to_end(server, test_data_path):
+    """
+    Tests that a whole file is uploaded through HTTP, parents before children.
+    """
+    people_manager = PeopleManager(org_manager=OrganisationManager())
+
+    result = people_manager.process_people_from_file(
+        str(test_data_path / "search_profile_response_full_eg2.json")
+    )
+
+    assert result == (2, 0)
+    assert len(IdentityService().get_all()) == 2
+
+
+def test_latency_and_errors_are_injected(mocker):
+    """
+    Tests that requests are delayed and fail at the configured rate.
+    """
+    server = _serve(mocker, latency_seconds=0.05, error_rate=1.0)
+    try:
+        started = time.perf_counter()
+        assert IdentityService().exists("neuron360_profile_id", "p-1") is None
+        assert time.perf_counter() - started >= 0.05
+        assert server.stats["injected errors"] == 1
+    finally:
+        server.stop()
+
+
+def test_http2_writes_from_many_threads_share_one_connection(mocker):
+    """
+    Tests that concurrent writes are multiplexed over a single HTTP/2
+    connection without protocol errors.
+    """
+    server = FakePostgrestServer(latency_seconds=0.01).start()
+    client_registry = registry.SupabaseClientRegistry(
+        server.url,
+        FAKE_API_KEY,
+        max_connections=10,
+        max_keepalive_connections=10,
+        keepalive_expiry=30,
+        http1=False,
+        http2=True,
+    )
+    mocker.patch.object(registry, "client_registry", client_registry)
+    identity_service = IdentityService()
+    identities = [Identity(neuron360_profile_id=f"p-{i}") for i in range(100)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(executor.map(identity_service.create, identities))
+    client_registry.close()
+    server.stop()
+
+    assert all(result is not None for result in results)
+    assert server.stats["connections"] == 1
+    assert server.stats["POST requests"] == 100
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import MagicMock
+from src.managers.people_manager import PeopleManager, INGEST_PERSON_FUNCTION
+from src.managers.organisation_manager import OrganisationManager
+
+
+@pytest.fixture
+def client(mocker):
+    client = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    # Nobody exists yet
+    lookup = client.table.return_value.select.return_value
+    lookup.eq.return_value.limit.return_value.execute.return_value = MagicMock(data=[])
+    lookup.in_.return_value.execute.return_value = MagicMock(data=[])
+    return client
+
+
+def test_person_is_written_in_one_rpc_call(client, single_profile_record):
+    """
+    Tests that RPC mode sends the whole person graph, parents first, in one call.
+    """
+    client.rpc.return_value.execute.return_value = MagicMock(data="ok")
+    people_manager = PeopleManager(org_manager=OrganisationManager(), use_rpc=True)
+
+    people_manager.process_person_data(single_profile_record)
+
+    client.rpc.assert_called_once()
+    function_name, params = client.rpc.call_args.args
+    assert function_name == INGEST_PERSON_FUNCTION
+    client.table.return_value.insert.assert_not_called()
+
+    tables = [step["table"] for step in params["payload"]["writes"]]
+    assert tables[:2] == ["people.identities", "people.profiles"]
+    assert len(tables) == len(set(tables))
+    assert tables.index("organisation.identities") < tables.index("people.experiences")
+    assert tables.index("people.experiences") < tables.index("people.job_functions")
+
+    people_id = params["payload"]["people_id"]
+    for step in params["payload"]["writes"]:
+        for row in step["rows"]:
+            assert row.get("people_id", people_id) == people_id
+
+
+def test_failed_rpc_call_is_raised(client, single_profile_record):
+    """
+    Tests that a failed ingest surfaces as an error for the file's accounting.
+    """
+    client.rpc.return_value.execute.side_effect = Exception("503")
+    org_manager = OrganisationManager()
+    people_manager = PeopleManager(org_manager=org_manager, use_rpc=True)
+
+    with pytest.raises(Exception):
+        people_manager.process_person_data(single_profile_record)
+    assert not any(org_manager._organisation_exists.values())
+
+
+def test_person_writes_have_deterministic_keys(client, single_profile_record):
+    """
+    Tests that building the same person twice yields the same keys.
+    """
+
+    def keys():
+        people_manager = PeopleManager(org_manager=OrganisationManager())
+        writes = people_manager.build_person_writes(
+            single_profile_record["profile_data"],
+            single_profile_record["resume_data"],
+            set(),
+        )
+        return [getattr(model, service.primary_key) for service, model in writes]
+
+    first = keys()
+    assert first == keys()
+    # The identity and the profile share the people_id; all other keys differ
+    assert first[0] == first[1]
+    assert len(set(first[1:])) == len(first) - 1
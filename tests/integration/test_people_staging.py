@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import MagicMock
+from src.managers.people_manager import PeopleManager
+from src.managers.organisation_manager import OrganisationManager
+from src.services.schema import TABLE_WRITE_ORDER
+from src.services.staging_services import MERGE_BATCH_FUNCTION
+
+
+@pytest.fixture
+def client(mocker):
+    client = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    client.rpc.return_value.execute.return_value = MagicMock(
+        data=[{"target_table": "people.identities", "merged_rows": 2}]
+    )
+    return client
+
+
+@pytest.fixture
+def example_file(test_data_path):
+    return str(test_data_path / "search_profile_response_full_eg2.json")
+
+
+def test_file_is_staged_and_merged_in_one_batch(client, example_file):
+    """
+    Tests that staging mode loads all of a file's rows in one upsert, merges
+    them with one call, and looks nothing up beforehand.
+    """
+    people_manager = PeopleManager(org_manager=OrganisationManager(), use_staging=True)
+
+    result = people_manager.process_people_from_file(example_file)
+
+    assert result == (2, 0)
+    client.table.return_value.select.assert_not_called()
+    client.table.return_value.upsert.assert_called_once()
+    rows = client.table.return_value.upsert.call_args.args[0]
+    batch_ids = {row["batch_id"] for row in rows}
+    assert len(batch_ids) == 1
+    assert rows[0]["table_name"] == "people.identities"
+    assert {row["table_name"] for row in rows} <= set(TABLE_WRITE_ORDER)
+
+    client.rpc.assert_called_once_with(
+        MERGE_BATCH_FUNCTION,
+        {"p_batch_id": batch_ids.pop(), "p_tables": TABLE_WRITE_ORDER},
+    )
+
+
+def test_staging_the_same_file_twice_reuses_row_keys(client, example_file):
+    """
+    Tests that a retried file overwrites its earlier staged rows.
+    """
+
+    def staged_ids():
+        people_manager = PeopleManager(
+            org_manager=OrganisationManager(), use_staging=True
+        )
+        people_manager.process_people_from_file(example_file)
+        rows = client.table.return_value.upsert.call_args.args[0]
+        return [row["id"] for row in rows]
+
+    assert staged_ids() == staged_ids()
+
+
+def test_failed_merge_fails_the_whole_file(client, example_file):
+    """
+    Tests that a failed merge counts every person of the file as failed.
+    """
+    client.rpc.return_value.execute.side_effect = Exception("503")
+    people_manager = PeopleManager(org_manager=OrganisationManager(), use_staging=True)
+
+    assert people_manager.process_people_from_file(example_file) == (0, 2)
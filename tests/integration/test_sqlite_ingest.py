@@ -0,0 +1,154 @@
+import pytest
+from src.managers.people_manager import PeopleManager
+from src.managers.organisation_manager import OrganisationManager
+from src.services.client_registry import set_storage_backend
+from src.services.schema import TABLE_WRITE_ORDER
+from src.services.sqlite_backend import SQLiteBackend
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend()
+    set_storage_backend(backend)
+    yield backend
+    set_storage_backend(None)
+    backend.close()
+
+
+@pytest.fixture
+def example_file(test_data_path):
+    return str(test_data_path / "search_profile_response_full_eg2.json")
+
+
+def _row_counts(backend):
+    connection = backend.database.connection
+    return {
+        table_name: connection.execute(
+            f'SELECT count(*) FROM "{table_name}"'
+        ).fetchone()[0]
+        for table_name in TABLE_WRITE_ORDER
+    }
+
+
+def test_file_ingest_is_idempotent(backend, example_file):
+    """
+    Tests that a file is fully stored and that processing it again adds nothing.
+    """
+    people_manager = PeopleManager(org_manager=OrganisationManager())
+
+    assert people_manager.process_people_from_file(example_file) == (2, 0)
+    counts = _row_counts(backend)
+    assert counts["people.identities"] == 2
+    assert counts["people.experiences"] > 0
+    assert counts["organisation.identities"] > 0
+
+    fresh_manager = PeopleManager(org_manager=OrganisationManager())
+    assert fresh_manager.process_people_from_file(example_file) == (2, 0)
+    assert _row_counts(backend) == counts
+
+
+def test_batch_writes_store_the_same_rows(example_file):
+    """
+    Tests that batched and bulk writes store exactly what one-by-one writes
+    store.
+    """
+    counts = []
+    for options in ({}, {"use_batch_writer": True}, {"use_bulk_ingest": True}):
+        backend = SQLiteBackend()
+        set_storage_backend(backend)
+        try:
+            people_manager = PeopleManager(org_manager=OrganisationManager(), **options)
+            assert people_manager.process_people_from_file(example_file) == (2, 0)
+            counts.append(_row_counts(backend))
+        finally:
+            set_storage_backend(None)
+            backend.close()
+
+    assert counts[0] == counts[1] == counts[2]
+
+
+def test_bulk_ingest_fails_only_the_rejected_person(backend, example_file, mocker):
+    """
+    Tests that a bulk write failing for one person fails only that person,
+    whose rows in later tables are left out.
+    """
+    people_manager = PeopleManager(
+        org_manager=OrganisationManager(), use_bulk_ingest=True
+    )
+    profile_service = people_manager.profile_service
+    upsert_many = profile_service.upsert_many
+    rejected = people_manager.transformer.build_identity(
+        people_manager._load_profiles(example_file)[0][0]["profile_data"]
+    ).people_id
+
+    def reject_person(models, **kwargs):
+        # A bad row fails its whole chunk, as a multi-row statement would
+        if any(model.people_id == rejected for model in models):
+            return [None] * len(models)
+        return upsert_many(models, **kwargs)
+
+    mocker.patch.object(profile_service, "upsert_many", side_effect=reject_person)
+
+    assert people_manager.process_people_from_file(example_file) == (1, 1)
+    counts = _row_counts(backend)
+    assert counts["people.identities"] == 2
+    assert counts["people.profiles"] == 1
+    connection = backend.database.connection
+    assert (
+        connection.execute(
+            'SELECT count(*) FROM "people.experiences" WHERE people_id = ?',
+            (str(rejected),),
+        ).fetchone()[0]
+        == 0
+    )
+    assert counts["people.experiences"] > 0
+
+
+def test_purge_and_reingest_profiles(backend, example_file):
+    """
+    Tests that purging people removes their whole subgraph but keeps the
+    organisations, and that reingesting restores the same rows.
+    """
+    people_manager = PeopleManager(org_manager=OrganisationManager())
+    assert people_manager.process_people_from_file(example_file) == (2, 0)
+    counts = _row_counts(backend)
+    profile_ids = people_manager._profile_ids(
+        people_manager._load_profiles(example_file)[0]
+    )
+
+    assert people_manager.purge_profiles(profile_ids) == 2
+    purged = _row_counts(backend)
+    for table_name, count in purged.items():
+        if table_name.startswith("people."):
+            assert count == 0, table_name
+        else:
+            assert count == counts[table_name], table_name
+
+    assert people_manager.reingest_profiles(
+        [*profile_ids, "unknown"], [example_file]
+    ) == (2, 1)
+    assert _row_counts(backend) == counts
+
+
+def test_purge_organisations_cascades(backend, example_file):
+    """
+    Tests that purging organisations deletes their offices and details.
+    """
+    org_manager = OrganisationManager()
+    people_manager = PeopleManager(org_manager=org_manager)
+    assert people_manager.process_people_from_file(example_file) == (2, 0)
+    organisation_ids = [
+        row[0]
+        for row in backend.database.connection.execute(
+            'SELECT organisation_id FROM "organisation.identities"'
+        )
+    ]
+
+    assert org_manager.purge_organisations(organisation_ids) == len(organisation_ids)
+    counts = _row_counts(backend)
+    assert all(
+        count == 0
+        for table_name, count in counts.items()
+        if table_name.startswith("organisation.")
+    )
+    assert counts["people.identities"] == 2
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import MagicMock
+from src.services.batch_writer import BatchWriter
+from src.models.people import Identity, Email
+
+
+def make_service(table_name, calls):
+    service = MagicMock()
+    service.table_name = table_name
+
+    def upsert_many(rows, **kwargs):
+        calls.append((table_name, len(rows)))
+        return rows
+
+    service.upsert_many.side_effect = upsert_many
+    return service
+
+
+@pytest.fixture
+def services():
+    calls = []
+    return (
+        make_service("people.identities", calls),
+        make_service("people.emails", calls),
+        calls,
+    )
+
+
+def test_rows_are_buffered_until_flush(services):
+    """
+    Tests that nothing is sent before flush and tables flush parents first.
+    """
+    identities, emails, calls = services
+    identity = Identity(neuron360_profile_id="a")
+
+    with BatchWriter(max_rows=10) as writer:
+        writer.add(emails, Email(people_id=identity.people_id, email="a@b.c"))
+        writer.add(identities, identity)
+        assert calls == []
+        assert writer.pending_rows() == 2
+
+    assert calls == [("people.identities", 1), ("people.emails", 1)]
+    assert writer.written_rows == 2
+
+
+def test_full_table_flushes_its_parents_first(services):
+    """
+    Tests that reaching max_rows sends the table and the tables before it.
+    """
+    identities, emails, calls = services
+    writer = BatchWriter(max_rows=2)
+    identity = Identity(neuron360_profile_id="a")
+    writer.add(identities, identity)
+    writer.add(emails, Email(people_id=identity.people_id))
+    writer.add(emails, Email(people_id=identity.people_id))
+
+    assert calls == [("people.identities", 1), ("people.emails", 2)]
+
+
+def test_old_rows_are_flushed_on_next_add(services):
+    """
+    Tests that rows older than max_delay_seconds go out with the next add.
+    """
+    identities, _, calls = services
+    now = [0.0]
+    writer = BatchWriter(max_rows=10, max_delay_seconds=5, clock=lambda: now[0])
+    writer.add(identities, Identity(neuron360_profile_id="a"))
+    now[0] = 6
+    writer.add(identities, Identity(neuron360_profile_id="b"))
+
+    assert calls == [("people.identities", 2)]
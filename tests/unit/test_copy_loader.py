@@ -0,0 +1,148 @@
+import pytest
+from unittest.mock import MagicMock
+from src.services import copy_loader
+from src.services.copy_loader import (
+    CSV_NULL,
+    csv_value,
+    encode_csv,
+    get_copy_loader,
+    group_by_columns,
+)
+from src.services.people_services import IdentityService
+from src.models.people import Identity
+
+
+def test_csv_value_encodes_json_ready_values():
+    """
+    Tests that values are written in the text form COPY expects.
+    """
+    assert csv_value(None) == CSV_NULL
+    assert csv_value(True) == "true"
+    assert csv_value(3) == "3"
+    assert csv_value({"a": 1}) == '{"a": 1}'
+    assert csv_value(["en", 'say "hi"', None]) == '{"en","say \\"hi\\"",NULL}'
+
+
+def test_encode_csv_keeps_column_order_and_quotes():
+    """
+    Tests that rows are encoded in the given column order, with CSV quoting.
+    """
+    rows = [{"b": "x,y", "a": 1}, {"a": 2}]
+
+    payload = encode_csv(rows, ["a", "b"])
+
+    assert payload == b'1,"x,y"\n2,\\N\n'
+
+
+def test_group_by_columns_splits_partial_rows():
+    """
+    Tests that rows are grouped by the columns they carry.
+    """
+    rows = [{"id": 1, "name": "a"}, {"id": 2}, {"id": 3, "name": "c"}]
+
+    groups = group_by_columns(rows)
+
+    assert groups == {
+        ("id", "name"): [rows[0], rows[2]],
+        ("id",): [rows[1]],
+    }
+
+
+def test_get_copy_loader_is_disabled_by_default(mocker):
+    """
+    Tests that writes go through PostgREST unless the COPY backend is chosen.
+    """
+    mocker.patch.object(copy_loader.config, "SUPABASE_WRITE_BACKEND", "postgrest")
+
+    assert get_copy_loader() is None
+
+
+def test_upsert_many_writes_through_copy_loader(mocker):
+    """
+    Tests that upsert_many hands serialized rows to the COPY loader and
+    returns the records as given.
+    """
+    client = MagicMock()
+    loader = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    mocker.patch("src.services.base_service.get_copy_loader", return_value=loader)
+    identities = [Identity(neuron360_profile_id=str(i)) for i in range(3)]
+
+    results = IdentityService().upsert_many(
+        identities, ignore_duplicates=True, chunk_size=2
+    )
+
+    assert results == identities
+    assert loader.load.call_count == 2
+    table_name, rows = loader.load.call_args_list[0].args
+    assert table_name == "people.identities"
+    assert [row["neuron360_profile_id"] for row in rows] == ["0", "1"]
+    assert loader.load.call_args_list[0].kwargs == {
+        "on_conflict": "people_id",
+        "ignore_duplicates": True,
+    }
+    client.table.assert_not_called()
+
+
+def test_upsert_many_reports_failed_copy_chunks(mocker):
+    """
+    Tests that a failed COPY leaves its chunk as None in the results.
+    """
+    loader = MagicMock()
+    loader.load.side_effect = [RuntimeError("boom"), 1]
+    mocker.patch("src.services.base_service.get_supabase_client")
+    mocker.patch("src.services.base_service.get_copy_loader", return_value=loader)
+    identities = [Identity(neuron360_profile_id=str(i)) for i in range(2)]
+
+    results = IdentityService().upsert_many(identities, chunk_size=1)
+
+    assert results == [None, identities[1]]
+
+
+def test_create_many_inserts_through_copy_loader(mocker):
+    """
+    Tests that create_many hands rows to the COPY loader as plain inserts,
+    without touching PostgREST.
+    """
+    client = MagicMock()
+    loader = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    mocker.patch("src.services.base_service.get_copy_loader", return_value=loader)
+    identities = [Identity(neuron360_profile_id=str(i)) for i in range(3)]
+
+    results = IdentityService().create_many(identities)
+
+    assert results == identities
+    table_name, rows = loader.load.call_args.args
+    assert [row["people_id"] for row in rows] == [
+        str(identity.people_id) for identity in identities
+    ]
+    assert loader.load.call_args.kwargs == {
+        "on_conflict": None,
+        "ignore_duplicates": False,
+    }
+    client.table.assert_not_called()
+
+
+def test_copied_dict_rows_come_back_as_models(mocker):
+    """
+    Tests that rows given to upsert_many as dicts are returned as models when
+    written through COPY.
+    """
+    mocker.patch("src.services.base_service.get_supabase_client")
+    mocker.patch("src.services.base_service.get_copy_loader", return_value=MagicMock())
+    identity = Identity(neuron360_profile_id="a")
+
+    results = IdentityService().upsert_many([identity.model_dump(mode="json")])
+
+    assert results == [identity]
+
+
+def test_copy_loader_requires_psycopg(mocker):
+    """
+    Tests that the COPY backend explains its missing dependency.
+    """
+    mocker.patch.object(copy_loader, "psycopg", None)
+
+    with pytest.raises(ImportError, match="psycopg"):
+        copy_loader.CopyLoader("postgresql://localhost/test")
@@ -0,0 +1,70 @@
+import pytest
+
+from src.models import organisation as org_models
+from src.models import people as people_models
+from src.transformers.field_mapping import FieldSpec, compile_mapping
+from src.transformers.profile_transformer import JOB_TITLE_DETAIL
+
+
+def test_nested_paths_converters_and_defaults():
+    """
+    Tests that columns are read from nested paths, with converters applied
+    to present values and defaults to missing or null ones.
+    """
+    extract = compile_mapping(
+        org_models.Industry,
+        [
+            FieldSpec("industry_id", "id"),
+            FieldSpec("code2", converter=str),
+            FieldSpec("code3", converter=str, default="none"),
+            FieldSpec("name2", "level.name"),
+            FieldSpec("name3", "level.detail.name"),
+            FieldSpec("standard", "level.detail.standard"),
+        ],
+    )
+    data = {"id": "ind-1", "code2": 12, "level": {"name": "Tech", "detail": None}}
+    assert extract(data) == {
+        "industry_id": "ind-1",
+        "code2": "12",
+        "code3": "none",
+        "name2": "Tech",
+        "name3": None,
+        "standard": None,
+    }
+    assert extract({})["code3"] == "none"
+
+
+def test_missing_keys_read_as_none():
+    """
+    Tests that objects lacking some of the keys read together are read key
+    by key, with the missing ones as None.
+    """
+    extract = compile_mapping(
+        people_models.Award,
+        [FieldSpec("name"), FieldSpec("description"), FieldSpec("priority")],
+    )
+    complete = {"name": "Prize", "description": "Best", "priority": 1}
+    assert extract(complete) == complete
+    assert extract({"name": "Prize"}) == {
+        "name": "Prize",
+        "description": None,
+        "priority": None,
+    }
+
+
+def test_omit_none_leaves_out_missing_columns():
+    """
+    Tests that with omit_none only the columns with a value are returned.
+    """
+    assert JOB_TITLE_DETAIL({"raw_job_title": None, "normalized_job_title": {}}) == {}
+    assert JOB_TITLE_DETAIL({"raw_job_title": {"job_title": "CTO"}}) == {
+        "raw_job_title": "CTO"
+    }
+
+
+def test_unknown_columns_are_rejected():
+    """
+    Tests that specs for columns the model does not have fail when compiled.
+    """
+    with pytest.raises(ValueError, match="url"):
+        compile_mapping(people_models.Certification, [FieldSpec("url")])
@@ -0,0 +1,83 @@
+import pickle
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from src.transformers.profile_transformer import (
+    ProfileBundle,
+    ProfileTransformer,
+    TransformError,
+    transform_records,
+)
+
+
+def _rows(bundle):
+    return [(table_name, model.model_dump()) for table_name, model in bundle.rows]
+
+
+def test_transform_is_deterministic_and_picklable(single_profile_record):
+    """
+    Tests that the same record always yields the same rows and keys, and
+    that bundles survive pickling, as when sent back from a worker process.
+    """
+    transformer = ProfileTransformer()
+    bundle = transformer.transform(single_profile_record)
+
+    assert _rows(bundle) == _rows(transformer.transform(single_profile_record))
+    assert bundle.rows[0][0] == "people.identities"
+    assert bundle.rows[1][0] == "people.profiles"
+    assert all(
+        getattr(model, "people_id", bundle.people_id) == bundle.people_id
+        for _, model in bundle.rows
+    )
+    company_ids = [org.neuron360_company_id for org in bundle.organisations]
+    assert company_ids and len(company_ids) == len(set(company_ids))
+
+    copy = pickle.loads(pickle.dumps(bundle))
+    assert _rows(copy) == _rows(bundle)
+
+
+def test_office_rows_can_be_rekeyed():
+    """
+    Tests that the details of an office stored under another key are moved
+    under that key, with keys derived from it.
+    """
+    exp_data = {
+        "company_id": "comp-1",
+        "company_name": "Acme",
+        "office_id": "office-1",
+        "office_address": {"city": "Paris"},
+        "office_industries": [{"id": "ind-1", "code2": 12}],
+    }
+    bundle = ProfileTransformer().build_organisation(exp_data)
+    assert [table_name for table_name, _ in bundle.office_rows] == [
+        "organisation.office_addresses",
+        "organisation.office_industries",
+    ]
+    assert bundle.office_rows_for(bundle.office.office_id) is bundle.office_rows
+
+    existing_id = uuid.uuid4()
+    rekeyed = bundle.office_rows_for(existing_id)
+    assert all(model.office_id == existing_id for _, model in rekeyed)
+    assert {model.id for _, model in rekeyed}.isdisjoint(
+        model.id for _, model in bundle.office_rows
+    )
+    assert all(
+        model.office_id == bundle.office.office_id for _, model in bundle.office_rows
+    )
+
+
+def test_transform_records_in_worker_process(single_profile_record):
+    """
+    Tests that records are transformed in a worker process, with records
+    lacking profile data and invalid records reported in place.
+    """
+    invalid = {"profile_data": {"profile_id": "p-1", "profile_picture": "p.png"}}
+    records = [single_profile_record, {"resume_data": {}}, invalid]
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        bundles = executor.submit(transform_records, records).result()
+
+    assert isinstance(bundles[0], ProfileBundle)
+    assert _rows(bundles[0]) == _rows(ProfileTransformer().transform(records[0]))
+    assert bundles[1] is None
+    assert isinstance(bundles[2], TransformError)
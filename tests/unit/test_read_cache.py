@@ -0,0 +1,140 @@
+import pytest
+from unittest.mock import MagicMock
+from src.services.read_cache import MISSING, ReadCache
+from src.services.people_services import IdentityService
+from src.models.people import Identity
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    """
+    Tests that positive and negative entries expire after their own TTLs.
+    """
+    clock = FakeClock()
+    cache = ReadCache(10, ttl_seconds=10, negative_ttl_seconds=2, clock=clock)
+    cache.put("found", {"id": 1})
+    cache.put("absent", None)
+
+    clock.now = 5
+    assert cache.get("found") == {"id": 1}
+    assert cache.get("absent") is MISSING
+
+    clock.now = 11
+    assert cache.get("found") is MISSING
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Tests that a full cache evicts the entry used least recently.
+    """
+    cache = ReadCache(2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.fixture
+def cached_service(mocker):
+    client = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    service = IdentityService()
+    service.cache = ReadCache(100, ttl_seconds=60)
+    return service, client
+
+
+def test_lookups_are_served_from_cache(cached_service):
+    """
+    Tests that repeated lookups, found or not, hit the database only once.
+    """
+    service, client = cached_service
+    query = client.table.return_value.select.return_value.eq.return_value.limit
+    query.return_value.execute.return_value = MagicMock(data=[])
+
+    assert service.exists("neuron360_profile_id", "a") is False
+    assert service.exists("neuron360_profile_id", "a") is False
+    assert service.get_by_neuron_id("a") is None
+
+    query.return_value.execute.assert_called_once()
+    assert service.cache.stats()["hits"] == 2
+
+
+def test_create_invalidates_cached_lookups(cached_service):
+    """
+    Tests that creating a record drops a cached "not found" for its keys.
+    """
+    service, client = cached_service
+    query = client.table.return_value.select.return_value.eq.return_value.limit
+    query.return_value.execute.return_value = MagicMock(data=[])
+    assert service.exists("neuron360_profile_id", "a") is False
+
+    service.create(Identity(neuron360_profile_id="a"), return_minimal=True)
+    query.return_value.execute.return_value = MagicMock(data=[{"people_id": "x"}])
+
+    assert service.exists("neuron360_profile_id", "a") is True
+    assert query.return_value.execute.call_count == 2
+
+
+def test_update_drops_lookups_of_old_values(cached_service):
+    """
+    Tests that writing a row drops its cached lookups by values it no longer
+    has, found through its primary key.
+    """
+    service, client = cached_service
+    identity = Identity(neuron360_profile_id="a")
+    query = client.table.return_value.select.return_value.eq.return_value.limit
+    query.return_value.execute.return_value = MagicMock(
+        data=[identity.model_dump(mode="json")]
+    )
+    assert service.get_by_neuron_id("a").people_id == identity.people_id
+
+    identity.neuron360_profile_id = "b"
+    service.upsert(identity, on_conflict="people_id", return_minimal=True)
+    query.return_value.execute.return_value = MagicMock(data=[])
+
+    assert service.get_by_neuron_id("a") is None
+    assert query.return_value.execute.call_count == 2
+
+
+def test_reads_started_before_a_write_are_not_cached():
+    """
+    Tests that a value read before an invalidation, such as a "not found"
+    racing a create, is not stored.
+    """
+    cache = ReadCache(10, ttl_seconds=60)
+    generation = cache.generation
+
+    cache.invalidate([("neuron360_profile_id", "a")])
+    cache.put(("neuron360_profile_id", "a"), None, generation=generation)
+
+    assert cache.get(("neuron360_profile_id", "a")) is MISSING
+
+
+def test_invalidating_an_owner_drops_all_its_entries():
+    """
+    Tests that every entry put under an owner is dropped with it, and only
+    those.
+    """
+    cache = ReadCache(10, ttl_seconds=60)
+    cache.put("by_id", {"id": 1}, owner=("id", "1"))
+    cache.put("by_name", {"id": 1}, owner=("id", "1"))
+    cache.put("other", {"id": 2}, owner=("id", "2"))
+
+    cache.invalidate([], owners=[("id", "1")])
+
+    assert cache.get("by_id") is MISSING
+    assert cache.get("by_name") is MISSING
+    assert cache.get("other") == {"id": 2}
@@ -0,0 +1,69 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+
+from src.models import people as people_models
+from src.models.staging import StagedRow
+from src.services.base_service import serialize_model, serialize_records
+from src.services.row_encoder import get_row_encoder
+
+
+def _dump_loads_filter(model):
+    record = json.loads(model.model_dump_json(by_alias=True))
+    return {k: v for k, v in record.items() if v is not None}
+
+
+def test_encode_matches_json_round_trip():
+    """
+    Tests that encoded rows equal the dump/parse/filter conversion.
+    """
+    people_id = uuid.uuid4()
+    models = [
+        people_models.Identity(
+            neuron360_profile_id="prof-1",
+            first_name="Soner",
+            last_modified_date=datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            last_seen_date=datetime(2023, 1, 2, 3, 4, 5, 123),
+        ),
+        people_models.Profile(people_id=people_id, languages=["en", "tr"]),
+        people_models.Experience(
+            people_id=people_id, start_date=date(2020, 1, 1), current=False
+        ),
+        people_models.Address(people_id=people_id, lat=51.5, lng=0, score=None),
+        StagedRow(
+            batch_id=uuid.uuid4(),
+            table_name="people.identities",
+            row_data={"people_id": str(people_id), "first_name": None},
+        ),
+    ]
+    for model in models:
+        assert serialize_model(model) == _dump_loads_filter(model)
+
+
+def test_encode_drops_none_and_non_finite_floats():
+    """
+    Tests that None values and NaN are left out of the row.
+    """
+    address = people_models.Address(people_id=uuid.uuid4(), lat=float("nan"))
+    row = serialize_model(address)
+    assert set(row) == {"id", "people_id"}
+    assert row["people_id"] == str(address.people_id)
+
+
+def test_encode_many_and_serialize_records():
+    """
+    Tests the batch variant and the mixed model/dict batch helper.
+    """
+    people_id = uuid.uuid4()
+    emails = [
+        people_models.Email(people_id=people_id, email=f"p{i}@example.com")
+        for i in range(3)
+    ]
+    encoder = get_row_encoder(people_models.Email)
+    assert encoder is get_row_encoder(people_models.Email)
+    assert encoder.encode_many(emails) == [serialize_model(e) for e in emails]
+
+    raw = {"id": "already-serialized"}
+    records = serialize_records([emails[0], raw, emails[1]])
+    assert records[1] is raw
+    assert records[0] == serialize_model(emails[0])
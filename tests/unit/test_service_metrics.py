@@ -0,0 +1,102 @@
+import uuid
+
+import httpx
+import pytest
+from unittest.mock import MagicMock
+
+from src.models.people import Email
+from src.services.people_services import EmailService
+from src.services.service_metrics import (
+    get_operation_metrics,
+    metrics_snapshot,
+    prometheus_text,
+    record_request_bytes,
+    request_operation,
+    track,
+)
+
+
+def test_track_counts_requests_errors_and_latency():
+    """
+    Tests that tracked calls are counted, timed and marked failed on errors.
+    """
+    with track("test.tracked", "select") as call:
+        call.rows = 3
+    with pytest.raises(ValueError):
+        with track("test.tracked", "select"):
+            raise ValueError("boom")
+
+    values = metrics_snapshot()["test.tracked"]["select"]
+    assert values["count"] == 2
+    assert values["errors"] == 1
+    assert values["rows"] == 3
+    assert sum(values["buckets"].values()) == 2
+    assert values["p99_seconds"] <= 0.005
+
+
+def test_prometheus_text_has_cumulative_histogram():
+    """
+    Tests the exposition format of counters and latency buckets.
+    """
+    metrics = get_operation_metrics("test.prometheus", "insert")
+    metrics.observe(0.003, rows=2)
+    metrics.observe(0.2, rows=1)
+    metrics.add_bytes(120)
+
+    text = prometheus_text()
+    labels = 'table="test.prometheus",operation="insert"'
+    assert f"goldilocks_service_requests_total{{{labels}}} 2" in text
+    assert f"goldilocks_service_rows_total{{{labels}}} 3" in text
+    assert f"goldilocks_service_bytes_sent_total{{{labels}}} 120" in text
+    bucket = "goldilocks_service_request_duration_seconds_bucket"
+    assert f'{bucket}{{{labels},le="0.005"}} 1' in text
+    assert f'{bucket}{{{labels},le="0.1"}} 1' in text
+    assert f'{bucket}{{{labels},le="+Inf"}} 2' in text
+
+
+def test_request_hook_attributes_bytes_to_table_and_operation():
+    """
+    Tests that PostgREST requests are mapped to their table and operation.
+    """
+    upsert = httpx.Request(
+        "POST",
+        "http://localhost/rest/v1/hook_test",
+        headers={
+            "Content-Profile": "test",
+            "Prefer": "resolution=ignore-duplicates",
+        },
+        content=b'{"id": 1}',
+    )
+    assert request_operation(upsert) == ("test.hook_test", "upsert")
+    read = httpx.Request(
+        "GET", "http://localhost/rest/v1/emails", headers={"Accept-Profile": "people"}
+    )
+    assert request_operation(read) == ("people.emails", "select")
+    rpc = httpx.Request(
+        "POST",
+        "http://localhost/rest/v1/rpc/merge_batch",
+        headers={"Content-Profile": "staging"},
+    )
+    assert request_operation(rpc) == ("staging.merge_batch", "rpc")
+    assert request_operation(httpx.Request("GET", "http://localhost/auth")) is None
+
+    record_request_bytes(upsert)
+    assert metrics_snapshot()["test.hook_test"]["upsert"]["bytes_sent"] == 9
+
+
+def test_service_writes_are_tracked(mocker):
+    """
+    Tests that BaseService records its requests under its table.
+    """
+    client = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    client.table.return_value.upsert.return_value.execute.return_value.data = []
+    before = get_operation_metrics("people.emails", "upsert").count
+
+    people_id = uuid.uuid4()
+    emails = [Email(people_id=people_id, email=f"{i}@example.com") for i in range(3)]
+    EmailService().upsert_many(emails, on_conflict="id", return_minimal=True)
+
+    metrics = get_operation_metrics("people.emails", "upsert")
+    assert metrics.count == before + 1
+    assert metrics.snapshot()["rows"] >= 3
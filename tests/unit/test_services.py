@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock
 from src.services.people_services import IdentityService
 from src.models.people import Identity
+from postgrest.types import ReturnMethod
 import uuid
 
 
@@ -26,7 +27,9 @@ def mock_supabase_client(mocker):
             "first_name": "John",
         }
     ]
-    mocker.patch("src.services.base_service.supabase_client", mock_client)
+    mocker.patch(
+        "src.services.base_service.get_supabase_client", return_value=mock_client
+    )
     return mock_client
 
 
@@ -63,3 +66,188 @@ def test_get_identity_by_id(mock_supabase_client):
 
     assert retrieved_identity is not None
     assert retrieved_identity.first_name == "John"
+
+
+@pytest.fixture
+def mock_client(mocker):
+    """
+    Fixture that replaces the client created by BaseService with a mock.
+    """
+    client = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    return client
+
+
+def test_create_many_chunks_rows_in_input_order(mock_client):
+    """
+    Tests that create_many sends one insert per chunk and keeps input order.
+    """
+    identities = [Identity(neuron360_profile_id=f"id_{i}") for i in range(5)]
+    insert = mock_client.table.return_value.insert
+    insert.return_value.execute.side_effect = [
+        MagicMock(data=[i.model_dump(mode="json") for i in identities[:2]]),
+        MagicMock(data=[i.model_dump(mode="json") for i in identities[2:4]]),
+        MagicMock(data=[i.model_dump(mode="json") for i in identities[4:]]),
+    ]
+
+    created = IdentityService().create_many(identities, chunk_size=2)
+
+    assert insert.call_count == 3
+    assert [len(call.args[0]) for call in insert.call_args_list] == [2, 2, 1]
+    assert [c.neuron360_profile_id for c in created] == [f"id_{i}" for i in range(5)]
+
+
+def test_create_many_reports_failed_chunk_as_none(mock_client):
+    """
+    Tests that a failing chunk yields None entries without stopping later chunks.
+    """
+    identities = [Identity(neuron360_profile_id=f"id_{i}") for i in range(4)]
+    insert = mock_client.table.return_value.insert
+    insert.return_value.execute.side_effect = [
+        Exception("503 Service Unavailable"),
+        MagicMock(data=[i.model_dump(mode="json") for i in identities[2:]]),
+    ]
+
+    created = IdentityService().create_many(identities, chunk_size=2)
+
+    assert created[:2] == [None, None]
+    assert [c.neuron360_profile_id for c in created[2:]] == ["id_2", "id_3"]
+
+
+def test_create_return_minimal_returns_local_model(mock_client):
+    """
+    Tests that a minimal-return insert skips the response and keeps local keys.
+    """
+    identity = Identity(neuron360_profile_id="test_id")
+    insert = mock_client.table.return_value.insert
+    insert.return_value.execute.return_value.data = []
+
+    created = IdentityService().create(identity, return_minimal=True)
+
+    assert insert.call_args.kwargs["returning"] == ReturnMethod.minimal
+    assert created is identity
+    assert created.people_id == identity.people_id
+
+
+def test_get_many_by_neuron_ids_uses_chunked_in_queries(mock_client):
+    """
+    Tests that a batch lookup issues one `in` query per chunk and maps by ID.
+    """
+    in_ = mock_client.table.return_value.select.return_value.in_
+    in_.return_value.execute.side_effect = [
+        MagicMock(data=[{"people_id": str(uuid.uuid4()), "neuron360_profile_id": "a"}]),
+        MagicMock(data=[{"people_id": str(uuid.uuid4()), "neuron360_profile_id": "c"}]),
+    ]
+
+    found = IdentityService().get_many_by_neuron_ids(["a", "b", "a", "c"], chunk_size=2)
+
+    assert [call.args for call in in_.call_args_list] == [
+        ("neuron360_profile_id", ["a", "b"]),
+        ("neuron360_profile_id", ["c"]),
+    ]
+    assert set(found) == {"a", "c"}
+
+
+def test_get_many_by_neuron_ids_returns_none_on_error(mock_client):
+    """
+    Tests that a failed lookup is distinguishable from "nothing found".
+    """
+    in_ = mock_client.table.return_value.select.return_value.in_
+    in_.return_value.execute.side_effect = Exception("timeout")
+
+    assert IdentityService().get_many_by_neuron_ids(["a"]) is None
+
+
+def test_delete_many_uses_chunked_in_statements(mock_client):
+    """
+    Tests that a bulk delete issues one `in` statement per chunk and counts
+    the deleted rows.
+    """
+    in_ = mock_client.table.return_value.delete.return_value.in_
+    in_.return_value.execute.side_effect = [
+        MagicMock(data=[{"people_id": "a"}, {"people_id": "b"}]),
+        MagicMock(data=[]),
+    ]
+
+    deleted = IdentityService().delete_many("people_id", ["a", "b", "a", "c"], 2)
+
+    assert [call.args for call in in_.call_args_list] == [
+        ("people_id", ["a", "b"]),
+        ("people_id", ["c"]),
+    ]
+    assert deleted == 2
+
+
+def test_iter_all_walks_pages_by_primary_key(mock_client):
+    """
+    Tests that iter_all pages with a keyset cursor on the primary key.
+    """
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    query = mock_client.table.return_value.select.return_value
+    query.order.return_value.limit.return_value.execute.return_value = MagicMock(
+        data=[{"people_id": ids[0]}, {"people_id": ids[1]}]
+    )
+    query.gt.return_value.order.return_value.limit.return_value.execute.return_value = (
+        MagicMock(data=[{"people_id": ids[2]}])
+    )
+
+    rows = list(IdentityService().iter_all(batch_size=2, columns=["people_id"]))
+
+    mock_client.table.return_value.select.assert_called_with("people_id")
+    query.gt.assert_called_once_with("people_id", ids[1])
+    # A projection lacks required fields, so rows are not validated as models
+    assert all(isinstance(row, dict) for row in rows)
+    assert [row["people_id"] for row in rows] == ids
+
+
+def test_exists_selects_only_the_primary_key(mock_client):
+    """
+    Tests that exists asks for a single primary key rather than whole rows.
+    """
+    query = mock_client.table.return_value.select.return_value
+    query.eq.return_value.limit.return_value.execute.return_value = MagicMock(
+        data=[{"people_id": str(uuid.uuid4())}]
+    )
+
+    assert IdentityService().exists("neuron360_profile_id", "a") is True
+    mock_client.table.return_value.select.assert_called_once_with("people_id")
+    query.eq.assert_called_once_with("neuron360_profile_id", "a")
+    query.eq.return_value.limit.assert_called_once_with(1)
+
+
+def test_projected_reads_return_dicts(mock_client):
+    """
+    Tests that a column projection is sent to PostgREST and returns raw rows.
+    """
+    query = mock_client.table.return_value.select.return_value
+    query.in_.return_value.execute.return_value = MagicMock(
+        data=[{"neuron360_profile_id": "a"}]
+    )
+
+    found = IdentityService().get_many_by_neuron_ids(
+        ["a", "b"], columns=["neuron360_profile_id"]
+    )
+
+    mock_client.table.return_value.select.assert_called_once_with(
+        "neuron360_profile_id"
+    )
+    assert found == {"a": {"neuron360_profile_id": "a"}}
+
+
+def test_upsert_many_aligns_results_by_primary_key(mock_client):
+    """
+    Tests that upsert_many resolves conflicts on the primary key and maps
+    returned rows back to the input, leaving ignored duplicates as None.
+    """
+    identities = [Identity(neuron360_profile_id=str(i)) for i in range(3)]
+    mock_client.table.return_value.upsert.return_value.execute.return_value = MagicMock(
+        data=[identities[2].model_dump(mode="json")]
+    )
+
+    results = IdentityService().upsert_many(identities, ignore_duplicates=True)
+
+    kwargs = mock_client.table.return_value.upsert.call_args.kwargs
+    assert kwargs["on_conflict"] == "people_id"
+    assert kwargs["ignore_duplicates"] is True
+    assert results[:2] == [None, None]
+    assert results[2].people_id == identities[2].people_id
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from src.managers.organisation_manager import OrganisationManager
+from src.managers.people_manager import PeopleManager
+from src.services.async_base_service import AsyncBaseService
+from src.services.client_registry import set_storage_backend
+from src.services.people_services import IdentityService, PhoneService, ProfileService
+from src.services.sqlite_backend import SQLiteBackend, table_statements, translate_ddl
+from src.models.people import Identity, Phone, Profile
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend()
+    set_storage_backend(backend)
+    yield backend
+    set_storage_backend(None)
+    backend.close()
+
+
+def test_table_statements_skip_functions_and_triggers():
+    """
+    Tests that only CREATE TABLE statements are taken from a DDL script.
+    """
+    sql_text = """
+        CREATE SCHEMA IF NOT EXISTS people;
+        -- a comment; with a semicolon
+        CREATE TABLE people.tags (id SERIAL PRIMARY KEY, tags TEXT[]);
+        CREATE FUNCTION f() RETURNS TRIGGER AS $$ BEGIN RETURN NEW; END; $$;
+        CREATE INDEX idx ON people.tags(id);
+    """
+
+    statements = table_statements(sql_text)
+
+    assert statements == [
+        "CREATE TABLE people.tags (id SERIAL PRIMARY KEY, tags TEXT[])"
+    ]
+
+
+def test_translate_ddl_maps_postgres_types():
+    """
+    Tests that Postgres types, defaults and schema names are made SQLite-ready.
+    """
+    statement = (
+        "CREATE TABLE people.emails (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), "
+        "people_id UUID REFERENCES people.profiles(people_id), ddi BOOLEAN, "
+        "score FLOAT, created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP)"
+    )
+
+    assert translate_ddl(statement) == (
+        'CREATE TABLE "people.emails" (id TEXT PRIMARY KEY, '
+        'people_id TEXT REFERENCES "people.profiles"(people_id), ddi INTEGER, '
+        "score REAL, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+    )
+
+
+def test_services_round_trip_through_sqlite(backend):
+    """
+    Tests that services create, read, upsert and delete against SQLite, with
+    lists and booleans restored on read.
+    """
+    identity_service = IdentityService()
+    identity = Identity(neuron360_profile_id="p-1", first_name="Ada")
+    identity_service.create(identity, return_minimal=True)
+    ProfileService().create(
+        Profile(people_id=identity.people_id, languages=["en", "fr"]),
+        return_minimal=True,
+    )
+    phone = Phone(people_id=identity.people_id, phone="+44", ddi=True)
+    PhoneService().create(phone, return_minimal=True)
+
+    stored = identity_service.get_by_neuron_id("p-1")
+    assert stored.people_id == identity.people_id
+    assert stored.created_at is not None
+    assert ProfileService().get_all()[0].languages == ["en", "fr"]
+    assert PhoneService().get_by_id(phone.id).ddi is True
+
+    identity.first_name = "Ada L."
+    identity_service.upsert(identity, on_conflict="people_id")
+    assert identity_service.get_by_neuron_id("p-1").first_name == "Ada L."
+
+    assert PhoneService().delete(phone.id) is True
+    assert PhoneService().get_by_id(phone.id) is None
+
+
+def test_sqlite_enforces_unique_neuron_ids(backend):
+    """
+    Tests that duplicate Neuron360 IDs are skipped by idempotent upserts, as
+    with the unique constraints in Postgres.
+    """
+    identity_service = IdentityService()
+    first = Identity(neuron360_profile_id="p-1")
+    second = Identity(neuron360_profile_id="p-1")
+
+    results = identity_service.upsert_many([first, second], ignore_duplicates=True)
+
+    assert results[0].people_id == first.people_id
+    assert results[1] is None
+    assert len(identity_service.get_all()) == 1
+
+
+def test_async_service_matches_sync_service(backend):
+    """
+    Tests that the async service writes, reads, scans and deletes the same
+    records as the synchronous one.
+    """
+    identity_service = IdentityService()
+    async_service = AsyncBaseService("people.identities", Identity, "people_id")
+    identities = [Identity(neuron360_profile_id=f"p-{i}") for i in range(5)]
+
+    async def run():
+        created = await async_service.create_many(identities[:3], chunk_size=2)
+        found = await async_service.get_many_by_neuron_ids(["p-0", "p-4"])
+        scanned = [record async for record in async_service.iter_all(batch_size=2)]
+        return created, found, scanned
+
+    identity_service.create_many(identities[3:])
+    created, found, scanned = asyncio.run(run())
+
+    assert [record.people_id for record in created] == [
+        identity.people_id for identity in identities[:3]
+    ]
+    assert set(found) == set(identity_service.get_many_by_neuron_ids(["p-0", "p-4"]))
+    assert scanned == list(identity_service.iter_all(batch_size=2))
+    assert len(scanned) == 5
+
+    deleted = asyncio.run(async_service.delete_many("neuron360_profile_id", ["p-0"]))
+    assert deleted == 1
+    assert identity_service.exists("neuron360_profile_id", "p-0") is False
+
+
+def test_sqlite_backend_rejects_database_function_modes(backend):
+    """
+    Tests that the ingest modes calling database functions are refused up
+    front, as SQLite mirrors only the tables.
+    """
+    with pytest.raises(ValueError, match="database functions"):
+        PeopleManager(OrganisationManager(), use_rpc=True)
+    with pytest.raises(ValueError, match="database functions"):
+        PeopleManager(OrganisationManager(), use_staging=True)
+
+    assert PeopleManager(OrganisationManager()).use_rpc is False
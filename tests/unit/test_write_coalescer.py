@@ -0,0 +1,114 @@
+import threading
+from unittest.mock import MagicMock
+from src.services.write_coalescer import WriteCoalescer
+from src.models.people import Identity
+
+
+def make_service(calls, fail=False):
+    service = MagicMock()
+    service.table_name = "people.identities"
+
+    def upsert_many(rows, **kwargs):
+        calls.append(len(rows))
+        return [None if fail else row for row in rows]
+
+    service.upsert_many.side_effect = upsert_many
+    return service
+
+
+def test_records_from_many_threads_share_statements():
+    """
+    Tests that records submitted concurrently are written in few batches.
+    """
+    calls = []
+    service = make_service(calls)
+    futures = []
+
+    with WriteCoalescer(max_batch_rows=100, max_wait_seconds=0.2) as coalescer:
+
+        def produce(i):
+            futures.append(
+                coalescer.submit(service, Identity(neuron360_profile_id=str(i)))
+            )
+
+        threads = [threading.Thread(target=produce, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sum(calls) == 20
+    assert len(calls) < 20
+    assert all(future.result() for future in futures)
+
+
+def test_failed_batches_resolve_futures_to_false():
+    """
+    Tests that a failed write is reported through the record's future.
+    """
+    service = make_service([], fail=True)
+
+    with WriteCoalescer(max_wait_seconds=0) as coalescer:
+        future = coalescer.submit(service, Identity(neuron360_profile_id="a"))
+
+    assert future.result(timeout=1) is False
+
+
+def test_rejected_row_fails_only_its_producer():
+    """
+    Tests that when a batch with a rejected row fails, the records of the
+    other producers in it are resent and stored.
+    """
+    calls = []
+    service = MagicMock()
+    service.table_name = "people.identities"
+
+    def upsert_many(rows, **kwargs):
+        calls.append(len(rows))
+        if any(row["neuron360_profile_id"] == "bad" for row in rows):
+            return [None] * len(rows)
+        return rows
+
+    service.upsert_many.side_effect = upsert_many
+    futures = {}
+    barrier = threading.Barrier(3)
+
+    with WriteCoalescer(max_batch_rows=100, max_wait_seconds=0.5) as coalescer:
+
+        def produce(name):
+            barrier.wait()
+            futures[name] = [
+                coalescer.submit(service, Identity(neuron360_profile_id=f"{name}{i}"))
+                for i in range(2)
+            ]
+            if name == "c":
+                futures["bad"] = coalescer.submit(
+                    service, Identity(neuron360_profile_id="bad")
+                )
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in "abc"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert calls[0] == 7
+    assert all(future.result() for future in futures["a"] + futures["b"])
+    assert not any(future.result() for future in futures["c"])
+    assert futures["bad"].result() is False
+
+
+def test_unexpected_errors_do_not_stop_the_writer():
+    """
+    Tests that a batch failing in an unexpected way resolves its futures to
+    False and leaves the writer running for later batches.
+    """
+    service = MagicMock()
+    service.table_name = "people.identities"
+    service.upsert_many.side_effect = [None, [{"ok": True}]]
+
+    with WriteCoalescer(max_wait_seconds=0) as coalescer:
+        first = coalescer.submit(service, Identity(neuron360_profile_id="a"))
+        assert first.result(timeout=1) is False
+        second = coalescer.submit(service, Identity(neuron360_profile_id="b"))
+        assert second.result(timeout=1) is True
@@ -0,0 +1,155 @@
+import httpx
+import pytest
+from unittest.mock import MagicMock
+from postgrest.exceptions import APIError
+
+from src.models.people import Identity
+from src.services.client_registry import set_storage_backend
+from src.services.people_services import IdentityService
+from src.services.sqlite_backend import SQLiteBackend, SQLiteQuery
+from src.services.write_retry import (
+    RetryBudget,
+    WriteRetrier,
+    get_write_retrier,
+    is_transient,
+    write_retry_stats,
+)
+
+
+def _api_error(code):
+    return APIError({"code": code, "message": "error"})
+
+
+@pytest.fixture
+def service(mocker):
+    """
+    Fixture for a service with a mocked client and a retrier that does not
+    sleep.
+    """
+    client = MagicMock()
+    mocker.patch("src.services.base_service.get_supabase_client", return_value=client)
+    service = IdentityService()
+    service.retrier = WriteRetrier(
+        "people.identities",
+        max_attempts=3,
+        budget=RetryBudget(ratio=0.5, reserve=10),
+        sleep=lambda seconds: None,
+    )
+    return service
+
+
+def test_errors_are_classified():
+    """
+    Tests that only network errors and server-side overload are transient.
+    """
+    assert is_transient(httpx.ConnectError("refused"))
+    assert is_transient(httpx.ReadTimeout("timed out"))
+    assert is_transient(_api_error("PGRST000"))
+    assert is_transient(_api_error("40P01"))
+    assert is_transient(_api_error(503))
+    assert not is_transient(_api_error("23505"))
+    assert not is_transient(_api_error(400))
+    assert not is_transient(ValueError("bad row"))
+
+
+def test_retried_insert_is_sent_as_upsert_on_primary_key(service):
+    """
+    Tests that a transient failure is retried with an idempotent upsert.
+    """
+    identity = Identity(neuron360_profile_id="test_id")
+    table = service.client.table.return_value
+    table.insert.return_value.execute.side_effect = _api_error(503)
+    table.upsert.return_value.execute.return_value.data = [
+        identity.model_dump(mode="json")
+    ]
+
+    created = service.create(identity)
+
+    assert created.people_id == identity.people_id
+    table.insert.assert_called_once()
+    assert table.upsert.call_args.kwargs["on_conflict"] == "people_id"
+    assert table.upsert.call_args.kwargs["ignore_duplicates"] is True
+    assert table.upsert.call_args.kwargs["default_to_null"] is False
+    assert service.retrier.budget.retries == 1
+
+
+def test_retried_insert_leaves_existing_rows_untouched(mocker):
+    """
+    Tests that the upsert retrying an insert does not overwrite a row that
+    was already stored under the same key.
+    """
+    backend = SQLiteBackend()
+    set_storage_backend(backend)
+    try:
+        service = IdentityService()
+        service.retrier = WriteRetrier("people.identities", sleep=lambda s: None)
+        stored = Identity(neuron360_profile_id="a", first_name="Stored", last_name="X")
+        assert service.create(stored, return_minimal=True)
+
+        mocker.patch.object(SQLiteQuery, "insert", side_effect=_api_error(503))
+        retried = Identity(people_id=stored.people_id, neuron360_profile_id="a")
+        assert service.create(retried) is None
+
+        row = service.get_by_neuron_id("a")
+        assert (row.first_name, row.last_name) == ("Stored", "X")
+    finally:
+        set_storage_backend(None)
+        backend.close()
+
+
+def test_permanent_errors_are_not_retried(service):
+    """
+    Tests that a constraint violation fails the write at once.
+    """
+    table = service.client.table.return_value
+    table.upsert.return_value.execute.side_effect = _api_error("23505")
+
+    identity = Identity(neuron360_profile_id="a")
+    assert service.upsert(identity, on_conflict="people_id") is None
+    assert table.upsert.call_count == 1
+
+
+def test_unkeyed_upserts_are_not_retried(service):
+    """
+    Tests that rows lacking the conflict column are never sent twice.
+    """
+    table = service.client.table.return_value
+    table.upsert.return_value.execute.side_effect = httpx.ReadTimeout("timed out")
+
+    results = service.upsert_many([{"first_name": "x"}], on_conflict="people_id")
+
+    assert results == [None]
+    assert table.upsert.call_count == 1
+
+
+def test_retries_stop_when_the_budget_is_spent(service):
+    """
+    Tests that the retry budget caps retries across writes.
+    """
+    service.retrier.budget = RetryBudget(ratio=0, reserve=1)
+    table = service.client.table.return_value
+    table.upsert.return_value.execute.side_effect = _api_error("PGRST003")
+
+    for neuron_id in ["a", "b"]:
+        service.upsert(
+            Identity(neuron360_profile_id=neuron_id), on_conflict="people_id"
+        )
+
+    # One retry for the first write, none left for the second
+    assert table.upsert.call_count == 3
+    assert service.retrier.budget.exhausted == 2
+
+
+def test_retry_stats_are_reported_per_table():
+    """
+    Tests that the retries made and refused by a table's shared budget are
+    reported by write_retry_stats.
+    """
+    retrier = get_write_retrier("test.retry_stats")
+    retrier.budget = RetryBudget(ratio=0, reserve=1)
+    assert retrier.budget.withdraw() and not retrier.budget.withdraw()
+
+    assert write_retry_stats()["test.retry_stats"] == {
+        "retries": 1,
+        "budget_exhausted": 1,
+    }